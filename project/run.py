@@ -5,10 +5,16 @@ Cut-out 시나리오 분석 및 시험 자동화 도구 실행 스크립트
 import os
 import logging
 import sys
+import argparse
 from src.utils.config_loader import ConfigLoader
 from src.main import main
 
 if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description='Cut-out 시나리오 분석 및 시험 자동화 도구')
+  parser.add_argument('--resume', action='store_true',
+                      help='실행 매니페스트(output/run_manifest.json) 기준으로 완료된 단계와 시나리오를 건너뛰고 이어서 실행')
+  args = parser.parse_args()
+  
   try:
     # 설정 파일 로드
     config = ConfigLoader.load_config('config/scenario_config.yaml')
@@ -37,13 +43,15 @@ if __name__ == "__main__":
     logger.info("Cut-out 시나리오 분석 및 시험 자동화 도구 시작")
     logger.info("=" * 50)
     logger.info("UN R157 2023년 1월 개정안 기준 적용")
+    if args.resume:
+      logger.info("이전 실행 이어서 실행 (--resume)")
     
     # 메인 실행
-    filtered_scenarios, sampled_scenarios = main(config)
+    filtered_scenarios, sampled_scenarios, filtered_count = main(config, resume=args.resume)
     
     logger.info("=" * 50)
     logger.info("실행 완료")
-    logger.info(f"필터링된 Test Case 수: {len(filtered_scenarios)}")
+    logger.info(f"필터링된 Test Case 수: {filtered_count}")
     logger.info(f"샘플링된 Test Case 수: {len(sampled_scenarios)}")
     logger.info("=" * 50)
       
@@ -3,10 +3,23 @@ TTC 및 충돌 계산 로직
 '''
 
 import logging
+import itertools
 import numpy as np
 
 logger = logging.getLogger('cutout_scenario.ttc_calculator')
 
+# 민감도 분석 변형 그리드에 지정할 수 있는 파라미터
+VARIANT_PARAMETERS = (
+    'human_model.reaction_time',
+    'human_model.max_deceleration',
+    'human_model.deceleration_buildup_time',
+    'ads_model.reaction_time',
+    'ads_model.max_deceleration',
+    'ads_model.deceleration_buildup_time',
+    'evaluation_criteria.human_failure_offset',
+    'evaluation_criteria.ads_failure_offset'
+)
+
 class TTCCalculator:
     """TTC 및 충돌 계산 로직"""
     
@@ -14,22 +27,13 @@ class TTCCalculator:
         self.config = config
         self.min_safe_distance = config['filtering']['safety_parameters']['min_safe_distance']
         
-        # 모델 파라미터 (UN R157 2023년 1월 개정안 기준)
-        human_config = config['control_models']['human_model']
-        ads_config = config['control_models']['ads_model']
-        
-        self.human_reaction_time = human_config['reaction_time']
-        self.human_max_decel = human_config['max_deceleration']
-        self.human_buildup_time = human_config['deceleration_buildup_time']
-        
-        self.ads_reaction_time = ads_config['reaction_time']
-        self.ads_max_decel = ads_config['max_deceleration']
-        self.ads_buildup_time = ads_config['deceleration_buildup_time']
-        
         # 평가 기준 보정값
         self.human_failure_offset = config['filtering']['evaluation_criteria']['human_failure_offset']
         self.ads_failure_offset = config['filtering']['evaluation_criteria']['ads_failure_offset']
         
+        # 모델 파라미터 (UN R157 2023년 1월 개정안 기준) 및 v_ego별 실패 임계값 테이블
+        self.set_control_models(config['control_models'])
+        
         # 차량 크기
         self.ego_length = config['vehicles']['ego_vehicle']['dimensions']['length']
         self.lv1_length = config['vehicles']['lead_vehicle_1']['dimensions']['length']
@@ -100,58 +104,162 @@ class TTCCalculator:
             # 상대 속도가 0 이하면 충돌하지 않음 (무한대 TTC)
             return float('inf')
         
-    def evaluate_human_model(self, scenario, ttc_reveal):
-        """Human 모델 실패 여부 판단 (UN R157 2023년 1월 개정안 기준)"""
-        # 인간 운전자 제동 시작 시점
-        t_brake_start = self.human_reaction_time
-        
-        # 정지 거리 계산 (제동 빌드업 고려)
-        v_ego = scenario['v_ego'] / 3.6  # m/s
-        
-        # 1. 반응 시간 동안 이동 거리
-        d_reaction = v_ego * self.human_reaction_time
+    def set_control_models(self, control_models):
+        """제어 모델 파라미터 설정 (v_ego별 실패 임계값 테이블 무효화)"""
+        human_config = control_models['human_model']
+        ads_config = control_models['ads_model']
         
-        # 2. 제동 빌드업 동안 이동 거리 (평균 감속도 적용)
-        avg_decel_during_buildup = self.human_max_decel / 2
-        d_buildup = v_ego * self.human_buildup_time - 0.5 * avg_decel_during_buildup * self.human_buildup_time**2
-        
-        # 3. 최대 제동 적용 시 정지 거리
-        t_full_brake = v_ego / self.human_max_decel
-        d_full_brake = 0.5 * self.human_max_decel * t_full_brake**2
+        self.human_reaction_time = human_config['reaction_time']
+        self.human_max_decel = human_config['max_deceleration']
+        self.human_buildup_time = human_config['deceleration_buildup_time']
         
-        # 총 정지 거리
-        d_stop = d_reaction + d_buildup + d_full_brake
+        self.ads_reaction_time = ads_config['reaction_time']
+        self.ads_max_decel = ads_config['max_deceleration']
+        self.ads_buildup_time = ads_config['deceleration_buildup_time']
         
-        # 정지에 필요한 총 시간
-        t_stop = self.human_reaction_time + self.human_buildup_time + t_full_brake
+        # 모델별 {v_ego: 실패 임계 TTC} 캐시 (시나리오 단위 평가용, 배열 평가는 벡터 연산으로 직접 계산)
+        self._threshold_tables = {'human_model': {}, 'ads_model': {}}
         
+    def evaluate_human_model(self, scenario, ttc_reveal):
+        """Human 모델 실패 여부 판단 (UN R157 2023년 1월 개정안 기준)"""
         # 강화된 기준 적용 (Human 실패 조건) - UN R157 2023년 1월 개정안 기준 적용
-        return ttc_reveal < (t_stop + self.human_failure_offset)
+        return ttc_reveal < self._failure_threshold('human_model', scenario['v_ego'])
         
     def evaluate_ads_model(self, scenario, ttc_reveal):
         """ADS 모델 실패 여부 판단 (UN R157 2023년 1월 개정안 기준)"""
-        # ADS 제동 시작 시점
-        t_brake_start = self.ads_reaction_time
+        # 강화된 기준 적용 (ADS 실패 조건) - UN R157 2023년 1월 개정안 기준 적용
+        return ttc_reveal < self._failure_threshold('ads_model', scenario['v_ego'])
+        
+    def get_threshold_table(self, model_name):
+        """모델별 v_ego(km/h) -> 실패 임계 TTC(s) 테이블 (계산된 항목만)"""
+        return dict(self._threshold_tables[model_name])
+        
+    def _failure_threshold(self, model_name, v_ego):
+        """v_ego별 실패 임계 TTC 조회 (정지 시간 + 보정 상수, 최초 1회만 계산)"""
+        table = self._threshold_tables[model_name]
+        threshold = table.get(v_ego)
+        if threshold is None:
+            threshold = table[v_ego] = float(self._compute_failure_threshold(model_name, v_ego))
+        return threshold
+        
+    def _compute_failure_threshold(self, model_name, v_ego):
+        """정지에 필요한 총 시간 기반 실패 임계 TTC 계산 (v_ego는 스칼라 또는 배열)"""
+        if model_name == 'human_model':
+            reaction_time = self.human_reaction_time
+            buildup_time = self.human_buildup_time
+            max_decel = self.human_max_decel
+            failure_offset = self.human_failure_offset
+        else:
+            reaction_time = self.ads_reaction_time
+            buildup_time = self.ads_buildup_time
+            max_decel = self.ads_max_decel
+            failure_offset = self.ads_failure_offset
         
-        # 정지 거리 계산 (제동 빌드업 고려)
-        v_ego = scenario['v_ego'] / 3.6  # m/s
+        # 최대 제동 적용 시 정지 시간 (m/s 기준)
+        t_full_brake = (v_ego / 3.6) / max_decel
         
-        # 1. 반응 시간 동안 이동 거리
-        d_reaction = v_ego * self.ads_reaction_time
+        # 정지에 필요한 총 시간 (반응 + 제동 빌드업 + 최대 제동)
+        t_stop = reaction_time + buildup_time + t_full_brake
         
-        # 2. 제동 빌드업 동안 이동 거리 (평균 감속도 적용)
-        avg_decel_during_buildup = self.ads_max_decel / 2
-        d_buildup = v_ego * self.ads_buildup_time - 0.5 * avg_decel_during_buildup * self.ads_buildup_time**2
+        return t_stop + failure_offset
+
+    def calculate_early_collision_batch(self, columns):
+        """calculate_early_collision의 배열 버전 (시나리오별 조기 충돌 여부 마스크)"""
+        v_ego = np.asarray(columns['v_ego']) / 3.6
+        v_lv1 = np.asarray(columns['v_lv1']) / 3.6
+        v_lv1_lat = np.asarray(columns['v_lv1_lat'])
+        d_0 = np.asarray(columns['d_ego_lv1'])
         
-        # 3. 최대 제동 적용 시 정지 거리
-        t_full_brake = v_ego / self.ads_max_decel
-        d_full_brake = 0.5 * self.ads_max_decel * t_full_brake**2
+        v_rel = v_ego - v_lv1
+        lane_width = self.config['environment']['road_network']['lane_width']
+        t_clear = lane_width / v_lv1_lat
         
-        # 총 정지 거리
-        d_stop = d_reaction + d_buildup + d_full_brake
+        # 상대 속도가 0 이하인 경우는 마스크로 제외 (0 나눗셈 경고 무시)
+        closing = v_rel > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_collision = (d_0 - self.min_safe_distance) / v_rel
         
-        # 정지에 필요한 총 시간
-        t_stop = self.ads_reaction_time + self.ads_buildup_time + t_full_brake
+        return closing & (t_collision < t_clear)
+
+    def calculate_initial_gaps_batch(self, columns):
+        """calculate_initial_gaps의 배열 버전"""
+        return np.asarray(columns['d_ego_lv1']), np.asarray(columns['d_lv1_lv2'])
+
+    def calculate_ttc_reveal_batch(self, columns):
+        """calculate_ttc_reveal의 배열 버전 (상대 속도가 0 이하이면 inf)"""
+        v_ego = np.asarray(columns['v_ego']) / 3.6
+        v_lv2 = np.asarray(columns['v_lv2']) / 3.6
+        thw_reveal = np.asarray(columns['thw_ego_lv2_reveal'])
         
-        # 강화된 기준 적용 (ADS 실패 조건) - UN R157 2023년 1월 개정안 기준 적용
-        return ttc_reveal < (t_stop + self.ads_failure_offset)
\ No newline at end of file
+        d_reveal = v_ego * thw_reveal
+        v_rel = v_ego - v_lv2
+        
+        closing = v_rel > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ttc_reveal = (d_reveal - self.min_safe_distance) / v_rel
+        
+        return np.where(closing, ttc_reveal, np.inf)
+
+    def evaluate_human_model_batch(self, columns, ttc_reveal):
+        """evaluate_human_model의 배열 버전 (시나리오별 Human 모델 실패 마스크)"""
+        return np.asarray(ttc_reveal) < self._failure_threshold_batch('human_model', columns['v_ego'])
+
+    def evaluate_ads_model_batch(self, columns, ttc_reveal):
+        """evaluate_ads_model의 배열 버전 (시나리오별 ADS 모델 실패 마스크)"""
+        return np.asarray(ttc_reveal) < self._failure_threshold_batch('ads_model', columns['v_ego'])
+
+    def _failure_threshold_batch(self, model_name, v_ego):
+        """시나리오별 실패 임계 TTC 배열 (벡터 연산, 연속 v_ego도 테이블 캐시를 거치지 않음)"""
+        return self._compute_failure_threshold(model_name, np.asarray(v_ego, dtype=float))
+
+    def evaluate_model_variants(self, columns, ttc_reveal, variants):
+        """여러 제어 모델 파라미터 조합을 브로드캐스팅으로 한 번에 평가
+        
+        variants: 'human_model.reaction_time', 'ads_model.max_deceleration',
+        'evaluation_criteria.human_failure_offset' 형식 키의 파라미터 변경 dict 목록
+        반환: (human_fails, ads_fails) 각각 (시나리오 수 x 변형 수) 불리언 행렬
+        """
+        unique_v_ego, inverse = np.unique(np.asarray(columns['v_ego']), return_inverse=True)
+        ttc_reveal = np.asarray(ttc_reveal)[:, None]
+        
+        results = []
+        for model_name in ('human_model', 'ads_model'):
+            params = self._variant_parameters(model_name, variants)
+            
+            # (고유 v_ego x 변형) 임계값 테이블 -> 시나리오별로 확장
+            t_full_brake = (unique_v_ego[:, None] / 3.6) / params['max_deceleration'][None, :]
+            t_stop = params['reaction_time'][None, :] + params['deceleration_buildup_time'][None, :] + t_full_brake
+            thresholds = t_stop + params['failure_offset'][None, :]
+            results.append(ttc_reveal < thresholds[inverse])
+        
+        return results[0], results[1]
+
+    @staticmethod
+    def expand_variant_grid(grid):
+        """{'human_model.reaction_time': [..], ...} 형식 그리드를 변형 dict 목록으로 전개"""
+        keys = list(grid.keys())
+        return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+    def _variant_parameters(self, model_name, variants):
+        """변형별 모델 파라미터 배열 (지정하지 않은 값은 현재 설정 사용)"""
+        prefix = 'human' if model_name == 'human_model' else 'ads'
+        base = {
+            'reaction_time': getattr(self, f"{prefix}_reaction_time"),
+            'max_deceleration': getattr(self, f"{prefix}_max_decel"),
+            'deceleration_buildup_time': getattr(self, f"{prefix}_buildup_time"),
+            'failure_offset': getattr(self, f"{prefix}_failure_offset")
+        }
+        
+        for variant in variants:
+            for key in variant:
+                if key not in VARIANT_PARAMETERS:
+                    raise ValueError(f"지원하지 않는 변형 파라미터: {key}")
+        
+        params = {}
+        for name, value in base.items():
+            if name == 'failure_offset':
+                key = f"evaluation_criteria.{prefix}_failure_offset"
+            else:
+                key = f"{model_name}.{name}"
+            params[name] = np.array([float(variant.get(key, value)) for variant in variants])
+        return params
@@ -4,213 +4,188 @@ UN R157 2023년 1월 개정안 기준 적용
 '''
 
 import os
+import re
 import logging
 import math
+import tempfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 import scenariogeneration as sg
+from scenariogeneration import xosc
+from ..utils.xosc_cache import XoscCache
 
 logger = logging.getLogger('cutout_scenario.converter')
 
+# XOSC FileHeader 날짜 (실행 시각을 쓰면 같은 Test Case도 내용이 달라져 템플릿 검증, 캐시, 재개 시 내용 해시 비교가 실패함)
+XOSC_FILE_DATE = '2023-01-01T00:00:00'
+
+# 차량 축 (최대 조향각 rad, 바퀴 지름 m, 윤거 m, x 위치 m, z 위치 m) 및 성능 (최고 속도 m/s, 최대 가속도/감속도 m/s²)
+_FRONT_AXLE = (0.5236, 0.8, 1.68, 2.98, 0.4)
+_REAR_AXLE = (0.0, 0.8, 1.68, 0.0, 0.4)
+_VEHICLE_PERFORMANCE = (69.0, 10.0, 10.0)
+
+def scenario_xosc_values(scenario_data, config):
+    """시나리오 파라미터로부터 XOSC에 기록되는 값 계산 (속도 m/s, 위치 m, 시간 s)"""
+    lane_width = config['environment']['road_network']['lane_width']
+    
+    # 차선 변경 완료 시간
+    t_clear = lane_width / scenario_data['v_lv1_lat']
+    v_lv2 = scenario_data['v_lv2'] / 3.6  # m/s로 변환
+    
+    return {
+        'scenario_name': f"Cut-out_Scenario_Ego_{scenario_data['v_ego']}_LV1_{scenario_data['v_lv1']}_LV2_{scenario_data['v_lv2']}",
+        'ego_speed': scenario_data['v_ego'] / 3.6,
+        'lv1_s': scenario_data['d_ego_lv1'],  # Ego와 LV1 사이 거리
+        'lv1_speed': scenario_data['v_lv1'] / 3.6,
+        'lv2_s': scenario_data['d_ego_lv1'] + scenario_data['d_lv1_lv2'],  # LV1과 LV2 사이 거리 누적
+        'lv2_speed': v_lv2,
+        't_clear': t_clear,
+        'deceleration_start_time': 1.0 + t_clear,
+        'deceleration_trigger_delay': scenario_data['lv2_deceleration_trigger_delay'],
+        'lv2_target_speed': max(0, v_lv2 - scenario_data['dec_lv2'] * 3.0),  # 3초 동안 감속 후 속도
+        'dec_lv2': scenario_data['dec_lv2'],
+        'lane_change_direction': scenario_data['lane_change_direction']
+    }
+
+def _generate_xosc(scenario_generator, output_file):
+    """ScenarioGenerator로 XOSC를 생성하여 output_file로 저장
+
+    generate()는 파일 경로가 아닌 생성 폴더를 받아 <폴더>/xosc/ 아래에 파일을 만들므로,
+    출력 파일과 같은 디렉토리의 임시 폴더에 생성한 뒤 교체한다.
+    """
+    output_dir = os.path.dirname(output_file) or '.'
+    os.makedirs(output_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=output_dir) as generation_folder:
+        scenario_files, _ = scenario_generator.generate(generation_folder)
+        if not scenario_files or not scenario_files[0]:
+            raise RuntimeError(f"scenariogeneration이 XOSC 파일을 생성하지 않았습니다: {output_file}")
+        os.replace(scenario_files[0], output_file)
+    return output_file
+
 class CutOutScenarioGenerator(sg.ScenarioGenerator):
-    """Cut-out 시나리오를 위한 ScenarioGenerator 확장 클래스"""
+    """Cut-out 시나리오를 위한 ScenarioGenerator 확장 클래스 (scenario()가 xosc.Scenario 반환)"""
     
     def __init__(self, scenario_data, config):
         super().__init__()
         self.scenario_data = scenario_data
         self.config = config
     
+    def xosc_values(self):
+        """XOSC에 기록되는 시나리오별 값"""
+        return scenario_xosc_values(self.scenario_data, self.config)
+    
+    def has_lv2_deceleration(self):
+        """LV2 감속 기동 포함 여부"""
+        return self.xosc_values()['dec_lv2'] > 0
+    
     def scenario_name(self):
         """시나리오 이름 설정"""
-        return f"Cut-out_Scenario_Ego_{self.scenario_data['v_ego']}_LV1_{self.scenario_data['v_lv1']}_LV2_{self.scenario_data['v_lv2']}"
+        return self.xosc_values()['scenario_name']
+    
+    def scenario(self, **kwargs):
+        """OpenSCENARIO 시나리오 구성 (ScenarioGenerator.generate()가 호출)"""
+        return xosc.Scenario(
+            self.scenario_name(),
+            self.config['scenario']['author'],
+            self.parameter_declarations(),
+            self.entities(),
+            self.storyboard(),
+            self.road_network(),
+            xosc.Catalog(),
+            creation_date=datetime.fromisoformat(XOSC_FILE_DATE)
+        )
     
-    def road(self):
-        """도로 네트워크 설정"""
+    def road_network(self):
+        """도로 네트워크 설정 (기존 OpenDRIVE 파일 참조)"""
         road_file = self.config['environment']['road_network']['road_file']
-        return sg.xosc.RoadNetwork(roadfile=road_file)
+        return xosc.RoadNetwork(roadfile=road_file)
     
-    def parameters(self):
+    def parameter_declarations(self):
         """시나리오 파라미터 설정"""
-        param_decl = sg.ParameterDeclarations()
+        param_decl = xosc.ParameterDeclarations()
         
         # 고정 파라미터 추가
-        param_decl.add_parameter(sg.Parameter('LaneWidth', sg.ParameterType.double, str(self.config['environment']['road_network']['lane_width'])))
+        param_decl.add_parameter(xosc.Parameter('LaneWidth', xosc.ParameterType.double, str(self.config['environment']['road_network']['lane_width'])))
         
         return param_decl
     
     def entities(self):
-        """시나리오 엔티티 설정"""
-        # 차량 객체 목록
-        entities = []
-        
-        # Ego 차량
-        ego_config = self.config['vehicles']['ego_vehicle']
-        ego_dims = ego_config['dimensions']
-        
-        ego = sg.ScenarioObject(name='Ego')
-        ego.add_entity(sg.Vehicle('car', 
-                                 sg.VehicleCategory.car, 
-                                 sg.BoundingBox(ego_dims['width'], 
-                                               ego_dims['length'], 
-                                               ego_dims['height'], 
-                                               ego_dims['width']/2, 
-                                               0, 
-                                               ego_dims['height']/2)))
-        entities.append(ego)
-        
-        # LV1 (Lead Vehicle 1) 차량
-        lv1_config = self.config['vehicles']['lead_vehicle_1']
-        lv1_dims = lv1_config['dimensions']
-        
-        lv1 = sg.ScenarioObject(name='LV1')
-        lv1.add_entity(sg.Vehicle('car', 
-                                 sg.VehicleCategory.car, 
-                                 sg.BoundingBox(lv1_dims['width'], 
-                                               lv1_dims['length'], 
-                                               lv1_dims['height'], 
-                                               lv1_dims['width']/2, 
-                                               0, 
-                                               lv1_dims['height']/2)))
-        entities.append(lv1)
-        
-        # LV2 (Lead Vehicle 2) 차량
-        lv2_config = self.config['vehicles']['lead_vehicle_2']
-        lv2_dims = lv2_config['dimensions']
-        
-        lv2 = sg.ScenarioObject(name='LV2')
-        lv2.add_entity(sg.Vehicle('car', 
-                                 sg.VehicleCategory.car, 
-                                 sg.BoundingBox(lv2_dims['width'], 
-                                               lv2_dims['length'], 
-                                               lv2_dims['height'], 
-                                               lv2_dims['width']/2, 
-                                               0, 
-                                               lv2_dims['height']/2)))
-        entities.append(lv2)
+        """시나리오 엔티티 설정 (Ego, LV1, LV2)"""
+        entities = xosc.Entities()
+        
+        for name, vehicle_key in (('Ego', 'ego_vehicle'), ('LV1', 'lead_vehicle_1'), ('LV2', 'lead_vehicle_2')):
+            dims = self.config['vehicles'][vehicle_key]['dimensions']
+            bounding_box = xosc.BoundingBox(dims['width'], dims['length'], dims['height'], dims['width']/2, 0, dims['height']/2)
+            entities.add_scenario_object(name, xosc.Vehicle(
+                'car',
+                xosc.VehicleCategory.car,
+                bounding_box,
+                xosc.Axle(*_FRONT_AXLE),
+                xosc.Axle(*_REAR_AXLE),
+                *_VEHICLE_PERFORMANCE
+            ))
         
         return entities
     
     def init(self):
-        """초기 상태 설정"""
+        """초기 상태 설정 ((엔티티 이름, 초기화 행동) 목록)"""
         init_actions = []
+        values = self.xosc_values()
         
         # 차선 ID 및 도로 설정
         start_lane_id = self.config['environment']['road_network']['start_lane_id']
         
-        # Ego 차량 초기화 (속도 및 위치)
-        v_ego = self.scenario_data['v_ego'] / 3.6  # m/s로 변환
-        
-        # Ego 초기 위치
-        init_actions.append(sg.TeleportAction(
-            entity='Ego',
-            position=sg.LanePosition(
-                roadId=1,
-                laneId=start_lane_id,
-                offset=0.0,
-                s=0.0
-            )
-        ))
-        
-        # Ego 초기 속도
-        init_actions.append(sg.AbsoluteSpeedAction(
-            entity='Ego',
-            value=v_ego
-        ))
-        
-        # LV1 차량 초기화
-        v_lv1 = self.scenario_data['v_lv1'] / 3.6  # m/s로 변환
-        d_ego_lv1 = self.scenario_data['d_ego_lv1']  # Ego와 LV1 사이 거리
-        
-        # LV1 초기 위치
-        init_actions.append(sg.TeleportAction(
-            entity='LV1',
-            position=sg.LanePosition(
-                roadId=1,
-                laneId=start_lane_id,
-                offset=0.0,
-                s=d_ego_lv1
-            )
-        ))
-        
-        # LV1 초기 속도
-        init_actions.append(sg.AbsoluteSpeedAction(
-            entity='LV1',
-            value=v_lv1
-        ))
-        
-        # LV2 차량 초기화
-        v_lv2 = self.scenario_data['v_lv2'] / 3.6  # m/s로 변환
-        d_lv1_lv2 = self.scenario_data['d_lv1_lv2']  # LV1과 LV2 사이 거리
-        
-        # LV2 초기 위치
-        init_actions.append(sg.TeleportAction(
-            entity='LV2',
-            position=sg.LanePosition(
-                roadId=1,
-                laneId=start_lane_id,
-                offset=0.0,
-                s=d_ego_lv1 + d_lv1_lv2
-            )
-        ))
-        
-        # LV2 초기 속도
-        init_actions.append(sg.AbsoluteSpeedAction(
-            entity='LV2',
-            value=v_lv2
-        ))
+        # 차량별 초기 위치(s) 및 속도 (m/s, Ego 기준 거리 누적)
+        initial_states = (
+            ('Ego', 0.0, values['ego_speed']),
+            ('LV1', values['lv1_s'], values['lv1_speed']),
+            ('LV2', values['lv2_s'], values['lv2_speed'])
+        )
+        for entity, s, speed in initial_states:
+            init_actions.append((entity, xosc.TeleportAction(xosc.LanePosition(s, 0.0, start_lane_id, 1))))
+            init_actions.append((entity, xosc.AbsoluteSpeedAction(
+                speed,
+                xosc.TransitionDynamics(xosc.DynamicsShapes.step, xosc.DynamicsDimension.time, 0)
+            )))
         
         return init_actions
     
-    def create_entities(self):
-        """실제 엔티티 생성"""
-        return super().create_entities()
-    
-    def create_storyboard(self):
-        """스토리보드 생성"""
-        return super().create_storyboard()
-    
     def maneuvers(self):
         """시나리오 기동 설정"""
         maneuver_groups = []
-        
-        # 차선 폭 계산
-        lane_width = self.config['environment']['road_network']['lane_width']
+        values = self.xosc_values()
         
         # 차선 변경 방향
-        lane_change_direction = self.scenario_data['lane_change_direction']
+        lane_change_direction = values['lane_change_direction']
         
         # LV1 차선 변경 기동 그룹
-        lv1_maneuver_group = sg.ManeuverGroup("LV1_ManeuverGroup")
+        lv1_maneuver_group = xosc.ManeuverGroup("LV1_ManeuverGroup")
         lv1_maneuver_group.add_actor("LV1")
         
         # LV1 차선 변경 기동
-        lane_change_maneuver = sg.Maneuver("LV1_LaneChange")
+        lane_change_maneuver = xosc.Maneuver("LV1_LaneChange")
         
         # 차선 변경 이벤트
-        lane_change_event = sg.Event("LaneChangeEvent", priority=sg.Priority.override)
+        lane_change_event = xosc.Event("LaneChangeEvent", xosc.Priority.override)
         
         # 차선 변경 시작 트리거
-        start_trigger = sg.ValueTrigger(
-            name="LaneChangeStartTrigger",
-            delay=0,
-            conditionedge=sg.ConditionEdge.rising,
-            valuecondition=sg.SimulationTimeCondition(1.0, sg.Rule.greaterThan)
+        start_trigger = xosc.ValueTrigger(
+            "LaneChangeStartTrigger",
+            0,
+            xosc.ConditionEdge.rising,
+            xosc.SimulationTimeCondition(1.0, xosc.Rule.greaterThan)
         )
         lane_change_event.add_trigger(start_trigger)
         
-        # 차선 변경 행동
-        v_lv1_lat = self.scenario_data['v_lv1_lat']
-        t_clear = lane_width / v_lv1_lat  # 차선 변경 완료 시간
-        
-        lane_change_action = sg.LaneChangeAction(
-            entity="LV1",
-            target_lane_offset=0.0,
-            dynamics=sg.TransitionDynamics(
-                shape=sg.DynamicsShape.sinusoidal,
-                dimension=sg.DynamicsDimension.time,
-                value=t_clear
-            )
+        # 차선 변경 행동 (t_clear: 차선 변경 완료 시간)
+        lane_change_action = xosc.RelativeLaneChangeAction(
+            lane_change_direction,
+            "LV1",
+            xosc.TransitionDynamics(xosc.DynamicsShapes.sinusoidal, xosc.DynamicsDimension.time, values['t_clear']),
+            target_lane_offset=0.0
         )
-        lane_change_action.set_relative_target_lane(lane_change_direction)
-        lane_change_event.add_action(lane_change_action)
+        lane_change_event.add_action("LaneChangeAction", lane_change_action)
         
         # 이벤트를 기동에 추가
         lane_change_maneuver.add_event(lane_change_event)
@@ -221,41 +196,32 @@ class CutOutScenarioGenerator(sg.ScenarioGenerator):
         # 기동 그룹 추가
         maneuver_groups.append(lv1_maneuver_group)
         
-        # LV2 감속 기동 그룹
-        lv2_maneuver_group = sg.ManeuverGroup("LV2_ManeuverGroup")
-        lv2_maneuver_group.add_actor("LV2")
-        
-        # LV2 감속 기동
-        decel_maneuver = sg.Maneuver("LV2_Deceleration")
-        
-        # 감속 이벤트
-        decel_event = sg.Event("DecelerationEvent", priority=sg.Priority.override)
-        
-        # 감속 시작 트리거
-        trigger_delay = self.scenario_data['lv2_deceleration_trigger_delay']
-        decel_trigger = sg.ValueTrigger(
-            name="DecelerationStartTrigger",
-            delay=trigger_delay,
-            conditionedge=sg.ConditionEdge.rising,
-            valuecondition=sg.SimulationTimeCondition(1.0 + t_clear, sg.Rule.greaterThan)
-        )
-        decel_event.add_trigger(decel_trigger)
-        
-        # 감속 행동
-        dec_lv2 = self.scenario_data['dec_lv2']
-        v_lv2 = self.scenario_data['v_lv2'] / 3.6  # m/s로 변환
-        
-        if dec_lv2 > 0:
-            decel_action = sg.AbsoluteSpeedAction(
-                entity="LV2",
-                value=max(0, v_lv2 - dec_lv2 * 3.0),  # 3초 동안 감속 후 속도
-                dynamics=sg.TransitionDynamics(
-                    shape=sg.DynamicsShape.linear,
-                    dimension=sg.DynamicsDimension.rate,
-                    value=dec_lv2
-                )
+        if self.has_lv2_deceleration():
+            # LV2 감속 기동 그룹
+            lv2_maneuver_group = xosc.ManeuverGroup("LV2_ManeuverGroup")
+            lv2_maneuver_group.add_actor("LV2")
+            
+            # LV2 감속 기동
+            decel_maneuver = xosc.Maneuver("LV2_Deceleration")
+            
+            # 감속 이벤트
+            decel_event = xosc.Event("DecelerationEvent", xosc.Priority.override)
+            
+            # 감속 시작 트리거
+            decel_trigger = xosc.ValueTrigger(
+                "DecelerationStartTrigger",
+                values['deceleration_trigger_delay'],
+                xosc.ConditionEdge.rising,
+                xosc.SimulationTimeCondition(values['deceleration_start_time'], xosc.Rule.greaterThan)
             )
-            decel_event.add_action(decel_action)
+            decel_event.add_trigger(decel_trigger)
+            
+            # 감속 행동 (3초 동안 감속 후 속도)
+            decel_action = xosc.AbsoluteSpeedAction(
+                values['lv2_target_speed'],
+                xosc.TransitionDynamics(xosc.DynamicsShapes.linear, xosc.DynamicsDimension.rate, values['dec_lv2'])
+            )
+            decel_event.add_action("DecelerationAction", decel_action)
             
             # 이벤트를 기동에 추가
             decel_maneuver.add_event(decel_event)
@@ -270,25 +236,23 @@ class CutOutScenarioGenerator(sg.ScenarioGenerator):
     
     def act(self):
         """시나리오 액트 설정"""
-        act = sg.Act("CutOutAct")
+        # 액트 시작 트리거
+        act = xosc.Act("CutOutAct", xosc.ValueTrigger(
+            "ActStartTrigger",
+            0,
+            xosc.ConditionEdge.rising,
+            xosc.SimulationTimeCondition(0.0, xosc.Rule.greaterThan)
+        ))
         
         # 기동 그룹 생성 및 추가
         for maneuver_group in self.maneuvers():
             act.add_maneuver_group(maneuver_group)
         
-        # 액트 시작 트리거
-        act.add_start_trigger(sg.ValueTrigger(
-            name="ActStartTrigger",
-            delay=0,
-            conditionedge=sg.ConditionEdge.rising,
-            valuecondition=sg.SimulationTimeCondition(0.0, sg.Rule.greaterThan)
-        ))
-        
         return act
     
     def story(self):
         """시나리오 스토리 설정"""
-        story = sg.Story("CutOutStory")
+        story = xosc.Story("CutOutStory", xosc.ParameterDeclarations())
         
         # 액트 추가
         story.add_act(self.act())
@@ -297,25 +261,239 @@ class CutOutScenarioGenerator(sg.ScenarioGenerator):
     
     def storyboard(self):
         """스토리보드 설정"""
-        storyboard = sg.StoryBoard()
-        
         # 초기화 설정
-        for init_action in self.init():
-            if isinstance(init_action, sg.TeleportAction):
-                storyboard.add_init_action(init_action.entity, init_action)
-            elif isinstance(init_action, sg.AbsoluteSpeedAction):
-                storyboard.add_init_action(init_action.entity, init_action)
+        init = xosc.Init()
+        for entity, init_action in self.init():
+            init.add_init_action(entity, init_action)
+        
+        # 시뮬레이션 시간이 끝나면 종료
+        stop_trigger = xosc.ValueTrigger(
+            "StopTrigger",
+            0,
+            xosc.ConditionEdge.rising,
+            xosc.SimulationTimeCondition(self.config['simulation']['duration'], xosc.Rule.greaterThan),
+            'stop'
+        )
+        storyboard = xosc.StoryBoard(init, stop_trigger)
         
         # 스토리 추가
         storyboard.add_story(self.story())
         
         return storyboard
 
+# 템플릿 렌더링 시 시나리오별로 치환되는 XOSC 값
+TEMPLATE_FIELDS = (
+    'scenario_name',
+    'ego_speed',
+    'lv1_s',
+    'lv1_speed',
+    'lv2_s',
+    'lv2_speed',
+    't_clear',
+    'deceleration_start_time',
+    'deceleration_trigger_delay',
+    'lv2_target_speed',
+    'dec_lv2'
+)
+
+# LV2 감속 기동이 있을 때만 XOSC에 기록되는 값 (감속 이벤트의 시작 조건 포함)
+_DECELERATION_FIELDS = ('deceleration_start_time', 'deceleration_trigger_delay', 'lv2_target_speed', 'dec_lv2')
+
+# 템플릿 생성용 표식 값 (같은 자릿수의 서로 다른 값이므로 서로의 부분 문자열이 되지 않음)
+_TEMPLATE_SENTINELS = {field: 9000101.5 + index for index, field in enumerate(TEMPLATE_FIELDS[1:])}
+_TEMPLATE_SENTINELS['scenario_name'] = 'CutOutTemplateScenarioName'
+
+class _TemplateScenarioGenerator(CutOutScenarioGenerator):
+    """시나리오별 값 대신 표식 값을 기록하는 템플릿 생성용 시나리오"""
+    
+    def __init__(self, config, decelerating, lane_change_direction):
+        super().__init__({}, config)
+        self.decelerating = decelerating
+        self.lane_change_direction = lane_change_direction
+    
+    def xosc_values(self):
+        """표식 값 (감속 여부와 차선 변경 방향은 XOSC 구조를 결정하므로 실제 값 사용)"""
+        values = dict(_TEMPLATE_SENTINELS)
+        values['lane_change_direction'] = self.lane_change_direction
+        if not self.decelerating:
+            values['dec_lv2'] = 0.0
+        return values
+
+class XoscTemplate:
+    """표식 값 위치를 치환 필드로 바꾼 컴파일된 XOSC 템플릿"""
+    
+    def __init__(self, parts, fields):
+        self.parts = parts  # 필드 사이의 고정 바이트열 (len(fields) + 1개)
+        self.fields = fields
+    
+    @staticmethod
+    def build(config, decelerating, lane_change_direction):
+        """CutOutScenarioGenerator로 표식 값 XOSC를 한 번 생성하여 템플릿으로 컴파일"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_file = os.path.join(temp_dir, 'template.xosc')
+            _generate_xosc(_TemplateScenarioGenerator(config, decelerating, lane_change_direction), template_file)
+            with open(template_file, 'rb') as f:
+                content = f.read()
+        
+        required_fields = [
+            field for field in TEMPLATE_FIELDS
+            if decelerating or field not in _DECELERATION_FIELDS
+        ]
+        return XoscTemplate.compile(content, required_fields)
+    
+    @staticmethod
+    def compile(content, required_fields=TEMPLATE_FIELDS):
+        """표식 값이 기록된 XOSC 바이트열을 템플릿으로 변환"""
+        tokens = {XoscTemplate.format_value(value).encode(): field for field, value in _TEMPLATE_SENTINELS.items()}
+        pattern = re.compile(b'|'.join(re.escape(token) for token in tokens))
+        
+        parts, fields, position = [], [], 0
+        for match in pattern.finditer(content):
+            parts.append(content[position:match.start()])
+            fields.append(tokens[match.group()])
+            position = match.end()
+        parts.append(content[position:])
+        
+        missing = set(required_fields) - set(fields)
+        if missing:
+            raise ValueError(f"XOSC 템플릿에서 시나리오 값 위치를 찾지 못했습니다: {sorted(missing)}")
+        
+        return XoscTemplate(parts, fields)
+    
+    def render(self, values):
+        """시나리오별 값을 치환한 XOSC 바이트열"""
+        chunks = [self.parts[0]]
+        for field, part in zip(self.fields, self.parts[1:]):
+            chunks.append(self.format_value(values[field]).encode())
+            chunks.append(part)
+        return b''.join(chunks)
+    
+    @staticmethod
+    def format_value(value):
+        """scenariogeneration의 실수 속성 직렬화(str(float))와 같은 형식"""
+        if isinstance(value, str):
+            return value
+        return str(float(value))
+
+# 파라미터화 출력 모드에서 ParameterDeclarations에 선언되는 XOSC 값 -> 파라미터 이름
+PARAMETER_NAMES = {
+    'ego_speed': 'EgoSpeed',
+    'lv1_s': 'LV1InitialS',
+    'lv1_speed': 'LV1Speed',
+    'lv2_s': 'LV2InitialS',
+    'lv2_speed': 'LV2Speed',
+    't_clear': 'LaneChangeDuration',
+    'deceleration_start_time': 'DecelerationStartTime',
+    'deceleration_trigger_delay': 'DecelerationTriggerDelay',
+    'lv2_target_speed': 'LV2TargetSpeed',
+    'dec_lv2': 'LV2DecelerationRate'
+}
+
+def parameter_assignments(values, include_deceleration=True):
+    """분포 파일의 ParameterValueSet 하나에 기록되는 파라미터 이름 -> 값 문자열"""
+    return {
+        name: XoscTemplate.format_value(values[field])
+        for field, name in PARAMETER_NAMES.items()
+        if include_deceleration or field not in _DECELERATION_FIELDS
+    }
+
+def scenario_structure(values):
+    """XOSC 구조를 결정하는 값 (LV2 감속 기동 포함 여부, 차선 변경 방향)"""
+    return values['dec_lv2'] > 0, values['lane_change_direction']
+
+class _ParameterizedScenarioGenerator(CutOutScenarioGenerator):
+    """시나리오별 값 대신 $파라미터 참조를 기록하는 파라미터화 시나리오"""
+    
+    def __init__(self, config, default_values, decelerating, lane_change_direction):
+        super().__init__({}, config)
+        self.default_values = default_values
+        self.decelerating = decelerating
+        self.lane_change_direction = lane_change_direction
+    
+    def has_lv2_deceleration(self):
+        """LV2 감속 기동 포함 여부 (구조별로 고정)"""
+        return self.decelerating
+    
+    def xosc_values(self):
+        """$파라미터 참조 (차선 변경 방향은 XOSC 구조를 결정하므로 실제 값 사용)"""
+        values = {field: f"${name}" for field, name in PARAMETER_NAMES.items()}
+        values['scenario_name'] = 'Cut-out_Scenario_Parameterized'
+        values['lane_change_direction'] = self.lane_change_direction
+        return values
+    
+    def parameter_declarations(self):
+        """시나리오 파라미터 설정 (기본값은 구조별 첫 번째 Test Case 값)"""
+        param_decl = super().parameter_declarations()
+        
+        for field, name in PARAMETER_NAMES.items():
+            if field in _DECELERATION_FIELDS and not self.decelerating:
+                continue
+            param_decl.add_parameter(xosc.Parameter(name, xosc.ParameterType.double, XoscTemplate.format_value(self.default_values[field])))
+        
+        return param_decl
+
+def _convert_shard(config, jobs):
+    """워커 프로세스: (번호, Test Case, 출력 파일) 목록 변환 (템플릿은 샤드 내에서 재사용)"""
+    converter = ComparativeScenarioConverter(config)
+    return [converter._convert_job(index, test_case, output_file) for index, test_case, output_file in jobs]
+
 class ComparativeScenarioConverter:
     """scenariogeneration 라이브러리를 활용한 OpenSCENARIO 변환기"""
     
     def __init__(self, config):
         self.config = config
+        self._templates = {}  # (감속 여부, 차선 변경 방향) -> XoscTemplate (검증 실패 시 None)
+        self.cache = self._create_cache()
+        
+    def convert(self, test_case, output_file):
+        """설정(simulation.conversion.render_mode)에 따라 OpenSCENARIO 파일 생성"""
+        render_mode = self.config['simulation'].get('conversion', {}).get('render_mode', 'generator')
+        if render_mode == 'template':
+            return self.render_to_openscenario(test_case, output_file)
+        if render_mode != 'generator':
+            raise ValueError(f"지원하지 않는 simulation.conversion.render_mode 값: {render_mode}")
+        return self.convert_to_openscenario(test_case, output_file)
+        
+    def render_to_openscenario(self, test_case, output_file):
+        """컴파일된 XOSC 템플릿에 시나리오별 값만 치환하여 저장 (convert_to_openscenario와 같은 내용)
+        
+        구조별 템플릿은 처음 사용할 때 생성하며, 첫 시나리오는 객체 생성 경로 결과와
+        바이트 단위로 비교하여 다르면 해당 구조에 대해 객체 생성 경로를 사용한다.
+        """
+        values = scenario_xosc_values(test_case, self.config)
+        key = scenario_structure(values)
+        
+        if key not in self._templates:
+            return self._build_and_verify_template(key, test_case, values, output_file)
+        
+        template = self._templates[key]
+        if template is None:
+            return self.convert_to_openscenario(test_case, output_file)
+        
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        with open(output_file, 'wb') as f:
+            f.write(template.render(values))
+        
+        logger.debug(f"OpenSCENARIO 파일 렌더링 완료: {output_file}")
+        return output_file
+        
+    def _build_and_verify_template(self, key, test_case, values, output_file):
+        """템플릿 생성 후 첫 시나리오의 렌더링 결과를 객체 생성 경로 결과와 비교"""
+        try:
+            template = XoscTemplate.build(self.config, *key)
+        except Exception as e:
+            logger.warning(f"XOSC 템플릿 생성 실패, 객체 생성 경로 사용: {e}")
+            template = None
+        
+        self.convert_to_openscenario(test_case, output_file)
+        if template is not None:
+            with open(output_file, 'rb') as f:
+                if f.read() != template.render(values):
+                    logger.warning(f"XOSC 템플릿 렌더링 결과가 객체 생성 경로와 달라 사용하지 않습니다: 구조 {key}")
+                    template = None
+        
+        self._templates[key] = template
+        return output_file
         
     def convert_to_openscenario(self, test_case, output_file):
         """Test Case를 OpenSCENARIO (.xosc) 파일로 변환"""
@@ -328,7 +506,184 @@ class ComparativeScenarioConverter:
         scenario_generator = CutOutScenarioGenerator(test_case, self.config)
         
         # OpenSCENARIO 생성 및 저장
-        scenario_generator.generate(output_file)
+        _generate_xosc(scenario_generator, output_file)
         
         logger.info(f"OpenSCENARIO 파일 생성 완료: {output_file}")
-        return output_file
\ No newline at end of file
+        return output_file
+        
+    def convert_batch(self, test_cases, output_dir, workers=None, chunk_size=None, indices=None):
+        """여러 Test Case를 scenario_NNN.xosc 파일로 변환 (프로세스 풀 병렬 처리)
+        
+        파일별 실패는 배치를 중단하지 않고 결과 목록에 기록된다. XOSC 캐시를 사용하면
+        결과에 'hash', 'cached'가 추가되고 output_dir에 시나리오 ID -> 해시 매니페스트가 저장된다.
+        indices를 지정하면 해당 번호의 Test Case만 변환한다 (파일 번호는 전체 순서 기준).
+        반환: Test Case 순서대로 {'index', 'scenario_id', 'output_file', 'success', 'error'} 목록
+        """
+        workers, chunk_size = self._parallel_settings(workers, chunk_size)
+        if indices is None:
+            indices = range(len(test_cases))
+        jobs = [
+            (index, test_cases[index], os.path.join(output_dir, f"scenario_{index+1:03d}.xosc"))
+            for index in indices
+        ]
+        logger.info(f"OpenSCENARIO 일괄 변환 시작: {len(jobs)}개, 워커 {workers}개")
+        
+        if workers <= 1 or len(jobs) <= chunk_size:
+            results = [self._convert_job(*job) for job in jobs]
+        else:
+            shards = [jobs[start:start + chunk_size] for start in range(0, len(jobs), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map은 입력 순서대로 결과를 반환하므로 결과 순서가 Test Case 순서와 같음
+                results = [
+                    result
+                    for shard_results in executor.map(_convert_shard, [self.config] * len(shards), shards)
+                    for result in shard_results
+                ]
+        
+        if self.cache is not None:
+            hashes = {result['scenario_id']: result['hash'] for result in results if result['success']}
+            XoscCache.write_manifest(output_dir, hashes, merge=len(jobs) < len(test_cases))
+            cached_count = sum(result['cached'] for result in results)
+            logger.info(f"XOSC 캐시 재사용: {cached_count}개 / {len(results)}개")
+        
+        failures = [result for result in results if not result['success']]
+        for failure in failures:
+            logger.error(f"OpenSCENARIO 변환 실패 ({failure['scenario_id']}): {failure['error']}")
+        logger.info(f"OpenSCENARIO 일괄 변환 완료: 성공 {len(results) - len(failures)}개, 실패 {len(failures)}개")
+        return results
+        
+    def convert_parameterized(self, test_cases, output_dir, indices=None):
+        """XOSC 구조별 파라미터화 시나리오 1개와 ParameterValueDistribution 파일 1개로 변환
+        
+        Test Case별 값은 분포 파일의 ParameterValueSet으로 기록되며, ESmini에서는
+        --param_dist와 --param_permutation(구조별 분포 파일 내 순번)으로 실행한다.
+        indices를 지정하면 해당 번호의 Test Case가 속한 구조만 다시 변환한다
+        (분포 파일 내 순번은 구조별 전체 Test Case 순서 기준).
+        반환: 변환한 구조의 Test Case 순서대로 convert_batch 결과에
+              'distribution_file', 'permutation', 'parameter_values'(해당 ParameterValueSet)를 추가한 목록
+        """
+        groups = {}
+        for index, test_case in enumerate(test_cases):
+            values = scenario_xosc_values(test_case, self.config)
+            groups.setdefault(scenario_structure(values), []).append((index, values))
+        if indices is not None:
+            pending = set(indices)
+            groups = {key: members for key, members in groups.items() if any(index in pending for index, _ in members)}
+        logger.info(f"파라미터화 OpenSCENARIO 변환 시작: {sum(len(members) for members in groups.values())}개 Test Case, 구조 {len(groups)}개")
+        
+        results = []
+        for (decelerating, lane_change_direction), members in groups.items():
+            structure_name = f"cut_out_{'decel' if decelerating else 'cruise'}_{'left' if lane_change_direction < 0 else 'right'}"
+            scenario_file = os.path.join(output_dir, f"{structure_name}.xosc")
+            distribution_file = os.path.join(output_dir, f"{structure_name}_distribution.xosc")
+            
+            error = None
+            try:
+                os.makedirs(output_dir, exist_ok=True)
+                _generate_xosc(_ParameterizedScenarioGenerator(self.config, members[0][1], decelerating, lane_change_direction), scenario_file)
+                self.write_parameter_distribution(
+                    os.path.basename(scenario_file),
+                    [values for _, values in members],
+                    distribution_file,
+                    include_deceleration=decelerating
+                )
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                logger.error(f"파라미터화 OpenSCENARIO 변환 실패 ({structure_name}): {error}")
+            
+            for permutation, (index, values) in enumerate(members):
+                results.append({
+                    'index': index,
+                    'scenario_id': f"scenario_{index+1:03d}",
+                    'output_file': scenario_file,
+                    'distribution_file': distribution_file,
+                    'permutation': permutation,
+                    'parameter_values': parameter_assignments(values, include_deceleration=decelerating),
+                    'success': error is None,
+                    'error': error
+                })
+        
+        results.sort(key=lambda result: result['index'])
+        logger.info(f"파라미터화 OpenSCENARIO 변환 완료: 시나리오 파일 {len(groups)}개, 분포 파일 {len(groups)}개")
+        return results
+        
+    @staticmethod
+    def write_parameter_distribution(scenario_file, parameter_sets, distribution_file, include_deceleration=True):
+        """XOSC 값 목록을 결정론적 ParameterValueDistribution 파일로 저장 (ParameterValueSet 하나가 Test Case 하나)"""
+        root = ET.Element('OpenSCENARIO')
+        ET.SubElement(root, 'FileHeader', {
+            'revMajor': '1',
+            'revMinor': '1',
+            'date': XOSC_FILE_DATE,
+            'description': 'Cut-out scenario parameter distribution',
+            'author': 'cutout_scenario'
+        })
+        distribution = ET.SubElement(root, 'ParameterValueDistribution')
+        ET.SubElement(distribution, 'ScenarioFile', {'filepath': scenario_file})
+        value_sets = ET.SubElement(
+            ET.SubElement(ET.SubElement(distribution, 'Deterministic'), 'DeterministicMultiParameterDistribution'),
+            'ValueSetDistribution'
+        )
+        for values in parameter_sets:
+            value_set = ET.SubElement(value_sets, 'ParameterValueSet')
+            for name, value in parameter_assignments(values, include_deceleration).items():
+                ET.SubElement(value_set, 'ParameterAssignment', {'parameterRef': name, 'value': value})
+        
+        tree = ET.ElementTree(root)
+        ET.indent(tree, space='    ')
+        os.makedirs(os.path.dirname(distribution_file) or '.', exist_ok=True)
+        tree.write(distribution_file, encoding='utf-8', xml_declaration=True)
+        
+        logger.debug(f"파라미터 분포 파일 생성 완료: {distribution_file} ({len(parameter_sets)}개)")
+        return distribution_file
+        
+    def _convert_job(self, index, test_case, output_file):
+        """단일 Test Case 변환 결과 기록 (예외는 결과에 기록)"""
+        result = {
+            'index': index,
+            'scenario_id': os.path.splitext(os.path.basename(output_file))[0],
+            'output_file': output_file,
+            'success': False,
+            'error': None
+        }
+        if self.cache is not None:
+            result.update({'hash': None, 'cached': False})
+        try:
+            if self.cache is None:
+                self.convert(test_case, output_file)
+            else:
+                result['hash'] = XoscCache.cache_key(scenario_xosc_values(test_case, self.config), self.config)
+                result['cached'] = self.cache.fetch(result['hash'], output_file)
+                if not result['cached']:
+                    XoscCache.release(output_file)
+                    self.convert(test_case, output_file)
+                    self.cache.store(result['hash'], output_file)
+            result['success'] = True
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        return result
+        
+    def _create_cache(self):
+        """설정(simulation.conversion.cache)에 따라 XOSC 캐시 생성 (비활성화 시 None)"""
+        cache_config = self.config['simulation'].get('conversion', {}).get('cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        
+        output_dir = self.config['simulation']['output']['output_directory']
+        return XoscCache(
+            os.path.join(output_dir, cache_config.get('directory', 'xosc_cache')),
+            cache_config.get('link_mode', 'hardlink')
+        )
+        
+    def _parallel_settings(self, workers, chunk_size):
+        """병렬 변환 워커 수 및 샤드 크기 결정 (인자 > 설정 파일 > 기본값)"""
+        parallel_config = self.config['simulation'].get('conversion', {}).get('parallel', {})
+        
+        if workers is None:
+            workers = (parallel_config.get('workers') or os.cpu_count() or 1) if parallel_config.get('enabled', False) else 1
+        if chunk_size is None:
+            chunk_size = parallel_config.get('chunk_size', 50)
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size는 양수여야 합니다: {chunk_size}")
+        
+        return workers, chunk_size
@@ -0,0 +1,178 @@
+'''
+Human 실패 & ADS 성공 결정 경계 탐색 (혼합 셀 재귀 분할)
+'''
+
+import logging
+import itertools
+import numpy as np
+from .scenario_filter import ScenarioFilter
+from ..generators.scenario_generator import ScenarioGenerator, PARAMETER_KEYS
+
+logger = logging.getLogger('cutout_scenario.boundary_search')
+
+# 기본 세분화 축
+DEFAULT_BOUNDARY_AXES = ('v_ego', 'v_lv2', 'thw_ego_lv2_reveal')
+
+# 기본 재귀 분할 깊이 (config/scenario_config.yaml의 filtering.boundary_search.max_depth와 동일)
+DEFAULT_MAX_DEPTH = 2
+
+class DecisionBoundaryExtractor:
+    """거친 격자 필터링 결과에서 꼭짓점 판정이 엇갈리는 셀만 재귀적으로 분할하여 경계 정밀화
+
+    세분화 축 이외의 파라미터는 격자 값에 고정하고, 깊이마다 혼합 셀(꼭짓점 중 Test Case와
+    비 Test Case가 섞인 셀)을 축별로 이등분한 뒤 다시 혼합인 하위 셀만 남긴다.
+    꼭짓점 판정이 모두 같은 거친 셀 내부의 경계는 탐색하지 않는다.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        boundary_config = config['filtering'].get('boundary_search', {})
+        self.axes = tuple(boundary_config.get('axes', DEFAULT_BOUNDARY_AXES))
+        self.max_depth = boundary_config.get('max_depth', DEFAULT_MAX_DEPTH)
+
+        unknown = set(self.axes) - set(PARAMETER_KEYS)
+        if unknown or not self.axes:
+            raise ValueError(f"filtering.boundary_search.axes에 잘못된 축이 있습니다: {sorted(unknown)}")
+
+        self.generator = ScenarioGenerator(config)
+        self.scenario_filter = ScenarioFilter(config)
+
+    def extract(self, filtered_columns, max_depth=None):
+        """filter_columns 결과(grid_index 포함)로부터 최종 깊이의 경계 셀 꼭짓점 계산
+
+        반환 dict:
+          points: 경계 셀 꼭짓점 시나리오 컬럼 (is_test_case 컬럼 포함)
+          statistics: 평가 수, 경계 셀 수, 동일 해상도 전체 격자 대비 평가 비율 등
+        """
+        depth = self.max_depth if max_depth is None else max_depth
+        lattice = self._build_lattice(filtered_columns, depth)
+        coarse_points = len(lattice['known_keys'])
+        logger.info(f"결정 경계 탐색 시작: 축 {', '.join(self.axes)}, 깊이 {depth}, 거친 격자 {coarse_points}개 점")
+
+        # 깊이 0: 거친 격자 셀 중 혼합 셀
+        size = lattice['scale']
+        cell_shape = [count - 1 for count in lattice['coarse_shape']]
+        cells = np.indices([lattice['slice_count']] + cell_shape).reshape(len(self.axes) + 1, -1).T
+        cells[:, 1:] *= size
+        cells = cells[self._mixed_cells(lattice, cells, size)]
+        logger.info(f"경계 탐색 깊이 0: 혼합 셀 {len(cells)}개")
+
+        # 혼합 셀을 축별로 이등분하여 하위 혼합 셀만 유지
+        for level in range(1, depth + 1):
+            size //= 2
+            children = (cells[:, None, :] + size * lattice['corner_offsets'][None]).reshape(-1, cells.shape[1])
+            cells = children[self._mixed_cells(lattice, children, size)]
+            logger.info(f"경계 탐색 깊이 {level}: 혼합 셀 {len(cells)}개, 누적 추가 평가 {lattice['evaluations']}개")
+
+        # 최종 경계 셀 꼭짓점
+        point_keys = np.unique(self._corner_keys(lattice, cells, size))
+        points = self._columns_from_keys(lattice, point_keys)
+        points['is_test_case'] = self._labels(lattice, point_keys)
+
+        equivalent_points = int(np.prod(lattice['fine_shape']))
+        statistics = {
+            'axes': list(self.axes),
+            'max_depth': depth,
+            'coarse_points': coarse_points,
+            'evaluations': lattice['evaluations'],
+            'boundary_cells': len(cells),
+            'boundary_points': len(point_keys),
+            'equivalent_grid_points': equivalent_points,
+            'evaluation_ratio': (coarse_points + lattice['evaluations']) / equivalent_points
+        }
+        logger.info(
+            f"결정 경계 탐색 완료: 경계 셀 {len(cells)}개, 추가 평가 {lattice['evaluations']}개 "
+            f"(동일 해상도 전체 격자 {equivalent_points}개 대비 {statistics['evaluation_ratio']:.2%})"
+        )
+        return {'points': points, 'statistics': statistics}
+
+    def _build_lattice(self, filtered_columns, depth):
+        """세분화 격자 정보와 거친 격자 판정 결과 구성
+
+        점은 (고정 축 조합 번호, 세분화 축별 정밀 격자 좌표)로 나타내며,
+        정밀 격자 좌표는 거친 격자 좌표에 2^depth를 곱한 정수이다.
+        """
+        ranges = self.generator.get_parameter_ranges()
+        for key in self.axes:
+            if len(ranges[key]) < 2:
+                raise ValueError(f"세분화 축 {key}의 격자 값이 2개 이상이어야 합니다.")
+
+        grid_shape = tuple(len(ranges[key]) for key in PARAMETER_KEYS)
+        fixed_keys = [key for key in PARAMETER_KEYS if key not in self.axes]
+        axis_order = [PARAMETER_KEYS.index(key) for key in fixed_keys + list(self.axes)]
+        scale = 2 ** depth
+
+        # 필터링 결과의 grid_index -> 거친 격자 점별 Test Case 여부 (고정 축 조합, 세분화 축...)
+        coarse_labels = np.zeros(int(np.prod(grid_shape)), dtype=bool)
+        coarse_labels[np.asarray(filtered_columns['grid_index'], dtype=np.int64)] = True
+        coarse_labels = coarse_labels.reshape(grid_shape).transpose(axis_order)
+        fixed_shape = coarse_labels.shape[:len(fixed_keys)]
+        coarse_shape = coarse_labels.shape[len(fixed_keys):]
+        coarse_labels = coarse_labels.reshape((-1,) + coarse_shape)
+
+        fine_shape = (coarse_labels.shape[0],) + tuple((count - 1) * scale + 1 for count in coarse_shape)
+        coords = np.indices(coarse_labels.shape).reshape(coarse_labels.ndim, -1)
+        coords[1:] *= scale
+
+        # 셀 꼭짓점 오프셋 (고정 축 조합 번호는 변하지 않음)
+        corner_offsets = np.array([(0,) + corner for corner in itertools.product((0, 1), repeat=len(self.axes))])
+
+        return {
+            'ranges': ranges,
+            'fixed_keys': fixed_keys,
+            'fixed_shape': fixed_shape,
+            'coarse_shape': coarse_shape,
+            'slice_count': coarse_labels.shape[0],
+            'fine_shape': fine_shape,
+            'scale': scale,
+            'corner_offsets': corner_offsets,
+            # 거친 격자 좌표는 C 순서로 나열되므로 정밀 격자 키도 정렬되어 있음
+            'known_keys': np.ravel_multi_index(coords, fine_shape),
+            'known_labels': coarse_labels.ravel(),
+            'evaluations': 0
+        }
+
+    def _corner_keys(self, lattice, cells, size):
+        """셀(하한 꼭짓점, 크기)별 꼭짓점 키 (셀 수 x 꼭짓점 수)"""
+        corners = cells[:, None, :] + size * lattice['corner_offsets'][None]
+        keys = np.ravel_multi_index(corners.reshape(-1, cells.shape[1]).T, lattice['fine_shape'])
+        return keys.reshape(len(cells), -1)
+
+    def _mixed_cells(self, lattice, cells, size):
+        """꼭짓점 판정이 엇갈리는 셀 마스크"""
+        if len(cells) == 0:
+            return np.zeros(0, dtype=bool)
+        keys = self._corner_keys(lattice, cells, size)
+        labels = self._labels(lattice, keys.ravel()).reshape(keys.shape)
+        return labels.any(axis=1) & ~labels.all(axis=1)
+
+    def _labels(self, lattice, keys):
+        """점 키별 Test Case 여부 (평가되지 않은 점만 새로 필터링)"""
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        known_keys = lattice['known_keys']
+        position = np.minimum(np.searchsorted(known_keys, unique_keys), len(known_keys) - 1)
+        new_keys = unique_keys[known_keys[position] != unique_keys]
+
+        if len(new_keys):
+            new_labels = self.scenario_filter.classify_columns(self._columns_from_keys(lattice, new_keys))
+            merged_keys = np.concatenate([known_keys, new_keys])
+            order = np.argsort(merged_keys, kind='stable')
+            lattice['known_keys'] = known_keys = merged_keys[order]
+            lattice['known_labels'] = np.concatenate([lattice['known_labels'], new_labels])[order]
+            lattice['evaluations'] += len(new_keys)
+            position = np.searchsorted(known_keys, unique_keys)
+
+        return lattice['known_labels'][position][inverse.ravel()]
+
+    def _columns_from_keys(self, lattice, keys):
+        """점 키를 시나리오 컬럼으로 변환 (세분화 축은 격자 간격의 1/2^depth 단위 값)"""
+        coords = np.unravel_index(keys, lattice['fine_shape'])
+        fixed_index = np.unravel_index(coords[0], lattice['fixed_shape'])
+        ranges = lattice['ranges']
+
+        parameters = {key: ranges[key][index] for key, index in zip(lattice['fixed_keys'], fixed_index)}
+        for key, fine_index in zip(self.axes, coords[1:]):
+            step = (ranges[key][1] - ranges[key][0]) / lattice['scale']
+            parameters[key] = ranges[key][0] + fine_index * step
+
+        return self.generator.columns_from_parameters(parameters)
@@ -0,0 +1,76 @@
+'''
+판정 결과 동치 시나리오 압축 (필터링과 샘플링 사이 단계)
+'''
+
+import logging
+import numpy as np
+from ..utils.scenario_columns import ScenarioColumns
+
+logger = logging.getLogger('cutout_scenario.equivalence_compressor')
+
+# 판정별 결과에 영향을 주는 파라미터
+OUTCOME_KEYS = {
+    'early_collision': ('v_ego', 'v_lv1', 'v_lv1_lat', 'thw_ego_lv1'),
+    'gap_validity': ('v_ego', 'v_lv1', 'thw_ego_lv1', 'thw_ego_lv2_reveal'),
+    'human_ads_decision': ('v_ego', 'v_lv2', 'thw_ego_lv2_reveal')  # TTC_reveal 및 v_ego별 임계값
+}
+
+class OutcomeEquivalenceCompressor:
+    """동치 키 값이 같은 시나리오를 대표 시나리오 하나로 압축하고 multiplicity 컬럼에 개수 기록
+
+    필터링을 통과한 시나리오는 조기 충돌/간격 판정이 모두 같으므로, 기본 동치 키는
+    Human/ADS 판정에 영향을 주는 파라미터이다. 대표 시나리오는 각 동치류의 첫 번째 행이며
+    원래 순서를 유지한다.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        compression_config = config['filtering'].get('equivalence_compression', {})
+        self.keys = tuple(compression_config.get('keys') or OUTCOME_KEYS['human_ads_decision'])
+        self.resolution = compression_config.get('resolution') or {}
+        self.last_class_index = None
+
+    def compress(self, columns):
+        """동치류별 대표 시나리오 컬럼 반환 (multiplicity 컬럼 포함)
+
+        입력에 multiplicity 컬럼이 있으면 합산하며, 입력 행별 동치류 번호는
+        last_class_index에 저장된다.
+        """
+        total = ScenarioColumns.length(columns)
+        if total == 0:
+            self.last_class_index = np.zeros(0, dtype=np.int64)
+            return dict(columns, multiplicity=np.zeros(0, dtype=np.int64))
+
+        missing = set(self.keys) - set(columns)
+        if missing:
+            raise ValueError(f"동치 키 컬럼이 없습니다: {sorted(missing)}")
+
+        codes = np.column_stack([self._quantize(key, columns[key]) for key in self.keys])
+        _, first_rows, class_index = np.unique(codes, axis=0, return_index=True, return_inverse=True)
+        class_index = class_index.ravel()
+
+        # 동치류 번호를 대표 행의 원래 순서로 재배열
+        order = np.argsort(first_rows)
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        class_index = rank[class_index]
+
+        multiplicity = np.bincount(
+            class_index, weights=columns.get('multiplicity'), minlength=len(order)).astype(np.int64)
+
+        representatives = ScenarioColumns.take(columns, first_rows[order])
+        representatives['multiplicity'] = multiplicity
+        self.last_class_index = class_index
+
+        logger.info(
+            f"동치 시나리오 압축: {total}개 -> {len(order)}개 대표 시나리오 "
+            f"({1 - len(order) / total:.1%} 절감, 키: {', '.join(self.keys)})"
+        )
+        return representatives
+
+    def _quantize(self, key, values):
+        """resolution이 지정된 키는 해당 간격으로 양자화 (연속 표본용)"""
+        resolution = self.resolution.get(key)
+        if not resolution:
+            return np.asarray(values)
+        return np.round(np.asarray(values) / resolution).astype(np.int64)
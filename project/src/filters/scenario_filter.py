@@ -2,56 +2,501 @@
 Test Case 필터링 로직
 '''
 
+import os
+import time
 import logging
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from ..calculators.ttc_calculator import TTCCalculator
+from ..generators.scenario_generator import ScenarioGenerator, compile_validity_conditions
+from ..utils.scenario_columns import ScenarioColumns
+from ..utils.condition_compiler import ConditionCompiler
 
 logger = logging.getLogger('cutout_scenario.scenario_filter')
 
+# 필터 단계 (기본 실행 순서)
+FILTER_STAGES = (
+    'logical_conditions',  # 설정 파일 논리 조건
+    'early_collision',  # 조기 충돌
+    'gap_validity',  # 초기 간격 물리적 유효성
+    'human_ads_decision'  # TTC_reveal 계산 및 Human 실패 & ADS 성공 판단
+)
+
+def _filter_column_shard(config, columns, stage_order):
+    """워커 프로세스: 컬럼 샤드 필터링"""
+    scenario_filter = ScenarioFilter(config)
+    filtered = scenario_filter.filter_columns(columns, stage_order)
+    return filtered, scenario_filter.last_statistics
+
+def _filter_grid_shard(config, start, stop, stage_order):
+    """워커 프로세스: 유효 조합 행 구간 생성 후 필터링"""
+    columns = ScenarioGenerator(config).generate_block(start, stop)
+    return _filter_column_shard(config, columns, stage_order)
+
+class FilterStatistics:
+    """필터 단계별 통계 (평가 수, 제외 수, 소요 시간)"""
+    
+    def __init__(self, stage_order, total_scenarios=0):
+        self.stage_order = list(stage_order)
+        self.total_scenarios = total_scenarios
+        self.selected_scenarios = 0
+        self.stages = {
+            stage: {'evaluated': 0, 'rejected': 0, 'elapsed': 0.0}
+            for stage in self.stage_order
+        }
+        
+    def record(self, stage, evaluated, rejected, elapsed):
+        """단계 실행 결과 누적"""
+        stats = self.stages[stage]
+        stats['evaluated'] += evaluated
+        stats['rejected'] += rejected
+        stats['elapsed'] += elapsed
+        
+    def merge(self, other):
+        """다른 샤드의 통계 합산"""
+        self.total_scenarios += other.total_scenarios
+        self.selected_scenarios += other.selected_scenarios
+        for stage, stats in other.stages.items():
+            self.record(stage, stats['evaluated'], stats['rejected'], stats['elapsed'])
+        return self
+        
+    def to_rows(self):
+        """실행 순서대로 단계별 통계 목록 반환 (제외율 포함)"""
+        rows = []
+        for order, stage in enumerate(self.stage_order, 1):
+            stats = self.stages[stage]
+            evaluated = stats['evaluated']
+            rows.append({
+                'order': order,
+                'stage': stage,
+                'evaluated': evaluated,
+                'rejected': stats['rejected'],
+                'rejection_rate': stats['rejected'] / evaluated if evaluated else 0.0,
+                'elapsed': stats['elapsed']
+            })
+        return rows
+        
+    def to_dict(self):
+        """직렬화 가능한 dict 반환"""
+        return {
+            'total_scenarios': self.total_scenarios,
+            'selected_scenarios': self.selected_scenarios,
+            'stages': self.to_rows()
+        }
+        
+    @staticmethod
+    def from_dict(data):
+        """to_dict 결과로부터 통계 복원"""
+        stages = data['stages']
+        statistics = FilterStatistics([row['stage'] for row in stages], data['total_scenarios'])
+        statistics.selected_scenarios = data['selected_scenarios']
+        for row in stages:
+            statistics.record(row['stage'], row['evaluated'], row['rejected'], row['elapsed'])
+        return statistics
+        
+    def log_summary(self):
+        """단계별 통계 로그 출력"""
+        for row in self.to_rows():
+            logger.info(
+                f"필터 단계 {row['order']}. {row['stage']}: {row['evaluated']}개 평가, "
+                f"{row['rejected']}개 제외 ({row['rejection_rate']:.1%}), {row['elapsed']:.3f}s"
+            )
+
 class ScenarioFilter:
     """Test Case 필터링 로직"""
     
     def __init__(self, config):
         self.config = config
         self.ttc_calculator = TTCCalculator(config)
+        self.validity_conditions = compile_validity_conditions(config)
+        self.last_statistics = None
+        self.last_prefiltered = None  # filter_with_cache의 파라미터 독립 중간 결과 (민감도 분석 재사용)
         
     def filter_scenarios(self, scenarios):
-        """모든 조건을 만족하는 Test Case 필터링"""
+        """모든 조건을 만족하는 Test Case 필터링
+        
+        단계별로 이전 단계를 통과한 시나리오 전체에 적용하므로 단계 소요 시간은 호출당 한 번만 측정한다.
+        """
         logger.info(f"총 {len(scenarios)}개 시나리오 필터링 시작")
         
-        filtered_scenarios = []
+        statistics = FilterStatistics(FILTER_STAGES, len(scenarios))
+        min_safe_distance = self.config['filtering']['safety_parameters']['min_safe_distance']
         
-        # 각 시나리오에 대해 필터링 적용
+        # 0. 설정 파일 논리 조건 확인 (물리적으로 불가능한 조합, 스칼라 조건자 사용)
+        started = time.perf_counter()
+        candidates = []
         for scenario in scenarios:
-            # 1. 조기 충돌 확인
+            if ConditionCompiler.any_row(self.validity_conditions, scenario):
+                logger.debug(f"논리 조건 위반 시나리오 제외: v_ego={scenario['v_ego']}, v_lv2={scenario['v_lv2']}")
+            else:
+                candidates.append(scenario)
+        statistics.record('logical_conditions', len(scenarios), len(scenarios) - len(candidates), time.perf_counter() - started)
+        
+        # 1. 조기 충돌 확인
+        started = time.perf_counter()
+        evaluated, candidates = candidates, []
+        for scenario in evaluated:
             if self.ttc_calculator.calculate_early_collision(scenario):
                 logger.debug(f"조기 충돌 시나리오 제외: v_ego={scenario['v_ego']}, v_lv1={scenario['v_lv1']}")
-                continue
-            
-            # 2. 물리적 유효성 검사
+            else:
+                candidates.append(scenario)
+        statistics.record('early_collision', len(evaluated), len(evaluated) - len(candidates), time.perf_counter() - started)
+        
+        # 2. 물리적 유효성 검사
+        started = time.perf_counter()
+        evaluated, candidates = candidates, []
+        for scenario in evaluated:
             d_ego_lv1, d_lv1_lv2 = self.ttc_calculator.calculate_initial_gaps(scenario)
-            min_safe_distance = self.config['filtering']['safety_parameters']['min_safe_distance']
-            
             if d_ego_lv1 < min_safe_distance or d_lv1_lv2 < min_safe_distance:
                 logger.debug(f"물리적 유효성 실패 시나리오 제외: d_ego_lv1={d_ego_lv1:.2f}, d_lv1_lv2={d_lv1_lv2:.2f}")
-                continue
-            
-            # 3. TTC_reveal 계산
+            else:
+                candidates.append(scenario)
+        statistics.record('gap_validity', len(evaluated), len(evaluated) - len(candidates), time.perf_counter() - started)
+        
+        # 3. TTC_reveal 계산 및 Human/ADS 모델 실패 여부 판단
+        started = time.perf_counter()
+        filtered_scenarios = []
+        for scenario in candidates:
             ttc_reveal = self.ttc_calculator.calculate_ttc_reveal(scenario)
             
-            # 계산된 TTC를 시나리오에 추가
+            # 계산된 TTC와 판단 결과를 시나리오에 추가
             scenario['ttc_reveal'] = ttc_reveal
+            scenario['human_fails'] = self.ttc_calculator.evaluate_human_model(scenario, ttc_reveal)
+            scenario['ads_fails'] = self.ttc_calculator.evaluate_ads_model(scenario, ttc_reveal)
             
-            # 4. Human/ADS 모델 실패 여부 판단
-            human_fails = self.ttc_calculator.evaluate_human_model(scenario, ttc_reveal)
-            ads_fails = self.ttc_calculator.evaluate_ads_model(scenario, ttc_reveal)
-            
-            # 판단 결과를 시나리오에 추가
-            scenario['human_fails'] = human_fails
-            scenario['ads_fails'] = ads_fails
-            
-            # 5. '조기 충돌 없음 & 물리적 유효 & Human 실패 & ADS 성공' 조건 확인
-            if human_fails and not ads_fails:
+            # 4. '조기 충돌 없음 & 물리적 유효 & Human 실패 & ADS 성공' 조건 확인
+            if scenario['human_fails'] and not scenario['ads_fails']:
                 filtered_scenarios.append(scenario)
-                
+        statistics.record('human_ads_decision', len(candidates), len(candidates) - len(filtered_scenarios), time.perf_counter() - started)
+        
+        statistics.selected_scenarios = len(filtered_scenarios)
+        self.last_statistics = statistics
+        statistics.log_summary()
+        
         logger.info(f"필터링 완료: {len(filtered_scenarios)}개 Test Case 선택됨")
         return filtered_scenarios
+
+    def filter_columns(self, columns, stage_order=None):
+        """filter_scenarios의 컬럼 버전 (NumPy 배열 단위로 모든 조건 적용)
+        
+        각 단계는 이전 단계를 통과한 행에만 적용되며, 단계 순서는 결과에 영향을 주지 않는다.
+        stage_order를 지정하지 않으면 설정 파일(filtering.stage_order)에 따라 결정된다.
+        """
+        total = ScenarioColumns.length(columns)
+        logger.info(f"총 {total}개 시나리오 컬럼 필터링 시작")
+        
+        if stage_order is None:
+            stage_order = self.resolve_stage_order(columns)
+        
+        statistics = FilterStatistics(stage_order, total)
+        candidates = self._run_stages(columns, stage_order, statistics)
+        
+        statistics.selected_scenarios = ScenarioColumns.length(candidates)
+        self.last_statistics = statistics
+        statistics.log_summary()
+        
+        logger.info(f"필터링 완료: {statistics.selected_scenarios}개 Test Case 선택됨")
+        return candidates
+
+    def iter_filtered_blocks(self, blocks, stage_order=None):
+        """시나리오 블록을 순서대로 필터링하여 블록별 결과를 생성 (전체 결과를 보유하지 않음)
+        
+        모든 블록을 소비하면 last_statistics에 전체 블록의 합산 통계가 저장된다.
+        """
+        statistics = None
+        for block in blocks:
+            if stage_order is None:
+                stage_order = self.resolve_stage_order(block)
+            if statistics is None:
+                statistics = FilterStatistics(stage_order)
+            
+            block_statistics = FilterStatistics(stage_order, ScenarioColumns.length(block))
+            filtered = self._run_stages(block, stage_order, block_statistics)
+            block_statistics.selected_scenarios = ScenarioColumns.length(filtered)
+            statistics.merge(block_statistics)
+            yield filtered
+        
+        self.last_statistics = statistics or FilterStatistics(stage_order or FILTER_STAGES)
+        self.last_statistics.log_summary()
+        logger.info(f"블록 단위 필터링 완료: {self.last_statistics.selected_scenarios}개 Test Case 선택됨")
+
+    def classify_columns(self, columns):
+        """행별 Test Case 선택 여부 마스크 (filter_columns와 같은 판정, 통계 미기록)"""
+        return self.evaluate_outcomes(columns)['test_case']
+
+    def evaluate_outcomes(self, columns):
+        """행별 판정 마스크 (행 순서 유지, 통계 미기록)
+        
+        valid: 논리 조건, 조기 충돌, 간격 유효성 통과
+        human_fails / ads_fails / test_case: valid이면서 각 판정에 해당
+        """
+        valid = np.ones(ScenarioColumns.length(columns), dtype=bool)
+        stage_functions = self._stage_functions()
+        
+        for stage in FILTER_STAGES:
+            if stage == 'human_ads_decision':
+                continue
+            rows = np.flatnonzero(valid)
+            keep = stage_functions[stage](ScenarioColumns.take(columns, rows))
+            valid[rows[~keep]] = False
+        
+        ttc_reveal = self.ttc_calculator.calculate_ttc_reveal_batch(columns)
+        human_fails = valid & self.ttc_calculator.evaluate_human_model_batch(columns, ttc_reveal)
+        ads_fails = valid & self.ttc_calculator.evaluate_ads_model_batch(columns, ttc_reveal)
+        
+        return {
+            'valid': valid,
+            'human_fails': human_fails,
+            'ads_fails': ads_fails,
+            'test_case': human_fails & ~ads_fails
+        }
+
+    def prefilter_columns(self, columns, stage_order=None):
+        """제어 모델 파라미터와 무관한 단계만 적용하고 ttc_reveal 컬럼 추가
+        
+        반환 결과에 apply_model_decision을 적용하면 filter_columns와 같은 결과가 된다.
+        """
+        if stage_order is None:
+            stage_order = self.resolve_stage_order(columns)
+        stage_order = [stage for stage in stage_order if stage != 'human_ads_decision']
+        
+        statistics = FilterStatistics(stage_order, ScenarioColumns.length(columns))
+        candidates = self._run_stages(columns, stage_order, statistics)
+        candidates['ttc_reveal'] = self.ttc_calculator.calculate_ttc_reveal_batch(candidates)
+        
+        statistics.selected_scenarios = ScenarioColumns.length(candidates)
+        self.last_statistics = statistics
+        return candidates
+
+    def apply_model_decision(self, prefiltered, prefilter_statistics=None):
+        """prefilter_columns 결과에 Human/ADS 모델 판단만 적용"""
+        total = prefilter_statistics.total_scenarios if prefilter_statistics else ScenarioColumns.length(prefiltered)
+        stage_order = (prefilter_statistics.stage_order if prefilter_statistics else []) + ['human_ads_decision']
+        
+        statistics = FilterStatistics(stage_order, total)
+        if prefilter_statistics:
+            statistics.merge(prefilter_statistics)
+            statistics.total_scenarios = total
+        
+        candidates = self._run_stages(prefiltered, ['human_ads_decision'], statistics)
+        
+        statistics.selected_scenarios = ScenarioColumns.length(candidates)
+        self.last_statistics = statistics
+        statistics.log_summary()
+        
+        logger.info(f"필터링 완료: {statistics.selected_scenarios}개 Test Case 선택됨")
+        return candidates
+
+    def filter_with_cache(self, cache, generate_columns):
+        """파라미터 독립 중간 결과를 캐시하여 Human/ADS 판단만 재계산
+        
+        generate_columns: 캐시가 없을 때만 호출되는 시나리오 컬럼 생성 함수
+        """
+        key = cache.cache_key(self.config)
+        cached = cache.load(key)
+        
+        if cached is None:
+            prefiltered = self.prefilter_columns(generate_columns())
+            prefilter_statistics = self.last_statistics
+            cache.save(key, prefiltered, prefilter_statistics.to_dict())
+        else:
+            prefiltered, statistics_data = cached
+            prefilter_statistics = FilterStatistics.from_dict(statistics_data)
+        
+        self.last_prefiltered = prefiltered
+        return self.apply_model_decision(prefiltered, prefilter_statistics)
+
+    def evaluate_variants(self, prefiltered, variants):
+        """prefilter_columns 결과에 대해 여러 제어 모델 변형의 Test Case 선택 여부를 한 번에 계산
+        
+        반환 dict:
+          test_case_matrix: (시나리오 수 x 변형 수) 'Human 실패 & ADS 성공' 행렬
+          counts: 변형별 Test Case 수
+        """
+        logger.info(f"제어 모델 변형 {len(variants)}개 동시 평가: {ScenarioColumns.length(prefiltered)}개 시나리오")
+        
+        human_fails, ads_fails = self.ttc_calculator.evaluate_model_variants(
+            prefiltered, prefiltered['ttc_reveal'], variants)
+        test_case_matrix = human_fails & ~ads_fails
+        counts = test_case_matrix.sum(axis=0)
+        
+        for variant, count in zip(variants, counts.tolist()):
+            logger.debug(f"변형 {variant}: {count}개 Test Case")
+        
+        return {
+            'variants': variants,
+            'human_fails': human_fails,
+            'ads_fails': ads_fails,
+            'test_case_matrix': test_case_matrix,
+            'counts': counts
+        }
+
+    def _run_stages(self, columns, stage_order, statistics):
+        """단계를 순서대로 적용하며 단계별 통계 기록"""
+        candidates = dict(columns)
+        stage_functions = self._stage_functions()
+        
+        for stage in stage_order:
+            evaluated = ScenarioColumns.length(candidates)
+            started = time.perf_counter()
+            keep = stage_functions[stage](candidates)
+            candidates = ScenarioColumns.take(candidates, keep)
+            rejected = evaluated - ScenarioColumns.length(candidates)
+            statistics.record(stage, evaluated, rejected, time.perf_counter() - started)
+        
+        return candidates
+
+    def resolve_stage_order(self, columns=None):
+        """필터 단계 실행 순서 결정
+        
+        filtering.stage_order가 'auto'이면 표본에 대해 각 단계의 행당 비용과
+        제외율을 측정하여 (비용 / 제외율)이 작은 단계, 즉 저렴하고 선택적인
+        단계부터 실행한다. 단계 이름 목록이 지정되면 해당 순서를 따른다.
+        """
+        stage_order = self.config['filtering'].get('stage_order', 'fixed')
+        
+        if isinstance(stage_order, (list, tuple)):
+            unknown = set(stage_order) ^ set(FILTER_STAGES)
+            if unknown:
+                raise ValueError(f"filtering.stage_order에 잘못되었거나 누락된 단계가 있습니다: {sorted(unknown)}")
+            return list(stage_order)
+        
+        if stage_order == 'fixed':
+            return list(FILTER_STAGES)
+        
+        if stage_order != 'auto':
+            raise ValueError(f"지원하지 않는 filtering.stage_order 값: {stage_order}")
+        
+        if columns is None:
+            sample_size = self.config['filtering'].get('stage_calibration_size', 10000)
+            generator = ScenarioGenerator(self.config)
+            columns = generator.generate_block(0, min(sample_size, generator.count_valid_combinations()))
+        return self._calibrate_stage_order(columns)
+
+    def _calibrate_stage_order(self, columns):
+        """표본에 각 단계를 독립적으로 적용하여 비용 대비 선택도 순으로 정렬"""
+        sample_size = self.config['filtering'].get('stage_calibration_size', 10000)
+        sample = ScenarioColumns.take(columns, slice(0, sample_size))
+        count = ScenarioColumns.length(sample)
+        if count == 0:
+            return list(FILTER_STAGES)
+        
+        ranks = {}
+        for stage, function in self._stage_functions().items():
+            started = time.perf_counter()
+            keep = function(dict(sample))
+            cost_per_row = (time.perf_counter() - started) / count
+            rejection_rate = 1.0 - np.count_nonzero(keep) / count
+            
+            # 제외하지 않는 단계는 가장 뒤로
+            ranks[stage] = cost_per_row / rejection_rate if rejection_rate > 0 else float('inf')
+            logger.debug(f"필터 단계 보정: {stage} 행당 {cost_per_row * 1e9:.1f}ns, 제외율 {rejection_rate:.1%}")
+        
+        stage_order = sorted(FILTER_STAGES, key=lambda stage: (ranks[stage], FILTER_STAGES.index(stage)))
+        logger.info(f"필터 단계 자동 정렬: {' -> '.join(stage_order)}")
+        return stage_order
+
+    def _stage_functions(self):
+        """단계 이름 -> 통과 마스크 함수"""
+        return {
+            'logical_conditions': self._stage_logical_conditions,
+            'early_collision': self._stage_early_collision,
+            'gap_validity': self._stage_gap_validity,
+            'human_ads_decision': self._stage_human_ads_decision
+        }
+
+    def _stage_logical_conditions(self, columns):
+        """0. 설정 파일 논리 조건 확인 (물리적으로 불가능한 조합)"""
+        invalid = ConditionCompiler.evaluate_any(self.validity_conditions, columns, ScenarioColumns.length(columns))
+        return ~invalid
+
+    def _stage_early_collision(self, columns):
+        """1. 조기 충돌 확인"""
+        return ~self.ttc_calculator.calculate_early_collision_batch(columns)
+
+    def _stage_gap_validity(self, columns):
+        """2. 물리적 유효성 검사"""
+        d_ego_lv1, d_lv1_lv2 = self.ttc_calculator.calculate_initial_gaps_batch(columns)
+        min_safe_distance = self.config['filtering']['safety_parameters']['min_safe_distance']
+        return (d_ego_lv1 >= min_safe_distance) & (d_lv1_lv2 >= min_safe_distance)
+
+    def _stage_human_ads_decision(self, columns):
+        """3~5. TTC_reveal 계산, Human/ADS 모델 판단 후 'Human 실패 & ADS 성공' 확인 (결과 컬럼 추가)"""
+        if 'ttc_reveal' not in columns:
+            columns['ttc_reveal'] = self.ttc_calculator.calculate_ttc_reveal_batch(columns)
+        columns['human_fails'] = self.ttc_calculator.evaluate_human_model_batch(columns, columns['ttc_reveal'])
+        columns['ads_fails'] = self.ttc_calculator.evaluate_ads_model_batch(columns, columns['ttc_reveal'])
+        return columns['human_fails'] & ~columns['ads_fails']
+
+    def filter_columns_parallel(self, columns, workers=None, chunk_size=None):
+        """컬럼 집합을 샤드로 나누어 여러 프로세스에서 필터링 (원래 순서 유지)"""
+        workers, chunk_size = self._parallel_settings(workers, chunk_size)
+        total = ScenarioColumns.length(columns)
+        logger.info(f"병렬 필터링 시작: {total}개 시나리오, 워커 {workers}개, 샤드 크기 {chunk_size}")
+        
+        shards = [
+            ScenarioColumns.take(columns, slice(start, start + chunk_size))
+            for start in range(0, total, chunk_size)
+        ]
+        stage_order = self.resolve_stage_order(columns)
+        
+        results = self._map_shards(
+            workers, _filter_column_shard, [self.config] * len(shards), shards, [stage_order] * len(shards))
+        
+        filtered = self._merge_shard_results(results, stage_order)
+        logger.info(f"병렬 필터링 완료: {ScenarioColumns.length(filtered)}개 Test Case 선택됨")
+        return filtered
+
+    def filter_grid_parallel(self, workers=None, chunk_size=None):
+        """유효 조합의 행 번호 구간을 워커에 분배하여 생성과 필터링을 함께 수행 (원래 순서 유지)
+        
+        각 워커가 자신의 구간만 생성하므로 부모 프로세스는 전체 조합을 보유하지 않는다.
+        """
+        workers, chunk_size = self._parallel_settings(workers, chunk_size)
+        total = ScenarioGenerator(self.config).count_valid_combinations()
+        logger.info(f"병렬 그리드 필터링 시작: {total}개 시나리오, 워커 {workers}개, 구간 크기 {chunk_size}")
+        
+        starts = list(range(0, total, chunk_size))
+        stops = [min(start + chunk_size, total) for start in starts]
+        stage_order = self.resolve_stage_order()
+        
+        results = self._map_shards(
+            workers, _filter_grid_shard, [self.config] * len(starts), starts, stops, [stage_order] * len(starts))
+        
+        filtered = self._merge_shard_results(results, stage_order)
+        logger.info(f"병렬 그리드 필터링 완료: {ScenarioColumns.length(filtered)}개 Test Case 선택됨")
+        return filtered
+
+    @staticmethod
+    def _map_shards(workers, function, *iterables):
+        """샤드별 필터링 함수 실행 (워커 1개 또는 샤드 1개면 프로세스 풀 없이 현재 프로세스에서 실행)"""
+        shard_count = len(iterables[0])
+        if workers == 1 or shard_count <= 1:
+            return list(map(function, *iterables))
+        
+        with ProcessPoolExecutor(max_workers=min(workers, shard_count)) as executor:
+            # map은 입력 순서대로 결과를 반환하므로 병합 결과가 결정적임
+            return list(executor.map(function, *iterables))
+
+    def _merge_shard_results(self, results, stage_order):
+        """샤드별 필터링 결과와 통계를 입력 순서대로 병합"""
+        statistics = FilterStatistics(stage_order)
+        for _, shard_statistics in results:
+            statistics.merge(shard_statistics)
+        
+        self.last_statistics = statistics
+        statistics.log_summary()
+        return ScenarioColumns.concatenate([filtered for filtered, _ in results])
+
+    def _parallel_settings(self, workers, chunk_size):
+        """병렬 필터링 워커 수 및 샤드 크기 결정 (인자 > 설정 파일 > 기본값)"""
+        parallel_config = self.config['filtering'].get('parallel', {})
+        
+        if workers is None:
+            workers = parallel_config.get('workers') or os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = parallel_config.get('chunk_size', 200000)
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size는 양수여야 합니다: {chunk_size}")
+        
+        return workers, chunk_size
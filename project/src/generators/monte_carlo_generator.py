@@ -0,0 +1,230 @@
+'''
+몬테카를로 및 중요도 샘플링 시나리오 생성 클래스
+'''
+
+import math
+import logging
+import numpy as np
+from .scenario_generator import ScenarioGenerator, PARAMETER_KEYS
+from ..filters.scenario_filter import ScenarioFilter
+
+logger = logging.getLogger('cutout_scenario.monte_carlo_generator')
+
+# 중요도 샘플링 제안 분포 커널 중심과 표본의 포함 여부를 한 번에 계산할 표본 수
+_DENSITY_CHUNK_SIZE = 2048
+
+class MonteCarloScenarioGenerator:
+    """연속 파라미터 공간에서 시드 고정 무작위 표본으로 시나리오 생성
+
+    파라미터별 공칭 분포는 simulation.monte_carlo.distributions에서 지정하며
+    (uniform 또는 범위로 절단된 normal), 지정하지 않은 파라미터는 차량 설정의
+    min~max 균등 분포를 따른다. 생성된 컬럼에는 공칭 분포 기준 가중치(weight)가 포함된다.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.monte_carlo_config = config['simulation'].get('monte_carlo', {})
+        self.generator = ScenarioGenerator(config)
+        self.rng = np.random.default_rng(config['simulation'].get('random_seed'))
+
+        distribution_configs = self.monte_carlo_config.get('distributions') or {}
+        unknown = set(distribution_configs) - set(PARAMETER_KEYS)
+        if unknown:
+            raise ValueError(f"simulation.monte_carlo.distributions에 알 수 없는 파라미터가 있습니다: {sorted(unknown)}")
+
+        ranges = self.generator.get_parameter_ranges()
+        self.distributions = {
+            key: self._build_distribution(key, float(ranges[key][0]), float(ranges[key][-1]), distribution_configs.get(key, {}))
+            for key in PARAMETER_KEYS
+        }
+
+    def generate(self, sample_count=None):
+        """설정에 따라 공칭 몬테카를로 또는 중요도 샘플링 표본 생성"""
+        if self.monte_carlo_config.get('importance_sampling', {}).get('enabled', False):
+            return self.generate_importance_columns(sample_count)
+        return self.generate_scenario_columns(sample_count)
+
+    def generate_scenario_columns(self, sample_count=None):
+        """공칭 분포에서 표본을 뽑아 시나리오 컬럼 생성 (가중치 1)"""
+        sample_count = self._sample_count(sample_count)
+        logger.info(f"몬테카를로 시나리오 생성: {sample_count}개 표본")
+
+        columns = self.generator.columns_from_parameters(self._sample_nominal(sample_count))
+        columns['weight'] = np.ones(sample_count)
+        return columns
+
+    def generate_importance_columns(self, sample_count=None, scenario_filter=None):
+        """Human 실패 & ADS 성공 영역 근처에 표본을 집중시킨 중요도 샘플링 시나리오 컬럼 생성
+
+        예비 표본에서 찾은 Test Case를 중심으로 한 균등 상자 커널 혼합과 공칭 분포를
+        섞은 방어적(defensive) 제안 분포 q에서 표본을 뽑고, 가중치 p/q를 붙인다.
+        공칭 분포 비율 defensive_ratio가 가중치 상한(1/defensive_ratio)을 보장한다.
+        """
+        sample_count = self._sample_count(sample_count)
+        importance_config = self.monte_carlo_config.get('importance_sampling', {})
+        pilot_count = importance_config.get('pilot_count', 20000)
+        defensive_ratio = importance_config.get('defensive_ratio', 0.3)
+        max_centers = importance_config.get('max_centers', 500)
+        bandwidth = importance_config.get('bandwidth', 0.3)
+        if not 0 < defensive_ratio <= 1:
+            raise ValueError(f"defensive_ratio는 (0, 1] 범위여야 합니다: {defensive_ratio}")
+        if bandwidth <= 0:
+            raise ValueError(f"bandwidth는 양수여야 합니다: {bandwidth}")
+
+        # 1. 예비 표본으로 중요 영역(Test Case) 탐색
+        scenario_filter = scenario_filter or ScenarioFilter(self.config)
+        pilot = self._sample_nominal(pilot_count)
+        hits = scenario_filter.classify_columns(self.generator.columns_from_parameters(pilot))
+        centers = np.column_stack([pilot[key][hits] for key in PARAMETER_KEYS])
+        logger.info(f"중요도 샘플링 예비 표본: {pilot_count}개 중 Test Case {len(centers)}개")
+
+        if len(centers) == 0:
+            logger.warning("예비 표본에서 Test Case를 찾지 못해 공칭 몬테카를로 표본으로 대체합니다.")
+            return self.generate_scenario_columns(sample_count)
+        if len(centers) > max_centers:
+            centers = centers[np.sort(self.rng.choice(len(centers), max_centers, replace=False))]
+
+        # 2. 커널 상자 (파라미터 범위 대비 bandwidth 반폭, 범위로 절단)
+        low = np.array([self.distributions[key]['low'] for key in PARAMETER_KEYS])
+        high = np.array([self.distributions[key]['high'] for key in PARAMETER_KEYS])
+        half_width = bandwidth * (high - low)
+        box_lower = np.clip(centers - half_width, low, high)
+        box_upper = np.clip(centers + half_width, low, high)
+
+        # 3. 방어적 혼합 제안 분포에서 표본 추출
+        parameters = self._sample_nominal(sample_count)
+        from_kernel = np.flatnonzero(self.rng.random(sample_count) >= defensive_ratio)
+        component = self.rng.integers(len(centers), size=len(from_kernel))
+        kernel_draws = box_lower[component] + self.rng.random((len(from_kernel), len(PARAMETER_KEYS))) * (
+            box_upper[component] - box_lower[component])
+        for axis, key in enumerate(PARAMETER_KEYS):
+            parameters[key][from_kernel] = kernel_draws[:, axis]
+
+        # 4. 가중치 p/q
+        nominal_density = self._nominal_density(parameters)
+        kernel_density = self._kernel_density(parameters, box_lower, box_upper)
+        proposal_density = defensive_ratio * nominal_density + (1 - defensive_ratio) * kernel_density
+
+        columns = self.generator.columns_from_parameters(parameters)
+        columns['weight'] = nominal_density / proposal_density
+        logger.info(
+            f"중요도 샘플링 시나리오 생성: {sample_count}개 표본 (커널 {len(from_kernel)}개), "
+            f"유효 표본 수 {self._effective_sample_size(columns['weight']):.0f}"
+        )
+        return columns
+
+    def estimate_failure_rates(self, columns, scenario_filter=None):
+        """가중치 컬럼을 반영한 공칭 분포 기준 판정 확률 추정
+
+        반환 dict:
+          estimates: valid / human_fails / ads_fails / test_case별 rate, standard_error
+          sample_count, effective_sample_size
+        """
+        scenario_filter = scenario_filter or ScenarioFilter(self.config)
+        outcomes = scenario_filter.evaluate_outcomes(columns)
+        weight = np.asarray(columns.get('weight', np.ones(len(columns['v_ego']))), dtype=float)
+        sample_count = len(weight)
+
+        estimates = {}
+        for outcome, mask in outcomes.items():
+            weighted = weight * mask
+            estimates[outcome] = {
+                'rate': float(weighted.mean()) if sample_count else 0.0,
+                'standard_error': float(weighted.std(ddof=1) / math.sqrt(sample_count)) if sample_count > 1 else float('nan')
+            }
+            logger.info(
+                f"추정 확률 {outcome}: {estimates[outcome]['rate']:.4%} "
+                f"(표준 오차 {estimates[outcome]['standard_error']:.4%})"
+            )
+
+        return {
+            'estimates': estimates,
+            'sample_count': sample_count,
+            'effective_sample_size': self._effective_sample_size(weight)
+        }
+
+    def _sample_count(self, sample_count):
+        """표본 수 결정 (인자 > 설정 파일 > 기본값)"""
+        if sample_count is None:
+            sample_count = self.monte_carlo_config.get('sample_count', 100000)
+        if sample_count <= 0:
+            raise ValueError(f"sample_count는 양수여야 합니다: {sample_count}")
+        return sample_count
+
+    def _build_distribution(self, key, low, high, distribution_config):
+        """파라미터별 공칭 분포 정의 (범위는 차량 설정의 min~max)"""
+        distribution_type = distribution_config.get('type', 'uniform')
+        distribution = {'type': distribution_type, 'low': low, 'high': high}
+
+        if distribution_type == 'normal':
+            mean = distribution_config['mean']
+            std = distribution_config['std']
+            if std <= 0:
+                raise ValueError(f"{key} 정규 분포의 std는 양수여야 합니다: {std}")
+            # 범위 [low, high]로 절단한 정규 분포의 정규화 상수
+            cdf = lambda x: 0.5 * (1 + math.erf((x - mean) / (std * math.sqrt(2))))
+            distribution.update({'mean': mean, 'std': std, 'mass': cdf(high) - cdf(low)})
+            if distribution['mass'] <= 0:
+                raise ValueError(f"{key} 정규 분포가 파라미터 범위와 겹치지 않습니다.")
+        elif distribution_type != 'uniform':
+            raise ValueError(f"지원하지 않는 분포 유형 '{distribution_type}': {key}")
+
+        return distribution
+
+    def _sample_nominal(self, count):
+        """공칭 분포에서 파라미터별 표본 추출"""
+        parameters = {}
+        for key in PARAMETER_KEYS:
+            distribution = self.distributions[key]
+            low, high = distribution['low'], distribution['high']
+
+            if distribution['type'] == 'uniform':
+                parameters[key] = self.rng.uniform(low, high, count)
+                continue
+
+            # 절단 정규 분포: 범위를 벗어난 표본만 다시 추출
+            values = self.rng.normal(distribution['mean'], distribution['std'], count)
+            outside = np.flatnonzero((values < low) | (values > high))
+            while len(outside):
+                values[outside] = self.rng.normal(distribution['mean'], distribution['std'], len(outside))
+                outside = outside[(values[outside] < low) | (values[outside] > high)]
+            parameters[key] = values
+
+        return parameters
+
+    def _nominal_density(self, parameters):
+        """공칭 분포 결합 확률 밀도 (폭이 0인 축은 제외)"""
+        density = np.ones(len(parameters[PARAMETER_KEYS[0]]))
+        for key in PARAMETER_KEYS:
+            distribution = self.distributions[key]
+            width = distribution['high'] - distribution['low']
+            if width <= 0:
+                continue
+
+            if distribution['type'] == 'uniform':
+                density = density / width
+            else:
+                z = (parameters[key] - distribution['mean']) / distribution['std']
+                density = density * np.exp(-0.5 * z ** 2) / (distribution['std'] * math.sqrt(2 * math.pi) * distribution['mass'])
+
+        return density
+
+    def _kernel_density(self, parameters, box_lower, box_upper):
+        """균등 상자 커널 혼합의 확률 밀도 (폭이 0인 축은 제외)"""
+        values = np.column_stack([parameters[key] for key in PARAMETER_KEYS])
+        active = np.array([self.distributions[key]['high'] > self.distributions[key]['low'] for key in PARAMETER_KEYS])
+        values, box_lower, box_upper = values[:, active], box_lower[:, active], box_upper[:, active]
+        inverse_volume = 1.0 / np.prod(box_upper - box_lower, axis=1)
+
+        density = np.empty(len(values))
+        for start in range(0, len(values), _DENSITY_CHUNK_SIZE):
+            chunk = values[start:start + _DENSITY_CHUNK_SIZE, None, :]
+            inside = ((chunk >= box_lower[None]) & (chunk <= box_upper[None])).all(axis=2)
+            density[start:start + _DENSITY_CHUNK_SIZE] = inside @ inverse_volume / len(box_lower)
+
+        return density
+
+    def _effective_sample_size(self, weight):
+        """가중치의 유효 표본 수 (sum(w)^2 / sum(w^2))"""
+        weight_sum_squares = float(np.sum(weight ** 2))
+        return float(np.sum(weight)) ** 2 / weight_sum_squares if weight_sum_squares > 0 else 0.0
@@ -4,126 +4,278 @@ Concrete Scenario 생성 클래스
 
 import numpy as np
 import logging
-import itertools
+from ..utils.scenario_columns import ScenarioColumns
+from ..utils.condition_compiler import ConditionCompiler
 
 logger = logging.getLogger('cutout_scenario.generator')
 
+# 시나리오 파라미터 축 (조합 생성 순서)
+PARAMETER_KEYS = (
+    'v_ego',  # km/h
+    'v_lv1',  # km/h
+    'v_lv1_lat',  # m/s
+    'thw_ego_lv1',  # s
+    'v_lv2',  # km/h
+    'dec_lv2',  # m/s²
+    'thw_ego_lv2_reveal'  # s
+)
+
+# 파라미터로부터 계산되는 컬럼
+DERIVED_KEYS = (
+    'd_ego_lv1',  # m
+    'd_lv1_lv2',  # m
+    'lane_change_direction',
+    'lv2_deceleration_trigger_delay'  # s
+)
+
+# 설정 파일에 조건이 없을 때 적용할 물리적 유효성 조건 (참이면 무효)
+DEFAULT_VALIDITY_CONDITIONS = (
+    "thw_ego_lv2_reveal <= thw_ego_lv1",
+    "v_lv2_long > v_ego and dec_lv2_long == 0"
+)
+
+def compile_validity_conditions(config):
+    """filtering.logical_conditions.physical_validity_conditions 컴파일"""
+    logical_conditions = config.get('filtering', {}).get('logical_conditions', {})
+    expressions = logical_conditions.get('physical_validity_conditions', DEFAULT_VALIDITY_CONDITIONS)
+    return ConditionCompiler.compile_all(expressions, PARAMETER_KEYS + DERIVED_KEYS)
+
 class ScenarioGenerator:
     """Concrete Scenario 생성 클래스"""
     
     def __init__(self, config):
         self.config = config
+        self.validity_conditions = compile_validity_conditions(config)
         
     def generate_scenarios(self):
         """파라미터 범위에 따라 가능한 모든 시나리오 조합 생성"""
         logger.info("파라미터 범위에 따른 시나리오 조합 생성 시작")
         
-        # Ego 차량 파라미터 범위
-        ego_config = self.config['vehicles']['ego_vehicle']
-        v_ego_range = np.arange(
-            ego_config['longitudinal_velocity']['min'],
-            ego_config['longitudinal_velocity']['max'] + ego_config['longitudinal_velocity']['step'],
-            ego_config['longitudinal_velocity']['step']
-        )
-        logger.debug(f"Ego 속도 범위: {v_ego_range} km/h")
+        # 유효한 조합만 컬럼 형태로 열거한 뒤 시나리오 객체로 변환
+        columns = self.generate_scenario_columns()
+        del columns['grid_index']
+        scenarios = ScenarioColumns.to_scenarios(columns)
         
-        # LV1 차량 파라미터 범위
-        lv1_config = self.config['vehicles']['lead_vehicle_1']
-        v_lv1_range = np.arange(
-            lv1_config['longitudinal_velocity']['min'],
-            lv1_config['longitudinal_velocity']['max'] + lv1_config['longitudinal_velocity']['step'],
-            lv1_config['longitudinal_velocity']['step']
-        )
+        logger.info(f"유효한 시나리오 수: {len(scenarios)}")
+        return scenarios
+
+    def generate_scenario_columns(self):
+        """파라미터 범위에 따라 유효한 시나리오 조합을 컬럼(dict of arrays) 형태로 생성"""
+        logger.info("파라미터 범위에 따른 컬럼 기반 시나리오 조합 생성 시작")
         
-        v_lv1_lat_range = np.arange(
-            lv1_config['lateral_velocity']['min'],
-            lv1_config['lateral_velocity']['max'] + lv1_config['lateral_velocity']['step'],
-            lv1_config['lateral_velocity']['step']
-        )
+        plan = self._build_enumeration_plan()
+        grid_index = self._grid_index_from_rows(plan, 0, plan['enumerated_combinations'])
+        columns = self._apply_row_conditions(plan, self._columns_from_grid_index(plan['ranges'], grid_index))
         
-        thw_ego_lv1_range = np.arange(
-            lv1_config['initial_thw']['min'],
-            lv1_config['initial_thw']['max'] + lv1_config['initial_thw']['step'],
-            lv1_config['initial_thw']['step']
-        )
+        logger.info(f"유효한 시나리오 수: {len(columns['v_ego'])}")
+        return columns
+
+    def iter_scenario_blocks(self, block_size=1000000):
+        """유효한 조합을 혼합 기수(mixed-radix) 인덱스 순서로 고정 크기 블록 단위 생성
         
-        # LV2 차량 파라미터 범위
-        lv2_config = self.config['vehicles']['lead_vehicle_2']
-        v_lv2_range = np.arange(
-            lv2_config['longitudinal_velocity']['min'],
-            lv2_config['longitudinal_velocity']['max'] + lv2_config['longitudinal_velocity']['step'],
-            lv2_config['longitudinal_velocity']['step']
-        )
+        무효한 축 조합은 열거 단계에서 제외되므로 마지막 블록을 제외한
+        모든 블록은 정확히 block_size개의 유효한 시나리오를 포함한다.
+        (파생 컬럼을 참조하는 조건이 설정된 경우 해당 조건으로 제외된 만큼 작아진다.)
+        """
+        if block_size <= 0:
+            raise ValueError(f"block_size는 양수여야 합니다: {block_size}")
+        
+        plan = self._build_enumeration_plan()
+        total = plan['enumerated_combinations']
+        logger.info(f"블록 단위 시나리오 생성 시작: 유효 조합 {total}개, 블록 크기 {block_size}")
+        
+        for start in range(0, total, block_size):
+            yield self.generate_block(start, min(start + block_size, total), plan)
+
+    def generate_block(self, start, stop, plan=None):
+        """유효한 조합 중 행 번호 구간 [start, stop)에 해당하는 시나리오를 컬럼 형태로 생성"""
+        if plan is None:
+            plan = self._build_enumeration_plan()
+        grid_index = self._grid_index_from_rows(plan, start, stop)
+        return self._apply_row_conditions(plan, self._columns_from_grid_index(plan['ranges'], grid_index))
+
+    def count_valid_combinations(self):
+        """제약 조건 푸시다운 후 열거되는 유효 조합 수"""
+        return self._build_enumeration_plan()['enumerated_combinations']
+
+    def count_grid_combinations(self, ranges=None):
+        """유효성 검사 전 전체 파라미터 조합 수"""
+        if ranges is None:
+            ranges = self._build_parameter_ranges()
+        return int(np.prod([len(values) for values in ranges.values()]))
+
+    def get_parameter_ranges(self):
+        """설정 파일의 파라미터 축별 값 범위"""
+        return self._build_parameter_ranges()
+
+    def columns_from_parameters(self, parameters):
+        """파라미터 값 dict(격자 밖의 값 허용)에 파생 컬럼을 추가한 시나리오 컬럼 생성"""
+        columns = {key: np.asarray(parameters[key]) for key in PARAMETER_KEYS}
+        return self._add_derived_columns(columns)
+
+    def get_enumeration_stats(self):
+        """제약 조건 푸시다운으로 절감된 열거량 통계"""
+        plan = self._build_enumeration_plan()
+        return {key: value for key, value in plan.items() if not isinstance(value, (dict, np.ndarray))}
+
+    def _build_enumeration_plan(self):
+        """유효한 축 조합만 열거하기 위한 계획 생성 (제약 조건 푸시다운)
+        
+        파라미터 축만 참조하는 조건은 해당 축의 축소된 조합 위에서 먼저 평가하고,
+        외부 축(v_ego, v_lv1, v_lv1_lat, thw_ego_lv1) 접두부마다 허용되는
+        내부 축(v_lv2, dec_lv2, thw_ego_lv2_reveal) 조합 목록을 만든다.
+        행 순서는 전체 곱집합에서 유효한 조합만 남긴 순서와 같다.
+        파생 컬럼(d_ego_lv1 등)을 참조하는 조건은 생성된 행에 마스크로 적용된다.
+        """
+        ranges = self._build_parameter_ranges()
+        outer_keys = PARAMETER_KEYS[:4]
+        inner_keys = PARAMETER_KEYS[4:]
+        
+        pushdown_conditions = [c for c in self.validity_conditions if c.variables <= set(PARAMETER_KEYS)]
+        row_conditions = [c for c in self.validity_conditions if not c.variables <= set(PARAMETER_KEYS)]
         
-        dec_lv2_range = np.arange(
-            lv2_config['longitudinal_deceleration']['min'],
-            lv2_config['longitudinal_deceleration']['max'] + lv2_config['longitudinal_deceleration']['step'],
-            lv2_config['longitudinal_deceleration']['step']
+        # 1. 조건별 축소된 축 조합 (예: THW 쌍, 속도 3중 조합)
+        condition_stats = []
+        for condition in pushdown_conditions:
+            keys = [key for key in PARAMETER_KEYS if key in condition.variables]
+            invalid = self._evaluate_on_axes(ranges, keys, [condition])
+            condition_stats.append({
+                'condition': condition.expression,
+                'axes': keys,
+                'valid': int((~invalid).sum()),
+                'total': invalid.size
+            })
+        
+        # 2. 조건이 참조하는 외부 축 키별 허용 내부 조합 = 축소된 집합의 곱
+        key_axes = [key for key in outer_keys if any(key in c.variables for c in pushdown_conditions)]
+        invalid = self._evaluate_on_axes(ranges, key_axes + list(inner_keys), pushdown_conditions)
+        inner_size = int(np.prod([len(ranges[key]) for key in inner_keys]))
+        inner_valid = ~invalid.reshape(-1, inner_size)
+        inner_counts = inner_valid.sum(axis=1)
+        
+        # 키별 유효 내부 인덱스를 오름차순으로 앞쪽에 배치한 조회 테이블
+        inner_table = np.argsort(~inner_valid, axis=1, kind='stable')[:, :max(int(inner_counts.max()), 1)]
+        
+        # 3. 외부 접두부별 유효 조합 수 및 누적 경계
+        outer_shape = tuple(len(ranges[key]) for key in outer_keys)
+        outer_indices = np.unravel_index(np.arange(int(np.prod(outer_shape))), outer_shape)
+        if key_axes:
+            prefix_key = np.ravel_multi_index(
+                [outer_indices[outer_keys.index(key)] for key in key_axes],
+                tuple(len(ranges[key]) for key in key_axes))
+        else:
+            prefix_key = np.zeros(len(outer_indices[0]), dtype=np.int64)
+        prefix_counts = inner_counts[prefix_key]
+        prefix_end = np.cumsum(prefix_counts)
+        
+        total = self.count_grid_combinations(ranges)
+        enumerated = int(prefix_end[-1]) if len(prefix_end) else 0
+        
+        plan = {
+            'ranges': ranges,
+            'row_conditions': row_conditions,
+            'inner_size': inner_size,
+            'inner_table': inner_table,
+            'prefix_key': prefix_key,
+            'prefix_counts': prefix_counts,
+            'prefix_end': prefix_end,
+            'total_combinations': total,
+            'enumerated_combinations': enumerated,
+            'pruned_combinations': total - enumerated,
+            'pruned_ratio': (total - enumerated) / total if total else 0.0,
+            'condition_stats': condition_stats
+        }
+        
+        reduced = ", ".join(f"{stat['condition']}: {stat['valid']}/{stat['total']}" for stat in condition_stats)
+        logger.info(
+            f"제약 조건 푸시다운: 전체 {total}개 중 {enumerated}개만 열거 "
+            f"({plan['pruned_combinations']}개, {plan['pruned_ratio']:.1%} 절감; {reduced})"
         )
+        return plan
+
+    def _evaluate_on_axes(self, ranges, keys, conditions):
+        """지정한 축들의 곱집합 위에서 조건 평가 (하나라도 참이면 무효)"""
+        axes = dict(zip(keys, np.meshgrid(*(ranges[key] for key in keys), indexing='ij', sparse=True)))
+        shape = tuple(len(ranges[key]) for key in keys)
+        return np.broadcast_to(ConditionCompiler.evaluate_any(conditions, axes), shape)
+
+    def _apply_row_conditions(self, plan, columns):
+        """파생 컬럼을 참조하는 조건을 생성된 행에 마스크로 적용"""
+        if not plan['row_conditions']:
+            return columns
+        invalid = ConditionCompiler.evaluate_any(plan['row_conditions'], columns, len(columns['v_ego']))
+        return ScenarioColumns.take(columns, ~invalid)
+
+    def _grid_index_from_rows(self, plan, start, stop):
+        """유효 조합의 행 번호 구간 [start, stop)을 전체 곱집합의 grid_index로 변환"""
+        rows = np.arange(start, stop, dtype=np.int64)
+        
+        # 행이 속한 외부 접두부 및 접두부 내 오프셋
+        prefix = np.searchsorted(plan['prefix_end'], rows, side='right')
+        offset = rows - (plan['prefix_end'][prefix] - plan['prefix_counts'][prefix])
+        
+        inner_index = plan['inner_table'][plan['prefix_key'][prefix], offset]
+        return prefix * plan['inner_size'] + inner_index
+
+    def _build_parameter_ranges(self):
+        """설정 파일로부터 파라미터 축별 값 범위 계산"""
+        ego_config = self.config['vehicles']['ego_vehicle']
+        lv1_config = self.config['vehicles']['lead_vehicle_1']
+        lv2_config = self.config['vehicles']['lead_vehicle_2']
         
-        thw_ego_lv2_reveal_range = np.arange(
-            lv2_config['reveal_thw']['min'],
-            lv2_config['reveal_thw']['max'] + lv2_config['reveal_thw']['step'],
-            lv2_config['reveal_thw']['step']
+        range_configs = (
+            ego_config['longitudinal_velocity'],
+            lv1_config['longitudinal_velocity'],
+            lv1_config['lateral_velocity'],
+            lv1_config['initial_thw'],
+            lv2_config['longitudinal_velocity'],
+            lv2_config['longitudinal_deceleration'],
+            lv2_config['reveal_thw']
         )
         
-        # 모든 파라미터 조합 생성
-        all_combinations = list(itertools.product(
-            v_ego_range,
-            v_lv1_range,
-            v_lv1_lat_range,
-            thw_ego_lv1_range,
-            v_lv2_range,
-            dec_lv2_range,
-            thw_ego_lv2_reveal_range
-        ))
-        
-        logger.info(f"생성된 총 조합 수: {len(all_combinations)}")
-        
-        # 시나리오 객체 생성
-        scenarios = []
-        for combo in all_combinations:
-            v_ego, v_lv1, v_lv1_lat, thw_ego_lv1, v_lv2, dec_lv2, thw_ego_lv2_reveal = combo
-            
-            # 물리적으로 불가능하거나 논리적으로 의미 없는 조합 필터링
-            if not self._is_valid_combination(v_ego, v_lv1, v_lv1_lat, thw_ego_lv1, 
-                                            v_lv2, dec_lv2, thw_ego_lv2_reveal):
-                continue
-            
-            # 시나리오 객체 생성 (필요한 정보 포함)
-            scenario = {
-                'v_ego': v_ego,  # km/h
-                'v_lv1': v_lv1,  # km/h
-                'v_lv1_lat': v_lv1_lat,  # m/s
-                'thw_ego_lv1': thw_ego_lv1,  # s
-                'v_lv2': v_lv2,  # km/h
-                'dec_lv2': dec_lv2,  # m/s²
-                'thw_ego_lv2_reveal': thw_ego_lv2_reveal,  # s
-                # 거리 계산 (필요시)
-                'd_ego_lv1': (v_ego/3.6) * thw_ego_lv1,  # m
-                'd_lv1_lv2': (v_lv1/3.6) * (thw_ego_lv2_reveal - thw_ego_lv1),  # m
-                # 기타 필요한 매개변수
-                'lane_change_direction': lv1_config['lane_change']['direction'],
-                'lv2_deceleration_trigger_delay': lv2_config['deceleration_settings']['trigger_delay']
-            }
-            
-            scenarios.append(scenario)
+        ranges = {}
+        for key, range_config in zip(PARAMETER_KEYS, range_configs):
+            ranges[key] = np.arange(
+                range_config['min'],
+                range_config['max'] + range_config['step'],
+                range_config['step']
+            )
+            logger.debug(f"{key} 범위: {ranges[key]}")
         
-        logger.info(f"유효한 시나리오 수: {len(scenarios)}")
-        return scenarios
+        return ranges
 
-    def _is_valid_combination(self, v_ego, v_lv1, v_lv1_lat, thw_ego_lv1, 
-                            v_lv2, dec_lv2, thw_ego_lv2_reveal):
-        """물리적으로 불가능하거나 논리적으로 의미 없는 조합 필터링"""
+    def _columns_from_grid_index(self, ranges, grid_index):
+        """혼합 기수 grid_index를 파라미터 컬럼으로 변환"""
+        grid_shape = tuple(len(values) for values in ranges.values())
+        axis_indices = np.unravel_index(grid_index, grid_shape)
         
-        # 1. LV2 드러난 시점 THW가 초기 THW보다 작거나 같으면 무효
-        if thw_ego_lv2_reveal <= thw_ego_lv1:
-            return False
+        columns = {'grid_index': grid_index}
+        for (key, values), index in zip(ranges.items(), axis_indices):
+            columns[key] = values[index]
+        self._add_derived_columns(columns)
         
-        # 2. LV2가 Ego보다 빠르고 감속하지 않는 경우 (충돌 위험 없음)
-        if v_lv2 > v_ego and dec_lv2 == 0:
-            return False
+        return columns
+
+    def _add_derived_columns(self, columns):
+        """거리 및 고정 파라미터 컬럼 추가"""
+        lv1_config = self.config['vehicles']['lead_vehicle_1']
+        lv2_config = self.config['vehicles']['lead_vehicle_2']
+        count = len(columns['v_ego'])
+        
+        columns['d_ego_lv1'] = (columns['v_ego']/3.6) * columns['thw_ego_lv1']  # m
+        columns['d_lv1_lv2'] = (columns['v_lv1']/3.6) * (columns['thw_ego_lv2_reveal'] - columns['thw_ego_lv1'])  # m
+        columns['lane_change_direction'] = np.full(count, lv1_config['lane_change']['direction'])
+        columns['lv2_deceleration_trigger_delay'] = np.full(count, lv2_config['deceleration_settings']['trigger_delay'])
         
-        # 3. 필요 시 추가 조건
+        return columns
+
+    def _is_valid_combination(self, v_ego, v_lv1, v_lv1_lat, thw_ego_lv1, 
+                            v_lv2, dec_lv2, thw_ego_lv2_reveal):
+        """물리적으로 불가능하거나 논리적으로 의미 없는 조합 필터링 (설정 파일 조건 적용)"""
+        scenario = dict(zip(PARAMETER_KEYS, (v_ego, v_lv1, v_lv1_lat, thw_ego_lv1, v_lv2, dec_lv2, thw_ego_lv2_reveal)))
+        scenario['d_ego_lv1'] = (v_ego/3.6) * thw_ego_lv1
+        scenario['d_lv1_lv2'] = (v_lv1/3.6) * (thw_ego_lv2_reveal - thw_ego_lv1)
+        scenario['lane_change_direction'] = self.config['vehicles']['lead_vehicle_1']['lane_change']['direction']
+        scenario['lv2_deceleration_trigger_delay'] = self.config['vehicles']['lead_vehicle_2']['deceleration_settings']['trigger_delay']
         
-        return True
+        return not ConditionCompiler.any_row(self.validity_conditions, scenario)
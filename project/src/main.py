@@ -5,40 +5,143 @@ Cut-out 시나리오 분석 및 시험 자동화 도구 메인 모듈
 
 import os
 import logging
+import numpy as np
 from .generators.scenario_generator import ScenarioGenerator
+from .generators.monte_carlo_generator import MonteCarloScenarioGenerator
 from .calculators.ttc_calculator import TTCCalculator
 from .filters.scenario_filter import ScenarioFilter
+from .filters.boundary_search import DecisionBoundaryExtractor
+from .filters.equivalence_compressor import OutcomeEquivalenceCompressor
 from .reporters.excel_reporter import ExcelReporter
 from .reporters.plot_visualizer import PlotVisualizer
-from .utils.sampling import StratifiedSampler
+from .utils.sampling import StratifiedSampler, StreamingStratifiedSampler, CoverageSampler
+from .utils.scenario_columns import ScenarioColumns
+from .utils.filter_cache import FilterCache
+from .utils.run_manifest import RunManifest
 from .converters.comparative_scenario_converter import ComparativeScenarioConverter
 from .runners.simulation_runner import SimulationRunner
+from .runners.kinematic_simulator import KinematicSimulator
+from .runners.pipeline_executor import SimulationVideoPipeline
 from .processors.video_processor import VideoProcessor
 
 logger = logging.getLogger('cutout_scenario.main')
 
-def main(config):
-    '''메인 실행 함수'''
-    logger.info("Cut-out 시나리오 분석 시작")
-    
+def run_analysis(config):
+    '''생성 -> 필터링 -> 리포트 -> 샘플링 (1~6단계), 필터링/샘플링된 Test Case 반환'''
     # 1. Concrete Scenario 생성
     logger.info("시나리오 생성 중...")
     generator = ScenarioGenerator(config)
-    concrete_scenarios = generator.generate_scenarios()
-    logger.info(f"생성된 Concrete Scenario 수: {len(concrete_scenarios)}")
-    
-    # 2. TTC 계산 및 필터링
-    logger.info("시나리오 필터링 중...")
     scenario_filter = ScenarioFilter(config)
-    filtered_scenarios = scenario_filter.filter_scenarios(concrete_scenarios)
-    logger.info(f"필터링된 Test Case 수: {len(filtered_scenarios)}")
+    output_dir = config['simulation']['output']['output_directory']
+    parallel_config = config['filtering'].get('parallel', {})
+    cache_config = config['filtering'].get('cache', {})
+    monte_carlo_config = config['simulation'].get('monte_carlo', {})
+    sampling_config = config['simulation']['sampling']
+    streaming_config = sampling_config.get('streaming', {})
+    streaming_sampler = None
+    monte_carlo_estimates = None
+    concrete_columns = None
+    prefiltered_columns = None
+    groupby_keys = sampling_config.get('groupby_keys', 'v_ego')
+    
+    if monte_carlo_config.get('enabled', False):
+        # 격자 대신 시드 고정 무작위 표본 생성 후 가중 확률 추정 (weight 컬럼 포함)
+        logger.info("몬테카를로 시나리오 생성 중...")
+        monte_carlo_generator = MonteCarloScenarioGenerator(config)
+        concrete_columns = monte_carlo_generator.generate()
+        monte_carlo_estimates = monte_carlo_generator.estimate_failure_rates(concrete_columns, scenario_filter)
+        
+        logger.info("시나리오 필터링 중...")
+        filtered_columns = scenario_filter.filter_columns(concrete_columns)
+        
+        # 연속 표본은 행마다 v_ego가 달라 그대로 층화하면 층이 행 하나씩이 되므로 v_ego_groups 구간으로 층화
+        filtered_columns['v_ego_group'] = StratifiedSampler.bin_column(filtered_columns['v_ego'], sampling_config['v_ego_groups'])
+        groupby_keys = [
+            'v_ego_group' if key == 'v_ego' else key
+            for key in np.atleast_1d(groupby_keys).tolist()
+        ]
+    elif cache_config.get('enabled', False):
+        # 제어 모델과 무관한 중간 결과를 캐시에서 재사용하고 Human/ADS 판단만 재계산
+        logger.info("시나리오 필터링 중 (중간 결과 캐시 사용)...")
+        cache = FilterCache(os.path.join(output_dir, cache_config.get('directory', 'cache')))
+        filtered_columns = scenario_filter.filter_with_cache(cache, generator.generate_scenario_columns)
+        prefiltered_columns = scenario_filter.last_prefiltered
+    elif parallel_config.get('enabled', False):
+        # 생성과 필터링을 워커 프로세스에서 구간 단위로 함께 수행
+        logger.info(f"생성된 Concrete Scenario 수: {generator.count_valid_combinations()}")
+        logger.info("시나리오 병렬 필터링 중...")
+        filtered_columns = scenario_filter.filter_grid_parallel()
+    elif streaming_config.get('enabled', False):
+        # 생성 -> 필터링 -> 층화 샘플링을 블록 단위 단일 패스로 수행 (필터링 결과 전체를 보유하지 않음)
+        logger.info(f"생성된 Concrete Scenario 수: {generator.count_valid_combinations()}")
+        logger.info("시나리오 스트리밍 필터링 및 샘플링 중...")
+        streaming_sampler = StreamingStratifiedSampler(
+            sampling_config['target_sample_count'],
+            sampling_config.get('groupby_keys', 'v_ego'),
+            sampling_config['prioritize_by']
+        )
+        blocks = generator.iter_scenario_blocks(streaming_config.get('block_size', 1000000))
+        for filtered_block in scenario_filter.iter_filtered_blocks(blocks):
+            streaming_sampler.update(filtered_block)
+        
+        # 리포트에는 그룹별로 유지된 후보만 기록
+        filtered_columns = streaming_sampler.candidates()
+    else:
+        concrete_columns = generator.generate_scenario_columns()
+        logger.info(f"생성된 Concrete Scenario 수: {ScenarioColumns.length(concrete_columns)}")
+        
+        # 2. TTC 계산 및 필터링 (컬럼 단위 벡터 연산)
+        logger.info("시나리오 필터링 중...")
+        filtered_columns = scenario_filter.filter_columns(concrete_columns)
+    
+    filter_statistics = scenario_filter.last_statistics
+    
+    # 결정 경계 정밀화 (선택 사항, 스트리밍 모드는 후보만 남으므로 제외)
+    boundary_search_enabled = config['filtering'].get('boundary_search', {}).get('enabled', False)
+    if boundary_search_enabled and streaming_sampler is not None:
+        logger.warning("스트리밍 모드에서는 결정 경계 탐색을 건너뜁니다")
+    elif boundary_search_enabled and 'grid_index' in filtered_columns:
+        logger.info("결정 경계 탐색 중...")
+        boundary = DecisionBoundaryExtractor(config).extract(filtered_columns)
+        boundary_file = os.path.join(output_dir, 'reports', 'decision_boundary.npz')
+        os.makedirs(os.path.dirname(boundary_file), exist_ok=True)
+        np.savez_compressed(boundary_file, **boundary['points'])
+        logger.info(f"결정 경계 저장: {boundary_file}")
+    
+    # 운동학 사전 시뮬레이션 (선택 사항)
+    if config['simulation'].get('presimulation', {}).get('enabled', False):
+        logger.info("운동학 사전 시뮬레이션 중...")
+        filtered_columns.update(KinematicSimulator(config).simulate(filtered_columns))
+    
+    filtered_scenarios = ScenarioColumns.to_scenarios(filtered_columns)
+    filtered_count = filter_statistics.selected_scenarios
+    if streaming_sampler is not None:
+        logger.info(f"필터링된 Test Case 수: {filtered_count} (리포트 기록 후보 {len(filtered_scenarios)}개)")
+    else:
+        logger.info(f"필터링된 Test Case 수: {filtered_count}")
     
     # 3. 엑셀 리포트 생성
     logger.info("엑셀 리포트 생성 중...")
-    output_dir = config['simulation']['output']['output_directory']
     excel_file = os.path.join(output_dir, 'reports', config['simulation']['output']['excel_report_name'])
     excel_reporter = ExcelReporter(config)
     excel_reporter.create_report(filtered_scenarios)
+    excel_reporter.add_filter_statistics(excel_file, filter_statistics)
+    
+    # 제어 모델 파라미터 민감도 분석 (선택 사항)
+    sensitivity_config = config['filtering'].get('sensitivity_analysis', {})
+    if sensitivity_config.get('enabled', False):
+        logger.info("제어 모델 민감도 분석 중...")
+        variants = TTCCalculator.expand_variant_grid(sensitivity_config['variant_grid'])
+        if prefiltered_columns is None:
+            # 캐시를 사용하지 않았으면 격자 생성 결과를 재사용하여 파라미터 독립 단계만 적용
+            # (몬테카를로 모드는 표본이 아닌 격자 기준으로 분석)
+            if concrete_columns is None or monte_carlo_estimates is not None:
+                concrete_columns = generator.generate_scenario_columns()
+            prefiltered_columns = scenario_filter.prefilter_columns(concrete_columns)
+        sensitivity_results = scenario_filter.evaluate_variants(prefiltered_columns, variants)
+        excel_reporter.add_sensitivity_results(excel_file, sensitivity_results)
+    if monte_carlo_estimates is not None:
+        excel_reporter.add_monte_carlo_estimates(excel_file, monte_carlo_estimates)
     logger.info(f"엑셀 리포트 저장: {excel_file}")
     
     # 4. 3D 산점도 생성 (선택 사항)
@@ -51,59 +154,202 @@ def main(config):
     except Exception as e:
         logger.warning(f"3D 산점도 생성 실패: {e}")
     
-    # 5. 시뮬레이션 대상 샘플링
+    # 판정 결과 동치 시나리오 압축 (선택 사항, 스트리밍 모드 제외)
+    candidate_columns = filtered_columns
+    if config['filtering'].get('equivalence_compression', {}).get('enabled', False) and streaming_sampler is None:
+        logger.info("동치 시나리오 압축 중...")
+        candidate_columns = OutcomeEquivalenceCompressor(config).compress(filtered_columns)
+    
+    # 5. 시뮬레이션 대상 샘플링 (컬럼 단위)
     logger.info("시뮬레이션 대상 샘플링 중...")
-    sampler = StratifiedSampler()
-    target_count = config['simulation']['sampling']['target_sample_count']
-    sampled_scenarios = sampler.sample_test_cases(
-        filtered_scenarios,
-        target_count,
-        'v_ego',
-        config['simulation']['sampling']['prioritize_by']
-    )
+    target_count = sampling_config['target_sample_count']
+    if streaming_sampler is not None:
+        sampled_columns = streaming_sampler.finalize()
+    elif sampling_config.get('method', 'stratified') == 'coverage':
+        sampled_columns = CoverageSampler.sample_columns(
+            candidate_columns,
+            target_count,
+            sampling_config['coverage_keys'],
+            sampling_config['prioritize_by']
+        )
+    else:
+        sampler = StratifiedSampler()
+        sampled_columns = sampler.sample_columns(
+            candidate_columns,
+            target_count,
+            groupby_keys,
+            sampling_config['prioritize_by']
+        )
+    sampled_scenarios = ScenarioColumns.to_scenarios(sampled_columns)
     logger.info(f"샘플링된 Test Case 수: {len(sampled_scenarios)}")
     
     # 6. 엑셀 리포트에 샘플링 결과 추가
     logger.info("엑셀 리포트에 샘플링 결과 추가 중...")
     excel_reporter.add_sampled_scenarios(excel_file, sampled_scenarios)
     
-    # 7. OpenSCENARIO 변환 (scenariogeneration 라이브러리 사용)
+    return filtered_scenarios, sampled_scenarios, filtered_count
+
+def main(config, resume=False):
+    '''메인 실행 함수 (resume: 실행 매니페스트 기준으로 완료된 작업을 건너뜀)'''
+    logger.info("Cut-out 시나리오 분석 시작")
+    output_dir = config['simulation']['output']['output_directory']
+    
+    # 실행 매니페스트 (단계별/시나리오별 완료 상태, 재개 시 입력 해시와 파일 내용으로 최신 여부 판단)
+    manifest = RunManifest(output_dir)
+    analysis_key = RunManifest.analysis_key(config)
+    analysis = manifest.load().load_analysis(analysis_key) if resume else None
+    
+    if analysis is not None:
+        logger.info("실행 재개: 분석 단계(생성~샘플링) 결과 재사용")
+        filtered_scenarios, sampled_scenarios, filtered_count = analysis
+    else:
+        if not resume:
+            manifest.reset()
+        filtered_scenarios, sampled_scenarios, filtered_count = run_analysis(config)
+        manifest.save_analysis(analysis_key, filtered_scenarios, sampled_scenarios, filtered_count)
+    
+    scenario_ids = [f"scenario_{i+1:03d}" for i in range(len(sampled_scenarios))]
+    conversion_config = config['simulation'].get('conversion', {})
+    input_hashes = [
+        RunManifest.content_hash(test_case, config['vehicles'], config['environment'], conversion_config.get('output_mode', 'per_case'))
+        for test_case in sampled_scenarios
+    ]
+    
+    # 7. OpenSCENARIO 변환 (scenariogeneration 라이브러리 또는 컴파일된 템플릿 사용)
     logger.info("OpenSCENARIO 변환 중...")
     converter = ComparativeScenarioConverter(config)
-    xosc_files = []
     scenarios_dir = os.path.join(output_dir, 'scenarios')
+    pending = [
+        i for i, scenario_id in enumerate(scenario_ids)
+        if not manifest.is_fresh(scenario_id, 'xosc', input_hash=input_hashes[i])
+    ]
+    logger.info(f"OpenSCENARIO 변환 대상: {len(pending)}개 (완료된 {len(scenario_ids) - len(pending)}개 건너뜀)")
+    
+    # 파일별 실패는 기록 후 건너뜀 (scenario_NNN 번호는 샘플 순서 기준으로 유지)
+    output_mode = conversion_config.get('output_mode', 'per_case')
+    if not pending:
+        conversion_results = []
+    elif output_mode == 'parameterized':
+        # 구조별 파라미터화 시나리오 + 분포 파일 (ESmini는 분포 순번으로 Test Case 선택)
+        conversion_results = converter.convert_parameterized(sampled_scenarios, scenarios_dir, indices=pending)
+        for result in conversion_results:
+            result['simulation_args'] = [f"--param_dist={result['distribution_file']}", f"--param_permutation={result['permutation']}"]
+    elif output_mode == 'per_case':
+        conversion_results = converter.convert_batch(sampled_scenarios, scenarios_dir, indices=pending)
+    else:
+        raise ValueError(f"지원하지 않는 simulation.conversion.output_mode 값: {output_mode}")
     
-    for i, scenario in enumerate(sampled_scenarios):
-        xosc_file = os.path.join(scenarios_dir, f"scenario_{i+1:03d}.xosc")
-        converter.convert_to_openscenario(scenario, xosc_file)
-        xosc_files.append(xosc_file)
+    for result in conversion_results:
+        # 파라미터화 모드는 구조 XOSC와 해당 Test Case의 분포 행만 포함한 내용 해시
+        # (분포 파일 전체를 해시하면 한 Test Case만 바뀌어도 같은 구조의 모든 비디오가 무효화됨)
+        file_hash = RunManifest.content_hash(
+            RunManifest.file_hash(result['output_file']), result.get('parameter_values'))
+        manifest.record(
+            result['scenario_id'], 'xosc',
+            completed=result['success'],
+            input_hash=input_hashes[result['index']],
+            file=result['output_file'],
+            file_hash=RunManifest.file_hash(result['output_file']),
+            xosc_hash=file_hash,
+            simulation_args=result.get('simulation_args', [])
+        )
+    manifest.save()
     
-    logger.info(f"OpenSCENARIO 파일 생성 완료: {len(xosc_files)}개")
+    xosc_files = []
+    for i, scenario_id in enumerate(scenario_ids):
+        xosc_entry = manifest.entry(scenario_id, 'xosc')
+        if xosc_entry and xosc_entry['completed']:
+            xosc_files.append((i, xosc_entry['file'], xosc_entry['simulation_args']))
     
-    # 8. 시뮬레이션 실행
+    logger.info(f"OpenSCENARIO 변환 완료: Test Case {len(xosc_files)}개")
+    
+    # 8. 시뮬레이션 실행 (ESmini 프로세스 동시 실행 후 성공한 시나리오만 비디오 생성)
     logger.info("시뮬레이션 실행 중...")
-    runner = SimulationRunner(config)
-    video_processor = VideoProcessor(config)
     videos_dir = os.path.join(output_dir, 'videos')
+    video_format = config['simulation']['output']['video_format']
+    video_processor = VideoProcessor(config)
     
-    for i, xosc_file in enumerate(xosc_files):
-        logger.info(f"시나리오 {i+1}/{len(xosc_files)} 실행 중...")
-        
-        # 시뮬레이션 실행
+    # 시나리오별 재실행 범위 결정 (비디오 완료: 건너뜀, 시뮬레이션만 완료: 인코딩만, 그 외: 시뮬레이션부터)
+    simulation_targets, encode_targets = [], []
+    for i, xosc_file, simulation_args in xosc_files:
+        scenario_id = scenario_ids[i]
+        xosc_hash = manifest.entry(scenario_id, 'xosc')['xosc_hash']
         sim_output_dir = os.path.join(output_dir, f"sim_temp_{i+1:03d}")
-        os.makedirs(sim_output_dir, exist_ok=True)
-        runner.run_simulation(xosc_file, sim_output_dir)
+        video_file = os.path.join(videos_dir, f"scenario_{i+1:03d}.{video_format}")
+        target = (i, xosc_file, sim_output_dir, simulation_args, video_file, xosc_hash)
+        
+        if manifest.is_fresh(scenario_id, 'video', xosc_hash=xosc_hash):
+            continue
+        if manifest.is_fresh(scenario_id, 'simulation', xosc_hash=xosc_hash) and os.path.isdir(sim_output_dir):
+            encode_targets.append(target)
+        else:
+            simulation_targets.append(target)
+    logger.info(
+        f"시뮬레이션 대상: {len(simulation_targets)}개, 인코딩만 필요: {len(encode_targets)}개 "
+        f"(완료된 {len(xosc_files) - len(simulation_targets) - len(encode_targets)}개 건너뜀)"
+    )
+    
+    def record_simulation(target, result):
+        manifest.record(
+            scenario_ids[target[0]], 'simulation',
+            completed=result['success'],
+            xosc_hash=target[5],
+            returncode=result['returncode'],
+            duration=result['duration'],
+            error=result['error']
+        )
+    
+    def record_video(target, success):
+        manifest.record(
+            scenario_ids[target[0]], 'video',
+            completed=success,
+            xosc_hash=target[5],
+            file=target[4],
+            file_hash=RunManifest.file_hash(target[4]) if success else None
+        )
+    
+    for target in encode_targets:
+        record_video(target, video_processor.create_video(target[2], target[4]))
+    
+    if config['simulation'].get('pipeline', {}).get('enabled', False):
+        # 시나리오 i의 인코딩과 시나리오 i+1의 시뮬레이션을 겹쳐 실행
+        def record_pipeline_result(position, result):
+            record_simulation(simulation_targets[position], result['simulation'])
+            if result['simulation']['success']:
+                record_video(simulation_targets[position], result['video_success'])
+        
+        pipeline_jobs = [
+            (xosc_file, sim_output_dir, simulation_args, video_file)
+            for _, xosc_file, sim_output_dir, simulation_args, video_file, _ in simulation_targets
+        ]
+        SimulationVideoPipeline(config, video_processor=video_processor).run(pipeline_jobs, on_result=record_pipeline_result)
+    else:
+        runner = SimulationRunner(config)
         
-        # 비디오 생성
-        video_file = os.path.join(videos_dir, f"scenario_{i+1:03d}.{config['simulation']['output']['video_format']}")
-        video_processor.create_video(sim_output_dir, video_file)
+        simulation_jobs = [
+            (xosc_file, sim_output_dir, simulation_args)
+            for _, xosc_file, sim_output_dir, simulation_args, _, _ in simulation_targets
+        ]
+        simulation_results = runner.run_batch(
+            simulation_jobs,
+            on_result=lambda position, result: record_simulation(simulation_targets[position], result)
+        )
         
-        # 임시 파일 정리 (선택 사항)
-        # import shutil
-        # shutil.rmtree(sim_output_dir)
+        for target, simulation_result in zip(simulation_targets, simulation_results):
+            if not simulation_result['success']:
+                logger.error(f"시나리오 {target[0]+1} 시뮬레이션 실패로 비디오 생성 건너뜀: {simulation_result['error']}")
+                continue
+            
+            # 비디오 생성
+            record_video(target, video_processor.create_video(simulation_result['output_dir'], target[4]))
+            
+            # 임시 파일 정리 (선택 사항, 삭제하면 재개 시 인코딩만 다시 할 수 없음)
+            # import shutil
+            # shutil.rmtree(simulation_result['output_dir'])
     
+    manifest.save()
     logger.info("Cut-out 시나리오 분석 완료")
-    return filtered_scenarios, sampled_scenarios
+    return filtered_scenarios, sampled_scenarios, filtered_count
 
 if __name__ == "__main__":
     print("이 모듈은 직접 실행하지 마세요. run.py를 통해 실행하세요.")
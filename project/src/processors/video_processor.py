@@ -6,6 +6,7 @@ import os
 import subprocess
 import logging
 import glob
+from ..utils.async_subprocess import run_streamed, progress_logger
 
 logger = logging.getLogger('cutout_scenario.video_processor')
 
@@ -33,17 +34,7 @@ class VideoProcessor:
         
         try:
             # FFmpeg 명령어 구성
-            cmd = [
-                "ffmpeg",
-                "-framerate", str(self.frame_rate),
-                "-pattern_type", "glob",
-                "-i", image_pattern,
-                "-c:v", "libx264",
-                "-pix_fmt", "yuv420p",
-                "-crf", "23",
-                "-y",  # 기존 파일 덮어쓰기
-                output_file
-            ]
+            cmd = self.build_command(image_pattern, output_file)
             
             # FFmpeg 실행
             logger.debug(f"FFmpeg 명령어: {' '.join(cmd)}")
@@ -61,4 +52,55 @@ class VideoProcessor:
             
         except Exception as e:
             logger.error(f"비디오 생성 중 오류 발생: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    async def create_video_async(self, image_folder, output_file, timeout=None):
+        """이미지 파일을 비디오로 비동기 변환 (FFmpeg 출력은 줄 단위로 로거에 기록, 진행률은 프레임 수 기준)"""
+        logger.info(f"비디오 생성 시작: {output_file}")
+        
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        
+        image_pattern = os.path.join(image_folder, "screenshot_*.jpg")
+        image_files = glob.glob(image_pattern)
+        
+        if not image_files:
+            logger.warning(f"이미지 파일이 없습니다: {image_pattern}")
+            return False
+        
+        try:
+            cmd = self.build_command(image_pattern, output_file)
+            logger.debug(f"FFmpeg 명령어: {' '.join(cmd)}")
+            
+            result = await run_streamed(
+                cmd,
+                timeout=timeout,
+                on_line=progress_logger(logger, f"비디오 {os.path.basename(output_file)}", r'frame=\s*(\d+)', len(image_files), 'stderr')
+            )
+            
+            if result['timed_out']:
+                logger.error(f"비디오 생성 시간 초과 ({timeout}s): {output_file}")
+                return False
+            if result['returncode'] != 0:
+                logger.error(f"비디오 생성 실패: {result['stderr_tail']}")
+                return False
+            
+            logger.info(f"비디오 생성 완료: {output_file}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"비디오 생성 중 오류 발생: {str(e)}")
+            return False
+    
+    def build_command(self, image_pattern, output_file):
+        """FFmpeg 명령어 구성"""
+        return [
+            "ffmpeg",
+            "-framerate", str(self.frame_rate),
+            "-pattern_type", "glob",
+            "-i", image_pattern,
+            "-c:v", "libx264",
+            "-pix_fmt", "yuv420p",
+            "-crf", "23",
+            "-y",  # 기존 파일 덮어쓰기
+            output_file
+        ]
@@ -178,3 +178,134 @@ class ExcelReporter:
         logger.info(f"샘플링 결과 추가 완료: {excel_file}")
         
         return excel_file
+
+    def add_filter_statistics(self, excel_file, statistics):
+        """필터 단계별 제외 수 및 소요 시간을 별도 시트에 추가"""
+        logger.info(f"엑셀 리포트에 필터 단계 통계 추가: {excel_file}")
+        
+        # 워크북 로드
+        wb = openpyxl.load_workbook(excel_file)
+        
+        # 새 시트 생성
+        ws = wb.create_sheet(title="Filter Statistics")
+        
+        # 헤더 설정
+        headers = [
+            "실행 순서",
+            "필터 단계",
+            "평가 수",
+            "제외 수",
+            "제외율 (%)",
+            "소요 시간 (s)"
+        ]
+        
+        for col_idx, header in enumerate(headers, 1):
+            cell = ws.cell(row=1, column=col_idx, value=header)
+            cell.font = Font(bold=True)
+            cell.alignment = Alignment(horizontal='center')
+            cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
+        
+        # 데이터 입력
+        for row_idx, row in enumerate(statistics.to_rows(), 2):
+            ws.cell(row=row_idx, column=1, value=row['order'])
+            ws.cell(row=row_idx, column=2, value=row['stage'])
+            ws.cell(row=row_idx, column=3, value=row['evaluated'])
+            ws.cell(row=row_idx, column=4, value=row['rejected'])
+            ws.cell(row=row_idx, column=5, value=round(row['rejection_rate'] * 100, 2))
+            ws.cell(row=row_idx, column=6, value=round(row['elapsed'], 4))
+        
+        # 열 너비 자동 조정
+        for col_idx in range(1, len(headers) + 1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = 20
+        
+        # 요약 정보 시트 업데이트 (총 Concrete Scenario 수, 필터링된 Test Case 수)
+        if 'Summary' in wb.sheetnames:
+            summary_ws = wb['Summary']
+            summary_ws['B3'] = statistics.total_scenarios
+            summary_ws['B4'] = statistics.selected_scenarios
+        
+        # 파일 저장
+        wb.save(excel_file)
+        logger.info(f"필터 단계 통계 추가 완료: {excel_file}")
+        
+        return excel_file
+
+    def add_sensitivity_results(self, excel_file, sensitivity_results):
+        """제어 모델 변형별 Test Case 수를 별도 시트에 추가"""
+        logger.info(f"엑셀 리포트에 민감도 분석 결과 추가: {excel_file}")
+        
+        # 워크북 로드
+        wb = openpyxl.load_workbook(excel_file)
+        
+        # 새 시트 생성
+        ws = wb.create_sheet(title="Sensitivity Analysis")
+        
+        # 헤더 설정 (변형 파라미터 + Test Case 수)
+        variants = sensitivity_results['variants']
+        parameter_keys = sorted({key for variant in variants for key in variant})
+        headers = ["No."] + parameter_keys + ["Test Case 수"]
+        
+        for col_idx, header in enumerate(headers, 1):
+            cell = ws.cell(row=1, column=col_idx, value=header)
+            cell.font = Font(bold=True)
+            cell.alignment = Alignment(horizontal='center')
+            cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
+        
+        # 데이터 입력
+        counts = sensitivity_results['counts'].tolist()
+        for row_idx, (variant, count) in enumerate(zip(variants, counts), 2):
+            ws.cell(row=row_idx, column=1, value=row_idx-1)  # No.
+            for col_idx, key in enumerate(parameter_keys, 2):
+                ws.cell(row=row_idx, column=col_idx, value=variant.get(key, '기본값'))
+            ws.cell(row=row_idx, column=len(headers), value=count)
+        
+        # 열 너비 자동 조정
+        for col_idx in range(1, len(headers) + 1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = 30
+        
+        # 파일 저장
+        wb.save(excel_file)
+        logger.info(f"민감도 분석 결과 추가 완료: {excel_file}")
+        
+        return excel_file
+    
+    def add_monte_carlo_estimates(self, excel_file, estimates):
+        """몬테카를로 판정 확률 추정 결과(estimate_failure_rates)를 별도 시트에 추가"""
+        logger.info(f"엑셀 리포트에 몬테카를로 추정 결과 추가: {excel_file}")
+        
+        # 워크북 로드
+        wb = openpyxl.load_workbook(excel_file)
+        
+        # 새 시트 생성
+        ws = wb.create_sheet(title="Monte Carlo Estimates")
+        
+        headers = ["판정", "추정 확률", "표준 오차"]
+        for col_idx, header in enumerate(headers, 1):
+            cell = ws.cell(row=1, column=col_idx, value=header)
+            cell.font = Font(bold=True)
+            cell.alignment = Alignment(horizontal='center')
+            cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
+        
+        # 데이터 입력
+        row_idx = 2
+        for outcome, estimate in estimates['estimates'].items():
+            ws.cell(row=row_idx, column=1, value=outcome)
+            ws.cell(row=row_idx, column=2, value=estimate['rate']).number_format = '0.0000%'
+            ws.cell(row=row_idx, column=3, value=estimate['standard_error']).number_format = '0.0000%'
+            row_idx += 1
+        
+        # 표본 정보
+        ws.cell(row=row_idx + 1, column=1, value="표본 수")
+        ws.cell(row=row_idx + 1, column=2, value=estimates['sample_count'])
+        ws.cell(row=row_idx + 2, column=1, value="유효 표본 수")
+        ws.cell(row=row_idx + 2, column=2, value=round(estimates['effective_sample_size'], 1))
+        
+        # 열 너비 자동 조정
+        for col_idx in range(1, len(headers) + 1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = 20
+        
+        # 파일 저장
+        wb.save(excel_file)
+        logger.info(f"몬테카를로 추정 결과 추가 완료: {excel_file}")
+        
+        return excel_file
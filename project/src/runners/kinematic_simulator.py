@@ -0,0 +1,158 @@
+'''
+배치 운동학 사전 시뮬레이터 (ESmini 대체용 고속 근사 시뮬레이션)
+'''
+
+import logging
+import numpy as np
+from ..utils.scenario_columns import ScenarioColumns
+
+logger = logging.getLogger('cutout_scenario.kinematic_simulator')
+
+# 기동 시작 시각 (CutOutScenarioGenerator.maneuvers의 트리거와 동일)
+LANE_CHANGE_START_TIME = 1.0  # s
+# LV2 감속 목표 속도 계산용 감속 지속 시간 (CutOutScenarioGenerator.maneuvers와 동일)
+LV2_DECELERATION_DURATION = 3.0  # s
+
+class KinematicSimulator:
+    """Ego/LV1/LV2 종·횡방향 운동을 NumPy로 다수 시나리오에 대해 동시에 적분하는 시뮬레이터
+
+    - Ego: 초기 속도 유지 (별도 제어기 없음, ESmini 기본 동작과 동일)
+      ego_model을 지정하면 LV2가 드러난 시점부터 해당 제어 모델의 반응 시간 후
+      빌드업 시간 동안 최대 감속도까지 선형 증가하는 제동 적용
+    - LV1: 시뮬레이션 시각 1.0s부터 t_clear 동안 사인파 형태의 차선 변경
+    - LV2: 차선 변경 완료 후 trigger_delay 경과 시점부터 dec_lv2로 감속
+    간격은 차량 중심 기준 종방향 거리에서 두 차량 길이의 절반을 뺀 값이다.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.time_step = config['simulation']['time_step']
+        self.duration = config['simulation']['duration']
+        self.lane_width = config['environment']['road_network']['lane_width']
+
+        vehicles = config['vehicles']
+        self.ego_dims = vehicles['ego_vehicle']['dimensions']
+        self.lv1_dims = vehicles['lead_vehicle_1']['dimensions']
+        self.lv2_dims = vehicles['lead_vehicle_2']['dimensions']
+
+    def simulate(self, columns, chunk_size=None, ego_model=None):
+        """시나리오별 최소 간격, 최소 TTC, 충돌 여부 및 충돌 시각 계산
+        
+        ego_model: None(제동 없음), 'human_model' 또는 'ads_model'
+        """
+        presimulation_config = self.config['simulation'].get('presimulation', {})
+        if chunk_size is None:
+            chunk_size = presimulation_config.get('chunk_size', 50000)
+        if ego_model is None:
+            ego_model = presimulation_config.get('ego_model')
+        self._ego_brake = self.config['control_models'][ego_model] if ego_model else None
+
+        total = ScenarioColumns.length(columns)
+        logger.info(f"운동학 사전 시뮬레이션 시작: {total}개 시나리오, dt={self.time_step}s, {self.duration}s")
+
+        results = [
+            self._simulate_chunk(ScenarioColumns.take(columns, slice(start, start + chunk_size)))
+            for start in range(0, total, chunk_size)
+        ]
+        results = ScenarioColumns.concatenate(results) or self._empty_result()
+
+        logger.info(f"운동학 사전 시뮬레이션 완료: 충돌 {int(results['sim_collision'].sum())}개 / {total}개")
+        return results
+
+    def _simulate_chunk(self, columns):
+        """한 청크의 시나리오를 시간 단계별로 적분"""
+        count = ScenarioColumns.length(columns)
+        dt = self.time_step
+        n_steps = int(round(self.duration / dt))
+
+        # 초기 상태 (m, m/s)
+        v_ego = np.asarray(columns['v_ego']) / 3.6
+        v_lv1 = np.asarray(columns['v_lv1']) / 3.6
+        v_lv2 = np.asarray(columns['v_lv2']) / 3.6
+        s_ego = np.zeros(count)
+        s_lv1 = np.asarray(columns['d_ego_lv1'], dtype=float).copy()
+        s_lv2 = s_lv1 + np.asarray(columns['d_lv1_lv2'])
+
+        # LV1 차선 변경 (사인파 형태, 완료 시간 t_clear)
+        t_clear = self.lane_width / np.asarray(columns['v_lv1_lat'])
+
+        # LV2 감속 (목표 속도까지 일정 감속도)
+        dec_lv2 = np.asarray(columns['dec_lv2'], dtype=float)
+        t_decel_start = LANE_CHANGE_START_TIME + t_clear + np.asarray(columns['lv2_deceleration_trigger_delay'])
+        v_lv2_target = np.where(dec_lv2 > 0, np.maximum(0, v_lv2 - dec_lv2 * LV2_DECELERATION_DURATION), v_lv2)
+
+        # 중심 간 거리 -> 범퍼 간 간격 보정 및 횡방향 겹침 기준
+        lv1_offset = (self.ego_dims['length'] + self.lv1_dims['length']) / 2
+        lv2_offset = (self.ego_dims['length'] + self.lv2_dims['length']) / 2
+        overlap_width = (self.ego_dims['width'] + self.lv1_dims['width']) / 2
+
+        # Ego 제동 시작 시각 (LV1이 Ego 차선을 벗어나 LV2가 드러난 시점 + 반응 시간)
+        if self._ego_brake is not None:
+            reveal_progress = np.arccos(np.clip(1 - 2 * overlap_width / self.lane_width, -1.0, 1.0)) / np.pi
+            t_brake_start = LANE_CHANGE_START_TIME + t_clear * reveal_progress + self._ego_brake['reaction_time']
+            buildup_time = self._ego_brake['deceleration_buildup_time']
+            max_decel = self._ego_brake['max_deceleration']
+
+        min_gap = np.full(count, np.inf)
+        min_ttc = np.full(count, np.inf)
+        collision_time = np.full(count, np.nan)
+
+        for step in range(n_steps + 1):
+            t = step * dt
+
+            # LV1 횡방향 위치 (Ego 차선 중심 기준 이동량)
+            progress = np.clip((t - LANE_CHANGE_START_TIME) / t_clear, 0.0, 1.0)
+            y_lv1 = self.lane_width * (1 - np.cos(np.pi * progress)) / 2
+            lv1_in_lane = y_lv1 < overlap_width
+
+            # 선행 차량별 간격 및 TTC (LV1은 Ego 차선과 겹치는 동안만 고려)
+            gap_lv1 = np.where(lv1_in_lane, s_lv1 - s_ego - lv1_offset, np.inf)
+            gap_lv2 = s_lv2 - s_ego - lv2_offset
+            ttc_lv1 = self._ttc(gap_lv1, v_ego - v_lv1)
+            ttc_lv2 = self._ttc(gap_lv2, v_ego - v_lv2)
+
+            # 충돌 이후의 값은 통계에서 제외
+            active = np.isnan(collision_time)
+            gap = np.minimum(gap_lv1, gap_lv2)
+            min_gap = np.where(active, np.minimum(min_gap, gap), min_gap)
+            min_ttc = np.where(active, np.minimum(min_ttc, np.minimum(ttc_lv1, ttc_lv2)), min_ttc)
+
+            # 최초 충돌 시각 기록 (모든 시나리오가 충돌하면 조기 종료)
+            collision_time[active & (gap <= 0)] = t
+            if not np.isnan(collision_time).any():
+                break
+
+            # LV2 감속 적용 후 반암시적 오일러 적분
+            decelerating = (dec_lv2 > 0) & (t >= t_decel_start) & (v_lv2 > v_lv2_target)
+            v_lv2 = np.where(decelerating, np.maximum(v_lv2 - dec_lv2 * dt, v_lv2_target), v_lv2)
+
+            if self._ego_brake is not None:
+                elapsed = t - t_brake_start
+                ramp = np.clip(elapsed / buildup_time, 0.0, 1.0) if buildup_time > 0 else (elapsed >= 0).astype(float)
+                ego_decel = np.where(elapsed >= 0, max_decel * ramp, 0.0)
+                v_ego = np.maximum(v_ego - ego_decel * dt, 0.0)
+
+            s_ego += v_ego * dt
+            s_lv1 += v_lv1 * dt
+            s_lv2 += v_lv2 * dt
+
+        return {
+            'sim_min_gap': min_gap,
+            'sim_min_ttc': min_ttc,
+            'sim_collision': ~np.isnan(collision_time),
+            'sim_collision_time': collision_time
+        }
+
+    def _ttc(self, gap, v_rel):
+        """간격과 접근 속도로 TTC 계산 (접근하지 않으면 inf, 충돌 이후는 0)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(v_rel > 0, np.maximum(gap, 0) / v_rel, np.inf)
+
+    def _empty_result(self):
+        """시나리오가 없을 때의 결과"""
+        return {
+            'sim_min_gap': np.array([]),
+            'sim_min_ttc': np.array([]),
+            'sim_collision': np.array([], dtype=bool),
+            'sim_collision_time': np.array([])
+        }
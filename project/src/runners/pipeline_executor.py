@@ -0,0 +1,112 @@
+'''
+시뮬레이션 -> 비디오 인코딩 파이프라인 실행기
+'''
+
+import os
+import asyncio
+import logging
+from .simulation_runner import SimulationRunner
+from ..processors.video_processor import VideoProcessor
+
+logger = logging.getLogger('cutout_scenario.pipeline_executor')
+
+class SimulationVideoPipeline:
+    """ESmini 시뮬레이션과 FFmpeg 인코딩을 단계별 워커로 겹쳐 실행하는 파이프라인
+
+    시뮬레이션 워커가 완료한 시나리오를 크기 제한 큐에 넣으면 인코딩 워커가 꺼내
+    비디오를 생성하므로, 시나리오 i의 인코딩과 시나리오 i+1의 시뮬레이션이 동시에 진행된다.
+    인코딩이 밀리면 큐가 차서 시뮬레이션이 대기하므로 임시 스크린샷 폴더 수가 제한된다.
+    """
+
+    def __init__(self, config, runner=None, video_processor=None):
+        self.config = config
+        self.runner = runner or SimulationRunner(config)
+        self.video_processor = video_processor or VideoProcessor(config)
+
+        pipeline_config = config['simulation'].get('pipeline', {})
+        batch_config = config['simulation']['esmini'].get('batch', {})
+        self.simulation_workers = pipeline_config.get('simulation_workers') or batch_config.get('concurrency') or 1
+        self.encode_workers = pipeline_config.get('encode_workers', 2)
+        self.queue_size = pipeline_config.get('queue_size', 4)
+        self.timeout = batch_config.get('timeout')
+        self.retries = batch_config.get('retries', 0)
+
+        if self.simulation_workers <= 0 or self.encode_workers <= 0:
+            raise ValueError(f"파이프라인 워커 수는 양수여야 합니다: 시뮬레이션 {self.simulation_workers}, 인코딩 {self.encode_workers}")
+        if self.queue_size <= 0:
+            raise ValueError(f"queue_size는 양수여야 합니다: {self.queue_size}")
+
+    def run(self, jobs, on_result=None):
+        """파이프라인 실행 (asyncio 이벤트 루프 생성)
+
+        jobs: (xosc_file, sim_output_dir, extra_args, video_file) 목록
+        on_result(position, result)는 시나리오별 최종 결과(시뮬레이션 실패 또는 인코딩 완료)마다 호출된다.
+        반환: jobs 순서대로 {'simulation': run_batch 결과 기록, 'video_file', 'video_success'} 목록
+        """
+        return asyncio.run(self.run_async(jobs, on_result))
+
+    async def run_async(self, jobs, on_result=None):
+        """run의 코루틴 버전"""
+        logger.info(
+            f"시뮬레이션-인코딩 파이프라인 시작: {len(jobs)}개, "
+            f"시뮬레이션 워커 {self.simulation_workers}개, 인코딩 워커 {self.encode_workers}개, 큐 {self.queue_size}개"
+        )
+        results = [
+            {'simulation': None, 'video_file': video_file, 'video_success': False}
+            for _, _, _, video_file in jobs
+        ]
+
+        simulation_queue = asyncio.Queue()
+        encode_queue = asyncio.Queue(maxsize=self.queue_size)
+        for position, job in enumerate(jobs):
+            simulation_queue.put_nowait((position, job))
+        for _ in range(self.simulation_workers):
+            simulation_queue.put_nowait(None)
+
+        async def simulation_worker():
+            while True:
+                item = await simulation_queue.get()
+                if item is None:
+                    return
+                position, (xosc_file, sim_output_dir, extra_args, video_file) = item
+                result = await self.runner.run_job_async(
+                    xosc_file, sim_output_dir, extra_args, timeout=self.timeout, retries=self.retries)
+                results[position]['simulation'] = result
+                if result['success']:
+                    await encode_queue.put((position, sim_output_dir, video_file))
+                else:
+                    logger.error(f"시뮬레이션 실패로 비디오 생성 건너뜀 ({os.path.basename(xosc_file)}): {result['error']}")
+                    notify(position)
+
+        async def encode_worker():
+            # 예외로 워커가 종료되면 큐가 차서 시뮬레이션 워커가 영원히 대기하므로 실패로 기록하고 계속 소비
+            while True:
+                item = await encode_queue.get()
+                if item is None:
+                    return
+                position, sim_output_dir, video_file = item
+                try:
+                    results[position]['video_success'] = await self.video_processor.create_video_async(
+                        sim_output_dir, video_file, timeout=self.timeout)
+                except Exception as e:
+                    logger.error(f"비디오 생성 중 오류 발생 ({os.path.basename(video_file)}): {e}")
+                    results[position]['video_success'] = False
+                notify(position)
+
+        def notify(position):
+            if on_result is None:
+                return
+            try:
+                on_result(position, results[position])
+            except Exception as e:
+                logger.error(f"파이프라인 결과 기록 중 오류 발생 (순번 {position}): {e}", exc_info=True)
+
+        encoders = [asyncio.create_task(encode_worker()) for _ in range(self.encode_workers)]
+        await asyncio.gather(*(simulation_worker() for _ in range(self.simulation_workers)))
+        for _ in range(self.encode_workers):
+            await encode_queue.put(None)
+        await asyncio.gather(*encoders)
+
+        videos = sum(result['video_success'] for result in results)
+        logger.info(f"시뮬레이션-인코딩 파이프라인 완료: 비디오 {videos}개 / {len(jobs)}개")
+        return results
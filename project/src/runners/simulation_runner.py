@@ -6,9 +6,17 @@ import os
 import subprocess
 import logging
 import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from ..utils.async_subprocess import run_streamed, progress_logger
 
 logger = logging.getLogger('cutout_scenario.runner')
 
+# 실행 결과에 기록하는 stderr 끝부분 길이
+STDERR_TAIL_LENGTH = 2000
+# ESmini 로그 줄 앞의 시뮬레이션 시각 (예: "  1.230: ..." 또는 "[1.230] ...")
+ESMINI_TIME_PATTERN = r'^\s*\[?(\d+\.\d+)\]?:?\s'
+
 class SimulationRunner:
     """ESmini 시뮬레이션 실행기"""
     
@@ -17,35 +25,188 @@ class SimulationRunner:
         self.esmini_path = config['simulation']['esmini']['executable_path']
         self.esmini_options = config['simulation']['esmini']['options']
         
-    def run_simulation(self, xosc_file, output_dir):
-        """ESmini 실행 및 결과 캡처"""
+    def run_simulation(self, xosc_file, output_dir, extra_args=None):
+        """ESmini 실행 및 결과 캡처 (extra_args: 파라미터 분포 순번 등 시나리오별 추가 인자)"""
         logger.info(f"ESmini 시뮬레이션 실행: {xosc_file}")
         
-        # 출력 디렉토리 생성
+        result = self._run_once(xosc_file, output_dir, extra_args)
+        
+        # 결과 확인
+        if result['success']:
+            logger.info(f"시뮬레이션 실행 완료: {os.path.basename(xosc_file)}")
+        elif result['returncode'] is not None:
+            logger.error(f"시뮬레이션 실행 실패: {result['stderr_tail']}")
+        else:
+            logger.error(f"시뮬레이션 실행 중 오류 발생: {result['error']}")
+        return result['success']
+    
+    def run_batch(self, jobs, concurrency=None, timeout=None, retries=None, on_result=None):
+        """여러 시나리오를 최대 concurrency개의 ESmini 프로세스로 동시에 실행
+        
+        jobs: (xosc_file, output_dir, extra_args) 목록
+        실패(0이 아닌 반환 코드, 시간 초과, 실행 오류)한 시나리오는 최대 retries회 다시 실행한다.
+        on_result(position, result)는 시나리오 실행이 끝날 때마다 호출된다 (스레드 방식은 워커 스레드에서 호출).
+        반환: jobs 순서대로 {'xosc_file', 'output_dir', 'success', 'returncode', 'duration',
+              'attempts', 'stderr_tail', 'error'} 목록
+        """
+        concurrency, timeout, retries = self._batch_settings(concurrency, timeout, retries)
+        backend = self.config['simulation']['esmini'].get('batch', {}).get('backend', 'thread')
+        if backend == 'asyncio':
+            return asyncio.run(self.run_batch_async(jobs, concurrency, timeout, retries, on_result))
+        if backend != 'thread':
+            raise ValueError(f"지원하지 않는 simulation.esmini.batch.backend 값: {backend}")
+        logger.info(f"ESmini 일괄 실행 시작: {len(jobs)}개, 동시 실행 {concurrency}개, 시간 제한 {timeout}s, 재시도 {retries}회")
+        
+        def run_job(position, job):
+            xosc_file, output_dir, extra_args = job
+            for attempt in range(1, retries + 2):
+                result = self._run_once(xosc_file, output_dir, extra_args, timeout)
+                result['attempts'] = attempt
+                if result['success']:
+                    break
+                logger.warning(f"시뮬레이션 실행 실패 ({os.path.basename(xosc_file)}, 시도 {attempt}/{retries + 1}): {result['error']}")
+            self._notify(on_result, position, result)
+            return result
+        
+        # 각 스레드는 ESmini 프로세스 종료를 기다리기만 하므로 스레드 풀로 충분함
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(run_job, range(len(jobs)), jobs))
+        
+        failures = sum(not result['success'] for result in results)
+        logger.info(f"ESmini 일괄 실행 완료: 성공 {len(results) - failures}개, 실패 {failures}개")
+        return results
+    
+    async def run_batch_async(self, jobs, concurrency=None, timeout=None, retries=None, on_result=None):
+        """run_batch의 asyncio 버전 (하나의 이벤트 루프에서 최대 concurrency개 프로세스 실행)"""
+        concurrency, timeout, retries = self._batch_settings(concurrency, timeout, retries)
+        logger.info(f"ESmini 비동기 일괄 실행 시작: {len(jobs)}개, 동시 실행 {concurrency}개, 시간 제한 {timeout}s, 재시도 {retries}회")
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run_job(position, job):
+            async with semaphore:
+                result = await self.run_job_async(*job, timeout=timeout, retries=retries)
+            self._notify(on_result, position, result)
+            return result
+        
+        results = await asyncio.gather(*(run_job(position, job) for position, job in enumerate(jobs)))
+        
+        failures = sum(not result['success'] for result in results)
+        logger.info(f"ESmini 비동기 일괄 실행 완료: 성공 {len(results) - failures}개, 실패 {failures}개")
+        return list(results)
+    
+    @staticmethod
+    def _notify(on_result, position, result):
+        """on_result 콜백 호출 (콜백 오류는 기록만 하고 일괄 실행은 계속)"""
+        if on_result is None:
+            return
+        try:
+            on_result(position, result)
+        except Exception as e:
+            logger.error(f"시뮬레이션 결과 기록 중 오류 발생 (순번 {position}): {e}", exc_info=True)
+    
+    async def run_job_async(self, xosc_file, output_dir, extra_args=None, timeout=None, retries=0):
+        """ESmini 비동기 실행 (실패 시 최대 retries회 재실행)"""
+        for attempt in range(1, retries + 2):
+            result = await self.run_simulation_async(xosc_file, output_dir, extra_args, timeout)
+            result['attempts'] = attempt
+            if result['success']:
+                break
+            logger.warning(f"시뮬레이션 실행 실패 ({os.path.basename(xosc_file)}, 시도 {attempt}/{retries + 1}): {result['error']}")
+        return result
+    
+    async def run_simulation_async(self, xosc_file, output_dir, extra_args=None, timeout=None):
+        """ESmini 비동기 1회 실행 (출력은 줄 단위로 로거에 기록, 진행률은 로그 시각 기준)"""
         os.makedirs(output_dir, exist_ok=True)
+        cmd = self.build_command(xosc_file, output_dir, extra_args)
+        name = os.path.basename(xosc_file)
+        
+        result = self._empty_result(xosc_file, output_dir)
+        try:
+            logger.debug(f"실행 명령어: {' '.join(cmd)}")
+            streamed = await run_streamed(
+                cmd,
+                timeout=timeout,
+                on_line=progress_logger(logger, f"시뮬레이션 {name}", ESMINI_TIME_PATTERN, self.config['simulation']['duration'])
+            )
+            result['duration'] = streamed['duration']
+            result['returncode'] = streamed['returncode']
+            result['stderr_tail'] = streamed['stderr_tail'][-STDERR_TAIL_LENGTH:]
+            result['success'] = streamed['returncode'] == 0
+            if streamed['timed_out']:
+                result['error'] = f"시간 초과 ({timeout}s)"
+            elif not result['success']:
+                result['error'] = f"반환 코드 {streamed['returncode']}"
+        except Exception as e:
+            result['error'] = str(e)
         
-        # 명령어 구성
+        return result
+    
+    def build_command(self, xosc_file, output_dir, extra_args=None):
+        """ESmini 명령어 구성"""
         cmd = [self.esmini_path, f"--osc={xosc_file}", f"--path={output_dir}"]
         
         # 옵션 추가
         for option in self.esmini_options:
             cmd.append(option)
+        cmd.extend(extra_args or [])
+        
+        return cmd
+    
+    def _run_once(self, xosc_file, output_dir, extra_args=None, timeout=None):
+        """ESmini 1회 실행 결과 기록 (시간 초과 시 프로세스 종료)"""
+        # 출력 디렉토리 생성
+        os.makedirs(output_dir, exist_ok=True)
+        cmd = self.build_command(xosc_file, output_dir, extra_args)
+        
+        result = self._empty_result(xosc_file, output_dir)
+        start_time = time.monotonic()
         
         try:
-            # 시뮬레이션 실행
+            # 시뮬레이션 실행 (stdout은 기록하지 않으므로 버퍼링 없이 버림)
             logger.debug(f"실행 명령어: {' '.join(cmd)}")
+            process = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
             
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            stdout, stderr = process.communicate()
-            
-            # 결과 확인
-            if process.returncode != 0:
-                logger.error(f"시뮬레이션 실행 실패: {stderr.decode('utf-8')}")
-                return False
-            
-            logger.info(f"시뮬레이션 실행 완료: {os.path.basename(xosc_file)}")
-            return True
-            
+            result['returncode'] = process.returncode
+            result['stderr_tail'] = process.stderr.decode('utf-8', errors='replace')[-STDERR_TAIL_LENGTH:]
+            result['success'] = process.returncode == 0
+            if not result['success']:
+                result['error'] = f"반환 코드 {process.returncode}"
+        
+        except subprocess.TimeoutExpired as e:
+            result['stderr_tail'] = (e.stderr or b'').decode('utf-8', errors='replace')[-STDERR_TAIL_LENGTH:]
+            result['error'] = f"시간 초과 ({timeout}s)"
         except Exception as e:
-            logger.error(f"시뮬레이션 실행 중 오류 발생: {str(e)}")
-            return False
+            result['error'] = str(e)
+        
+        result['duration'] = time.monotonic() - start_time
+        return result
+    
+    def _empty_result(self, xosc_file, output_dir):
+        """실행 전 결과 기록"""
+        return {
+            'xosc_file': xosc_file,
+            'output_dir': output_dir,
+            'success': False,
+            'returncode': None,
+            'duration': 0.0,
+            'attempts': 1,
+            'stderr_tail': '',
+            'error': None
+        }
+    
+    def _batch_settings(self, concurrency, timeout, retries):
+        """일괄 실행 설정 결정 (인자 > 설정 파일 > 기본값)"""
+        batch_config = self.config['simulation']['esmini'].get('batch', {})
+        
+        if concurrency is None:
+            concurrency = batch_config.get('concurrency') or 1
+        if timeout is None:
+            timeout = batch_config.get('timeout')
+        if retries is None:
+            retries = batch_config.get('retries', 0)
+        if concurrency <= 0:
+            raise ValueError(f"concurrency는 양수여야 합니다: {concurrency}")
+        if retries < 0:
+            raise ValueError(f"retries는 0 이상이어야 합니다: {retries}")
+        
+        return concurrency, timeout, retries
@@ -0,0 +1,95 @@
+'''
+asyncio 기반 외부 프로세스 실행 (출력 줄 단위 스트리밍)
+'''
+
+import re
+import time
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger('cutout_scenario.async_subprocess')
+
+# 출력 줄 구분 (FFmpeg 진행 상황은 \r로 갱신됨)
+_LINE_BREAK = re.compile(rb'\r\n|\r|\n')
+
+async def run_streamed(cmd, log=None, timeout=None, tail_lines=20, on_line=None, chunk_size=65536):
+    """외부 프로세스를 실행하고 stdout/stderr를 줄 단위로 로거에 스트리밍
+
+    출력 전체를 메모리에 모으지 않고 스트림별 마지막 tail_lines줄만 보관한다.
+    줄 구분 없이 chunk_size를 넘는 출력은 잘라서 한 줄로 처리한다.
+    on_line(stream_name, line)은 줄마다 호출되며 진행 상황 파싱에 사용한다.
+    시간 초과 시 프로세스를 종료한다.
+    반환: {'returncode', 'stdout_tail', 'stderr_tail', 'duration', 'timed_out'}
+    """
+    log = log or logger
+    tails = {'stdout': deque(maxlen=tail_lines), 'stderr': deque(maxlen=tail_lines)}
+    start_time = time.monotonic()
+
+    def emit(stream_name, raw):
+        line = raw.decode('utf-8', errors='replace').rstrip()
+        if not line:
+            return
+        tails[stream_name].append(line)
+        log.debug(f"[{stream_name}] {line}")
+        if on_line is not None:
+            on_line(stream_name, line)
+
+    async def pump(stream, stream_name):
+        pending = b''
+        while True:
+            chunk = await stream.read(chunk_size)
+            if not chunk:
+                break
+            lines = _LINE_BREAK.split(pending + chunk)
+            pending = lines.pop()
+            if len(pending) > chunk_size:
+                lines.append(pending)
+                pending = b''
+            for raw in lines:
+                emit(stream_name, raw)
+        emit(stream_name, pending)
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+
+    timed_out = False
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(pump(process.stdout, 'stdout'), pump(process.stderr, 'stderr'), process.wait()),
+            timeout
+        )
+    except asyncio.TimeoutError:
+        timed_out = True
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+    return {
+        'returncode': None if timed_out else process.returncode,
+        'stdout_tail': '\n'.join(tails['stdout']),
+        'stderr_tail': '\n'.join(tails['stderr']),
+        'duration': time.monotonic() - start_time,
+        'timed_out': timed_out
+    }
+
+def progress_logger(log, label, pattern, total, stream_name=None, step=10):
+    """정규식 첫 번째 그룹 값을 total 대비 진행률로 변환하여 step% 단위로 기록하는 on_line 콜백"""
+    regex = re.compile(pattern)
+    state = {'reported': -1}
+
+    def on_line(line_stream, line):
+        if stream_name is not None and line_stream != stream_name:
+            return
+        match = regex.search(line)
+        if not match or not total:
+            return
+        percent = min(100, int(float(match.group(1)) / total * 100))
+        bucket = percent // step * step
+        if bucket > state['reported']:
+            state['reported'] = bucket
+            log.info(f"{label} 진행률: {bucket}%")
+
+    return on_line
@@ -0,0 +1,177 @@
+'''
+논리 조건 표현식 컴파일러 (설정 파일 조건 문자열 -> 벡터화된 NumPy 조건자 및 스칼라 조건자)
+'''
+
+import ast
+import logging
+import operator
+import numpy as np
+
+logger = logging.getLogger('cutout_scenario.condition_compiler')
+
+# 설정 파일 변수명 -> 시나리오 컬럼명
+VARIABLE_ALIASES = {
+    'v_ego_long': 'v_ego',
+    'v_lv1_long': 'v_lv1',
+    'v_lv2_long': 'v_lv2',
+    'dec_lv2_long': 'dec_lv2'
+}
+
+_COMPARE_OPERATORS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne
+}
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv
+}
+
+_UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: np.logical_not
+}
+
+# 스칼라 조건자에서 NumPy 함수 대신 사용하는 연산자
+_SCALAR_UNARY_OPERATORS = {**_UNARY_OPERATORS, ast.Not: operator.not_}
+
+class CompiledCondition:
+    """컴파일된 조건자 (컬럼 dict -> 불리언 배열, 시나리오 dict -> bool)"""
+
+    def __init__(self, expression, evaluator, variables, scalar_evaluator=None):
+        self.expression = expression
+        self.variables = variables
+        self._evaluator = evaluator
+        self._scalar_evaluator = scalar_evaluator or evaluator
+
+    def __call__(self, columns):
+        """컬럼(또는 스칼라/브로드캐스팅 배열) dict에 대해 조건 평가"""
+        return self._evaluator(columns)
+
+    def evaluate_row(self, scenario):
+        """시나리오 하나(스칼라 값 dict)에 대해 조건 평가 (NumPy 호출 없이 파이썬 연산자로 단락 평가)"""
+        return bool(self._scalar_evaluator(scenario))
+
+    def __repr__(self):
+        return f"CompiledCondition({self.expression!r})"
+
+class ConditionCompiler:
+    """논리 조건 표현식 컴파일러 (ast 기반, eval 미사용)"""
+
+    @staticmethod
+    def compile(expression, allowed_variables=None):
+        """조건 문자열을 벡터화된 조건자(와 같은 식의 스칼라 조건자)로 컴파일"""
+        try:
+            tree = ast.parse(expression, mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"조건식 구문 오류: {expression} ({e.msg})") from e
+
+        variables = set()
+        evaluator = ConditionCompiler._compile_node(tree.body, expression, variables)
+        scalar_evaluator = ConditionCompiler._compile_node(tree.body, expression, set(), scalar=True)
+
+        if allowed_variables is not None:
+            unknown = variables - set(allowed_variables)
+            if unknown:
+                raise ValueError(f"알 수 없는 변수 {sorted(unknown)}: {expression}")
+
+        logger.debug(f"조건식 컴파일: {expression} (변수: {sorted(variables)})")
+        return CompiledCondition(expression, evaluator, frozenset(variables), scalar_evaluator)
+
+    @staticmethod
+    def compile_all(expressions, allowed_variables=None):
+        """조건 문자열 목록 컴파일"""
+        return [ConditionCompiler.compile(expression, allowed_variables) for expression in expressions or []]
+
+    @staticmethod
+    def evaluate_any(conditions, columns, shape=None):
+        """조건 중 하나라도 참인 위치의 불리언 배열 (조건이 없으면 모두 거짓)"""
+        result = np.zeros(shape if shape is not None else (), dtype=bool)
+        for condition in conditions:
+            result = result | condition(columns)
+        return result
+
+    @staticmethod
+    def any_row(conditions, scenario):
+        """조건 중 하나라도 참인지 여부 (시나리오 하나, 스칼라 조건자 사용)"""
+        return any(condition.evaluate_row(scenario) for condition in conditions)
+
+    @staticmethod
+    def _compile_node(node, expression, variables, scalar=False):
+        """AST 노드를 평가 함수로 변환 (scalar: NumPy 대신 파이썬 논리 연산 사용)"""
+        if isinstance(node, ast.BoolOp):
+            operands = [ConditionCompiler._compile_node(value, expression, variables, scalar) for value in node.values]
+            if scalar:
+                if isinstance(node.op, ast.And):
+                    return lambda row: all(operand(row) for operand in operands)
+                return lambda row: any(operand(row) for operand in operands)
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+
+            def evaluate_bool(columns):
+                result = operands[0](columns)
+                for operand in operands[1:]:
+                    result = combine(result, operand(columns))
+                return result
+            return evaluate_bool
+
+        if isinstance(node, ast.Compare):
+            # 연쇄 비교 (a < b <= c) -> (a < b) and (b <= c)
+            operands = [ConditionCompiler._compile_node(node.left, expression, variables, scalar)]
+            operands += [ConditionCompiler._compile_node(comparator, expression, variables, scalar) for comparator in node.comparators]
+            compare_ops = [ConditionCompiler._lookup(_COMPARE_OPERATORS, op, expression) for op in node.ops]
+
+            if scalar:
+                def evaluate_compare_row(row):
+                    left = operands[0](row)
+                    for compare_op, operand in zip(compare_ops, operands[1:]):
+                        right = operand(row)
+                        if not compare_op(left, right):
+                            return False
+                        left = right
+                    return True
+                return evaluate_compare_row
+
+            def evaluate_compare(columns):
+                values = [operand(columns) for operand in operands]
+                result = compare_ops[0](values[0], values[1])
+                for i, compare_op in enumerate(compare_ops[1:], 1):
+                    result = np.logical_and(result, compare_op(values[i], values[i + 1]))
+                return result
+            return evaluate_compare
+
+        if isinstance(node, ast.BinOp):
+            left = ConditionCompiler._compile_node(node.left, expression, variables, scalar)
+            right = ConditionCompiler._compile_node(node.right, expression, variables, scalar)
+            binary_op = ConditionCompiler._lookup(_BINARY_OPERATORS, node.op, expression)
+            return lambda columns: binary_op(left(columns), right(columns))
+
+        if isinstance(node, ast.UnaryOp):
+            operand = ConditionCompiler._compile_node(node.operand, expression, variables, scalar)
+            unary_op = ConditionCompiler._lookup(_SCALAR_UNARY_OPERATORS if scalar else _UNARY_OPERATORS, node.op, expression)
+            return lambda columns: unary_op(operand(columns))
+
+        if isinstance(node, ast.Name):
+            name = VARIABLE_ALIASES.get(node.id, node.id)
+            variables.add(name)
+            return lambda columns: columns[name]
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, (bool, int, float)):
+            value = node.value
+            return lambda columns: value
+
+        raise ValueError(f"지원하지 않는 표현식 요소 '{type(node).__name__}': {expression}")
+
+    @staticmethod
+    def _lookup(table, op, expression):
+        """연산자 노드에 대응하는 함수 조회"""
+        function = table.get(type(op))
+        if function is None:
+            raise ValueError(f"지원하지 않는 연산자 '{type(op).__name__}': {expression}")
+        return function
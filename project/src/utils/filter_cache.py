@@ -0,0 +1,75 @@
+'''
+파라미터 독립 필터링 중간 결과 캐시
+'''
+
+import os
+import json
+import hashlib
+import logging
+import numpy as np
+
+logger = logging.getLogger('cutout_scenario.filter_cache')
+
+# 캐시 파일 형식 버전 (중간 컬럼 구성이 바뀌면 증가)
+CACHE_FORMAT_VERSION = 1
+
+class FilterCache:
+    """제어 모델과 무관한 필터링 중간 컬럼(조기 충돌/간격/논리 조건 통과 행, ttc_reveal) 캐시
+
+    캐시 키는 중간 결과에 영향을 주는 설정 섹션(차량, 도로, 안전 거리, 논리 조건)의
+    해시이므로 control_models 또는 evaluation_criteria만 바뀐 경우 그대로 재사용된다.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def cache_key(config):
+        """중간 결과에 영향을 주는 설정 섹션의 해시"""
+        relevant = {
+            'version': CACHE_FORMAT_VERSION,
+            'vehicles': config['vehicles'],
+            'road_network': config['environment']['road_network'],
+            'safety_parameters': config['filtering']['safety_parameters'],
+            'logical_conditions': config['filtering'].get('logical_conditions', {})
+        }
+        encoded = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def load(self, key):
+        """캐시된 중간 컬럼 및 통계 로드 (없으면 None)"""
+        columns_file, statistics_file = self._paths(key)
+        if not (os.path.exists(columns_file) and os.path.exists(statistics_file)):
+            logger.info(f"필터링 캐시 없음: {key[:12]}")
+            return None
+
+        with np.load(columns_file) as data:
+            columns = {name: data[name] for name in data.files}
+        with open(statistics_file, 'r', encoding='utf-8') as f:
+            statistics = json.load(f)
+
+        logger.info(f"필터링 캐시 사용: {key[:12]} ({len(next(iter(columns.values()), []))}개 행)")
+        return columns, statistics
+
+    def save(self, key, columns, statistics):
+        """중간 컬럼 및 통계 저장 (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        columns_file, statistics_file = self._paths(key)
+
+        temp_file = columns_file + '.tmp'
+        with open(temp_file, 'wb') as f:
+            np.savez(f, **columns)
+        os.replace(temp_file, columns_file)
+
+        with open(statistics_file, 'w', encoding='utf-8') as f:
+            json.dump(statistics, f, ensure_ascii=False, indent=2)
+
+        logger.info(f"필터링 캐시 저장: {columns_file}")
+        return columns_file
+
+    def _paths(self, key):
+        """캐시 키에 해당하는 컬럼/통계 파일 경로"""
+        return (
+            os.path.join(self.cache_dir, f"prefilter_{key}.npz"),
+            os.path.join(self.cache_dir, f"prefilter_{key}.json")
+        )
@@ -0,0 +1,182 @@
+'''
+재개 가능한 실행을 위한 실행 매니페스트 (단계별/시나리오별 완료 상태 기록)
+'''
+
+import os
+import json
+import hashlib
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger('cutout_scenario.run_manifest')
+
+# 매니페스트 형식 버전 (기록 구조가 바뀌면 증가)
+MANIFEST_VERSION = 1
+
+MANIFEST_FILE = 'run_manifest.json'
+# 마지막 저장 이후의 시나리오 단계 기록 (한 줄에 기록 하나, 로드 시 매니페스트에 순서대로 적용)
+JOURNAL_FILE = 'run_manifest.log'
+
+# 분석 단계(생성~샘플링) 결과에 영향을 주지 않는 실행 관련 설정 (simulation 하위)
+_EXECUTION_SECTIONS = ('esmini', 'pipeline', 'conversion')
+
+class RunManifest:
+    """출력 디렉토리의 run_manifest.json에 분석 단계와 시나리오별 단계(xosc, simulation, video) 완료 상태 기록
+
+    각 기록에는 입력 해시와 생성 파일의 내용 해시가 포함되며, --resume 실행 시 입력 해시가
+    같고 파일 내용이 기록과 일치하는 단계만 완료된 것으로 본다. 시나리오 단계 기록은
+    run_manifest.log에 한 줄씩 추가하므로 기록 비용이 시나리오 수와 무관하며, save()가
+    전체 매니페스트를 임시 파일에 쓴 뒤 교체하고 로그를 비운다.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.manifest_file = os.path.join(output_dir, MANIFEST_FILE)
+        self.journal_file = os.path.join(output_dir, JOURNAL_FILE)
+        self.data = self._empty()
+        self._lock = threading.Lock()  # 스레드 풀 실행 결과 기록용
+
+    def load(self):
+        """기존 매니페스트와 기록 로그 로드 (없거나 형식 버전이 다르면 빈 매니페스트)"""
+        if not os.path.exists(self.manifest_file):
+            logger.info(f"실행 매니페스트 없음, 처음부터 실행: {self.manifest_file}")
+            return self
+
+        with open(self.manifest_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != MANIFEST_VERSION:
+            logger.warning(f"실행 매니페스트 형식 버전이 달라 사용하지 않습니다: {data.get('version')}")
+            return self
+
+        self.data = data
+        self._replay_journal()
+        logger.info(f"실행 매니페스트 로드: 시나리오 {len(data['scenarios'])}개 기록")
+        return self
+
+    def reset(self):
+        """빈 매니페스트로 초기화하여 저장"""
+        self.data = self._empty()
+        self.save()
+        return self
+
+    def save(self):
+        """매니페스트 저장 (임시 파일에 쓰고 디스크에 반영한 뒤 교체) 및 기록 로그 비우기"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        temp_file = self.manifest_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2, default=_encode_value)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.manifest_file)
+        # 교체 후 중단되어 로그가 남아도 같은 기록을 다시 적용할 뿐이므로 안전
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+
+    @staticmethod
+    def analysis_key(config):
+        """분석 단계 결과에 영향을 주는 설정의 해시 (변환/시뮬레이션 실행 설정 제외)"""
+        simulation = {key: value for key, value in config['simulation'].items() if key not in _EXECUTION_SECTIONS}
+        return RunManifest.content_hash(dict(config, simulation=simulation))
+
+    @staticmethod
+    def content_hash(*parts):
+        """JSON 직렬화 가능한 값들의 sha256"""
+        encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=_encode_value)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def file_hash(path):
+        """파일 내용의 sha256 (파일이 없으면 None)"""
+        if not path or not os.path.isfile(path):
+            return None
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def load_analysis(self, key):
+        """분석 단계 결과 (필터링/샘플링된 Test Case, 필터링된 Test Case 수) 로드 (설정이 바뀌었거나 파일이 다르면 None)"""
+        analysis = self.data.get('analysis')
+        if not analysis or analysis.get('key') != key:
+            return None
+        for stage_file in ('filtered_file', 'sampled_file'):
+            if self.file_hash(analysis[stage_file]) != analysis[stage_file.replace('_file', '_hash')]:
+                logger.warning(f"분석 단계 결과 파일이 기록과 달라 다시 실행합니다: {analysis[stage_file]}")
+                return None
+
+        with open(analysis['filtered_file'], 'r', encoding='utf-8') as f:
+            filtered_scenarios = json.load(f)
+        with open(analysis['sampled_file'], 'r', encoding='utf-8') as f:
+            sampled_scenarios = json.load(f)
+        return filtered_scenarios, sampled_scenarios, analysis.get('filtered_count', len(filtered_scenarios))
+
+    def save_analysis(self, key, filtered_scenarios, sampled_scenarios, filtered_count=None):
+        """분석 단계 결과 저장 및 기록 (분석이 다시 실행되면 시나리오별 기록은 초기화)
+
+        filtered_count: 필터링된 Test Case 수 (스트리밍 모드는 filtered_scenarios가 후보만 포함하므로 별도 기록)
+        """
+        if filtered_count is None:
+            filtered_count = len(filtered_scenarios)
+        analysis = {'key': key, 'filtered_count': filtered_count}
+        for stage, scenarios in (('filtered', filtered_scenarios), ('sampled', sampled_scenarios)):
+            stage_file = os.path.join(self.output_dir, 'reports', f"{stage}_scenarios.json")
+            os.makedirs(os.path.dirname(stage_file), exist_ok=True)
+            with open(stage_file, 'w', encoding='utf-8') as f:
+                json.dump(scenarios, f, ensure_ascii=False, default=_encode_value)
+            analysis[f"{stage}_file"] = stage_file
+            analysis[f"{stage}_hash"] = self.file_hash(stage_file)
+
+        with self._lock:
+            self.data['analysis'] = analysis
+            self.data['scenarios'] = {}
+            self.save()
+
+    def record(self, scenario_id, stage, **fields):
+        """시나리오 단계 결과 기록 (completed, 입력 해시, 생성 파일 및 내용 해시 등, 기록 로그에 한 줄 추가)"""
+        line = json.dumps({'scenario_id': scenario_id, 'stage': stage, 'fields': fields}, ensure_ascii=False, default=_encode_value)
+        with self._lock:
+            self.data['scenarios'].setdefault(scenario_id, {})[stage] = json.loads(line)['fields']
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def entry(self, scenario_id, stage):
+        """시나리오 단계 기록 (없으면 None)"""
+        return self.data['scenarios'].get(scenario_id, {}).get(stage)
+
+    def is_fresh(self, scenario_id, stage, **expected):
+        """완료 기록이 있고 기대 입력 해시와 생성 파일 내용이 기록과 일치하는지 여부"""
+        entry = self.entry(scenario_id, stage)
+        if not entry or not entry.get('completed'):
+            return False
+        if any(entry.get(key) != value for key, value in expected.items()):
+            return False
+        if entry.get('file') and self.file_hash(entry['file']) != entry.get('file_hash'):
+            return False
+        return True
+
+    def _replay_journal(self):
+        """마지막 저장 이후의 기록 로그 적용 (중단으로 잘린 마지막 줄은 무시)"""
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"실행 매니페스트 기록 로그의 잘린 줄을 무시합니다: {self.journal_file}")
+                    continue
+                self.data['scenarios'].setdefault(item['scenario_id'], {})[item['stage']] = item['fields']
+
+    def _empty(self):
+        """빈 매니페스트"""
+        return {'version': MANIFEST_VERSION, 'analysis': None, 'scenarios': {}}
+
+def _encode_value(value):
+    """NumPy 스칼라 등 JSON 기본 형식이 아닌 값 직렬화"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
@@ -5,6 +5,7 @@
 import logging
 import numpy as np
 from collections import defaultdict
+from .scenario_columns import ScenarioColumns
 
 logger = logging.getLogger('cutout_scenario.sampling')
 
@@ -87,3 +88,240 @@ class StratifiedSampler:
         
         logger.info(f"최종 샘플링된 시나리오 수: {len(sampled_scenarios)}")
         return sampled_scenarios
+
+    @staticmethod
+    def sample_columns(columns, target_count, groupby_key, priority_key):
+        """sample_test_cases의 컬럼 버전 (NumPy 벡터 연산, 그룹별 부분 선택)
+        
+        최대 잉여(largest remainder) 방식으로 비례 할당하고, 그룹마다 우선순위 값이
+        작은 행부터 선택한다 (같은 값이면 앞선 행 우선, 우선순위 컬럼이 없으면 행 순서).
+        multiplicity 컬럼(동치 압축 결과)이 있으면 그룹 크기는 압축 전 시나리오 수이며,
+        할당량은 그룹의 대표 시나리오 수를 넘지 않는다.
+        결과는 그룹 첫 등장 순서, 그룹 내 우선순위 순서로 정렬된다.
+        """
+        logger.info(f"비례 층화 샘플링 시작: 대상 {target_count}개")
+        
+        total = ScenarioColumns.length(columns)
+        if total == 0:
+            logger.warning("샘플링할 시나리오가 없습니다.")
+            return ScenarioColumns.take(columns, slice(0, 0))
+        
+        group_values, first_rows, group_rows = StratifiedSampler._group_rows(columns, groupby_key)
+        row_counts = np.array([len(rows) for rows in group_rows], dtype=np.int64)
+        group_sizes = row_counts
+        if 'multiplicity' in columns:
+            # 압축 전 시나리오 수 기준 비례 할당
+            multiplicity = np.asarray(columns['multiplicity'], dtype=np.int64)
+            group_sizes = np.array([multiplicity[rows].sum() for rows in group_rows], dtype=np.int64)
+        logger.info(f"총 {len(group_values)}개 그룹으로 분류됨")
+        
+        allocations = np.minimum(StratifiedSampler.allocate_proportional(group_sizes, target_count), row_counts)
+        for value, allocation, size in zip(group_values, allocations.tolist(), group_sizes.tolist()):
+            logger.debug(f"그룹 {value}: {allocation}개 샘플링 (전체 {size}개 중)")
+        
+        priority = StratifiedSampler._priority_values(columns, priority_key)
+        
+        selected = [np.zeros(0, dtype=np.int64)]
+        for group in np.argsort(first_rows).tolist():
+            if allocations[group] == 0:
+                continue
+            rows = group_rows[group]
+            selected.append(StratifiedSampler._lowest_priority_rows(rows, priority[rows], allocations[group]))
+        
+        sampled = ScenarioColumns.take(columns, np.concatenate(selected))
+        logger.info(f"최종 샘플링된 시나리오 수: {ScenarioColumns.length(sampled)}")
+        return sampled
+
+    @staticmethod
+    def bin_column(values, edges):
+        """연속 값을 구간 하한값으로 변환 (첫 구간 미만은 첫 구간, 마지막 구간 이상은 마지막 구간)"""
+        edges = np.sort(np.asarray(edges, dtype=float))
+        bins = np.clip(np.digitize(np.asarray(values, dtype=float), edges) - 1, 0, len(edges) - 1)
+        return edges[bins]
+        
+    @staticmethod
+    def allocate_proportional(group_sizes, target_count):
+        """최대 잉여 방식 비례 할당 (합계 = min(target_count, 전체 크기), 그룹 크기 이하)"""
+        group_sizes = np.asarray(group_sizes, dtype=np.int64)
+        total = int(group_sizes.sum())
+        target_count = min(target_count, total)
+        if total == 0 or target_count <= 0:
+            return np.zeros(len(group_sizes), dtype=np.int64)
+        
+        # 몫의 정수부를 먼저 할당하고, 남은 개수는 소수부가 큰 그룹부터 1개씩
+        quotas = group_sizes * (target_count / total)
+        allocations = np.minimum(np.floor(quotas).astype(np.int64), group_sizes)
+        remainder = target_count - int(allocations.sum())
+        
+        fractions = np.where(allocations < group_sizes, quotas - allocations, -np.inf)
+        allocations[np.argsort(-fractions, kind='stable')[:remainder]] += 1
+        return allocations
+
+    @staticmethod
+    def _group_rows(columns, groupby_key):
+        """그룹 값 목록(정렬 순), 그룹별 첫 행 번호, 그룹별 행 번호 배열 (groupby_key가 목록이면 결합 층)"""
+        if isinstance(groupby_key, (list, tuple)):
+            group_columns = np.column_stack([columns[key] for key in groupby_key])
+            group_values, first_rows, codes = np.unique(group_columns, axis=0, return_index=True, return_inverse=True)
+            group_values = [tuple(value) for value in group_values.tolist()]
+        else:
+            group_values, first_rows, codes = np.unique(columns[groupby_key], return_index=True, return_inverse=True)
+            group_values = group_values.tolist()
+        codes = codes.ravel()
+        
+        # 그룹별 행 번호 (그룹 내에서는 원래 순서)
+        rows_by_group = np.argsort(codes, kind='stable')
+        group_ends = np.cumsum(np.bincount(codes, minlength=len(group_values)))
+        return group_values, first_rows, np.split(rows_by_group, group_ends[:-1])
+
+    @staticmethod
+    def _priority_values(columns, priority_key):
+        """우선순위 값 배열 (NaN은 가장 낮은 우선순위, 컬럼이 없으면 모두 같은 값)"""
+        if priority_key not in columns:
+            return np.zeros(ScenarioColumns.length(columns))
+        priority = np.asarray(columns[priority_key], dtype=float)
+        return np.where(np.isnan(priority), np.inf, priority)
+
+    @staticmethod
+    def _lowest_priority_rows(rows, priority, count):
+        """우선순위 값이 작은 count개 행 선택 (O(n) 부분 선택, 같은 값은 앞선 행 우선)"""
+        if count < len(rows):
+            kth = np.partition(priority, count - 1)[count - 1]
+            below = np.flatnonzero(priority < kth)
+            ties = np.flatnonzero(priority == kth)[:count - len(below)]
+            chosen = np.concatenate([below, ties])
+        else:
+            chosen = np.arange(len(rows))
+        
+        # 선택된 행만 (우선순위, 행 순서)로 정렬
+        chosen = chosen[np.lexsort((chosen, priority[chosen]))]
+        return rows[chosen]
+
+class StreamingStratifiedSampler:
+    """블록 단위로 입력되는 시나리오 컬럼에 대한 단일 패스 비례 층화 샘플링
+    
+    그룹별로 우선순위 값이 작은 target_count개 행만 (우선순위, 입력 순서)로 정렬해 유지하므로
+    메모리 사용량은 (그룹 수 x target_count)로 제한된다. finalize 결과는 모든 블록을 이어 붙여
+    StratifiedSampler.sample_columns를 적용한 결과와 같다.
+    """
+    
+    def __init__(self, target_count, groupby_key, priority_key):
+        self.target_count = target_count
+        self.groupby_key = groupby_key
+        self.priority_key = priority_key
+        self.total = 0
+        self._schema = None
+        self._groups = {}  # 그룹 값 -> {'first_row', 'count', 'columns', 'priority'}
+        
+    def update(self, columns):
+        """시나리오 블록 반영 (그룹별 상위 target_count개 행만 유지)"""
+        count = ScenarioColumns.length(columns)
+        if self._schema is None and columns:
+            self._schema = ScenarioColumns.take(columns, slice(0, 0))
+        if count == 0:
+            return
+        
+        group_values, first_rows, group_rows = StratifiedSampler._group_rows(columns, self.groupby_key)
+        priority = StratifiedSampler._priority_values(columns, self.priority_key)
+        
+        for group in np.argsort(first_rows).tolist():
+            rows = group_rows[group]
+            state = self._groups.get(group_values[group])
+            if state is None:
+                state = self._groups[group_values[group]] = {
+                    'first_row': self.total + int(first_rows[group]),
+                    'count': 0,
+                    'columns': ScenarioColumns.take(columns, slice(0, 0)),
+                    'priority': np.zeros(0)
+                }
+            
+            # 유지 중인 행은 새 블록 행보다 입력 순서가 앞서므로 위치 순서 = 입력 순서 (같은 우선순위 내)
+            merged_columns = ScenarioColumns.concatenate([state['columns'], ScenarioColumns.take(columns, rows)])
+            merged_priority = np.concatenate([state['priority'], priority[rows]])
+            keep = StratifiedSampler._lowest_priority_rows(
+                np.arange(len(merged_priority)), merged_priority, self.target_count)
+            
+            state['count'] += len(rows)
+            state['columns'] = ScenarioColumns.take(merged_columns, keep)
+            state['priority'] = merged_priority[keep]
+        
+        self.total += count
+        
+    def finalize(self):
+        """전체 그룹 크기로 비례 할당 후 그룹별 상위 행 선택"""
+        logger.info(f"스트리밍 비례 층화 샘플링: 입력 {self.total}개, 대상 {self.target_count}개")
+        if not self._groups:
+            logger.warning("샘플링할 시나리오가 없습니다.")
+            return dict(self._schema or {})
+        
+        # 할당 순서는 sample_columns와 같이 그룹 값 정렬 순
+        group_values = sorted(self._groups)
+        allocations = StratifiedSampler.allocate_proportional(
+            [self._groups[value]['count'] for value in group_values], self.target_count)
+        allocation_by_value = dict(zip(group_values, allocations.tolist()))
+        logger.info(f"총 {len(group_values)}개 그룹으로 분류됨")
+        
+        sampled = [
+            ScenarioColumns.take(state['columns'], slice(0, allocation_by_value[value]))
+            for value, state in sorted(self._groups.items(), key=lambda item: item[1]['first_row'])
+        ]
+        sampled = ScenarioColumns.concatenate(sampled)
+        logger.info(f"최종 샘플링된 시나리오 수: {ScenarioColumns.length(sampled)}")
+        return sampled
+        
+    def candidates(self):
+        """현재 유지 중인 후보 행 (그룹 첫 등장 순서, 그룹 내 우선순위 순서)"""
+        states = sorted(self._groups.values(), key=lambda state: state['first_row'])
+        return ScenarioColumns.concatenate([state['columns'] for state in states]) or dict(self._schema or {})
+
+class CoverageSampler:
+    """파라미터 공간 커버리지 최대화 샘플링 유틸리티 (최원점 maximin 선택)"""
+    
+    @staticmethod
+    def sample_columns(columns, target_count, keys, priority_key=None):
+        """여러 파라미터 축에 걸쳐 서로 가장 멀리 떨어진 시나리오를 탐욕적으로 선택
+        
+        각 축은 후보 집합의 최소~최대 범위로 정규화하며, 첫 시나리오는 우선순위 값이
+        가장 작은 행이다. 이후에는 이미 선택된 시나리오까지의 최소 거리가 가장 큰 행을
+        추가한다 (같은 거리이면 앞선 행). 반복마다 후보 전체에 대해 O(n) 연산만 수행하므로
+        목표 개수가 작으면 후보가 10^6개 이상이어도 트리 구조 없이 처리할 수 있다.
+        """
+        logger.info(f"커버리지 샘플링 시작: 대상 {target_count}개, 축 {', '.join(keys)}")
+        
+        total = ScenarioColumns.length(columns)
+        target_count = min(target_count, total)
+        if target_count <= 0:
+            logger.warning("샘플링할 시나리오가 없습니다.")
+            return ScenarioColumns.take(columns, slice(0, 0))
+        
+        points = CoverageSampler._normalized_points(columns, keys)
+        
+        # 첫 시나리오: 우선순위 값이 가장 작은 행 (없으면 첫 행)
+        if priority_key in columns:
+            priority = np.asarray(columns[priority_key], dtype=float)
+            first = int(np.argmin(np.where(np.isnan(priority), np.inf, priority)))
+        else:
+            first = 0
+        
+        # 선택된 행은 최소 거리를 -inf로 두어 다시 선택되지 않게 함 (같은 좌표의 행이 많아도 중복 없음)
+        selected = [first]
+        min_distance = np.sum((points - points[first]) ** 2, axis=1)
+        min_distance[first] = -np.inf
+        for _ in range(target_count - 1):
+            next_row = int(np.argmax(min_distance))
+            selected.append(next_row)
+            np.minimum(min_distance, np.sum((points - points[next_row]) ** 2, axis=1), out=min_distance)
+            min_distance[next_row] = -np.inf
+        
+        # 최종 maximin 거리 (선택되지 않은 후보까지의 최대 최소 거리)
+        coverage_radius = float(np.sqrt(max(min_distance.max(), 0.0)))
+        logger.info(f"최종 샘플링된 시나리오 수: {len(selected)} (정규화 커버리지 반경 {coverage_radius:.3f})")
+        return ScenarioColumns.take(columns, np.array(selected))
+        
+    @staticmethod
+    def _normalized_points(columns, keys):
+        """축별 최소~최대 범위를 [0, 1]로 정규화한 (후보 수 x 축 수) 좌표 (범위가 0인 축은 0)"""
+        points = np.column_stack([np.asarray(columns[key], dtype=float) for key in keys])
+        low = points.min(axis=0)
+        span = points.max(axis=0) - low
+        return (points - low) / np.where(span > 0, span, 1.0)
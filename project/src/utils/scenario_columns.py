@@ -0,0 +1,52 @@
+'''
+컬럼 기반(columnar) 시나리오 집합 유틸리티
+'''
+
+import logging
+import numpy as np
+
+logger = logging.getLogger('cutout_scenario.scenario_columns')
+
+class ScenarioColumns:
+    """컬럼 기반 시나리오 집합 유틸리티 (키 -> NumPy 배열 dict)"""
+
+    @staticmethod
+    def length(columns):
+        """컬럼 집합의 행(시나리오) 수"""
+        for values in columns.values():
+            return len(values)
+        return 0
+
+    @staticmethod
+    def take(columns, index):
+        """불리언 마스크 또는 인덱스 배열로 행 선택"""
+        return {key: values[index] for key, values in columns.items()}
+
+    @staticmethod
+    def concatenate(column_sets):
+        """여러 컬럼 집합을 순서대로 연결"""
+        column_sets = [columns for columns in column_sets if columns]
+        if not column_sets:
+            return {}
+
+        keys = list(column_sets[0].keys())
+        return {key: np.concatenate([columns[key] for columns in column_sets]) for key in keys}
+
+    @staticmethod
+    def from_scenarios(scenarios):
+        """시나리오 dict 목록을 컬럼 집합으로 변환"""
+        if not scenarios:
+            return {}
+
+        keys = list(scenarios[0].keys())
+        return {key: np.array([scenario[key] for scenario in scenarios]) for key in keys}
+
+    @staticmethod
+    def to_scenarios(columns):
+        """컬럼 집합을 시나리오 dict 목록으로 변환"""
+        if not columns:
+            return []
+
+        keys = list(columns.keys())
+        rows = zip(*(columns[key].tolist() for key in keys))
+        return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,112 @@
+'''
+내용 주소 기반 OpenSCENARIO 파일 캐시
+'''
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import numpy as np
+import scenariogeneration as sg
+
+logger = logging.getLogger('cutout_scenario.xosc_cache')
+
+# 캐시 파일 형식 버전 (XOSC 생성 방식이 바뀌면 증가)
+CACHE_FORMAT_VERSION = 2
+
+# 변환 결과 파일명 -> 캐시 키 기록 파일
+MANIFEST_FILE = 'manifest.json'
+
+class XoscCache:
+    """시나리오 파라미터와 XOSC 생성 관련 설정 섹션의 해시로 생성된 XOSC 파일을 재사용하는 캐시
+
+    캐시 파일은 <해시>.xosc로 저장되며, 재사용 시 출력 경로에 하드 링크
+    (다른 파일 시스템이면 복사)로 연결한다. 출력 파일은 쓰기 전에 항상 링크를 끊으므로
+    재변환이 캐시 파일을 덮어쓰지 않는다.
+    """
+
+    def __init__(self, cache_dir, link_mode='hardlink'):
+        if link_mode not in ('hardlink', 'copy'):
+            raise ValueError(f"지원하지 않는 link_mode 값: {link_mode}")
+        self.cache_dir = cache_dir
+        self.link_mode = link_mode
+
+    @staticmethod
+    def cache_key(xosc_values, config):
+        """시나리오별 XOSC 값(scenario_xosc_values)과 차량/도로/제어 모델 설정의 해시
+
+        필터링/샘플링 결과 컬럼(ttc, multiplicity 등)은 XOSC 내용과 무관하므로
+        Test Case 원본 대신 XOSC에 기록되는 값을 해시한다.
+        """
+        relevant = {
+            'version': CACHE_FORMAT_VERSION,
+            'scenariogeneration': getattr(sg, '__version__', None),
+            'scenario': xosc_values,
+            'vehicles': config['vehicles'],
+            'environment': config['environment'],
+            'control_models': config['control_models']
+        }
+        encoded = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=XoscCache._encode_value)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def fetch(self, key, output_file):
+        """캐시된 파일을 출력 경로에 연결 (없으면 False)"""
+        cached_file = self._path(key)
+        if not os.path.exists(cached_file):
+            return False
+
+        self.release(output_file)
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        self._link(cached_file, output_file)
+        logger.debug(f"XOSC 캐시 사용: {key[:12]} -> {output_file}")
+        return True
+
+    def store(self, key, output_file):
+        """변환된 파일을 캐시에 추가 (임시 파일에 연결한 뒤 교체하므로 동시 저장에 안전)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cached_file = self._path(key)
+        temp_file = f"{cached_file}.{os.getpid()}.tmp"
+        self._link(output_file, temp_file)
+        os.replace(temp_file, cached_file)
+        logger.debug(f"XOSC 캐시 저장: {cached_file}")
+        return cached_file
+
+    @staticmethod
+    def release(output_file):
+        """출력 파일이 있으면 삭제 (캐시 파일과 하드 링크로 연결된 경우 링크만 해제)"""
+        if os.path.lexists(output_file):
+            os.unlink(output_file)
+
+    @staticmethod
+    def write_manifest(output_dir, hashes, merge=False):
+        """시나리오 ID -> 캐시 키 매니페스트 저장 (merge: 기존 매니페스트에 덮어쓰기)"""
+        manifest_file = os.path.join(output_dir, MANIFEST_FILE)
+        os.makedirs(output_dir, exist_ok=True)
+        if merge and os.path.exists(manifest_file):
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                hashes = dict(json.load(f), **hashes)
+        with open(manifest_file, 'w', encoding='utf-8') as f:
+            json.dump(hashes, f, ensure_ascii=False, indent=2, sort_keys=True)
+        return manifest_file
+
+    def _link(self, source, target):
+        """하드 링크 생성 (link_mode가 copy이거나 링크가 불가능하면 복사)"""
+        if self.link_mode == 'hardlink':
+            try:
+                os.link(source, target)
+                return
+            except OSError:
+                pass
+        shutil.copyfile(source, target)
+
+    def _path(self, key):
+        """캐시 키에 해당하는 XOSC 파일 경로"""
+        return os.path.join(self.cache_dir, f"{key}.xosc")
+
+    @staticmethod
+    def _encode_value(value):
+        """NumPy 스칼라 등 JSON 기본 형식이 아닌 값 직렬화"""
+        if isinstance(value, np.generic):
+            return value.item()
+        return str(value)
@@ -0,0 +1,55 @@
+'''
+asyncio 기반 외부 프로세스 실행 테스트
+'''
+
+import unittest
+import sys
+import asyncio
+from src.utils.async_subprocess import run_streamed
+
+# 줄 구분이 섞인 출력을 내보내는 자식 프로세스
+CHILD_SCRIPT = r'''
+import sys
+for i in range(100):
+    sys.stdout.write(f"line {i}\n")
+sys.stderr.write("frame=  10\rframe=  20\rframe=  30\r\n")
+sys.stdout.write("x" * 200)
+'''
+
+class TestAsyncSubprocess(unittest.TestCase):
+    """asyncio 기반 외부 프로세스 실행 테스트 클래스"""
+
+    def test_run_streamed(self):
+        """줄 단위 스트리밍, 보관 줄 수 제한, 긴 줄 분할 테스트"""
+        lines = []
+        result = asyncio.run(run_streamed(
+            [sys.executable, '-c', CHILD_SCRIPT],
+            tail_lines=3,
+            on_line=lambda stream_name, line: lines.append((stream_name, line)),
+            chunk_size=64
+        ))
+
+        self.assertEqual(result['returncode'], 0)
+        self.assertFalse(result['timed_out'])
+        self.assertEqual(result['stderr_tail'].split('\n'), ['frame=  10', 'frame=  20', 'frame=  30'])
+        stdout_tail = result['stdout_tail'].split('\n')
+        self.assertEqual(len(stdout_tail), 3)
+        self.assertEqual(stdout_tail[0], 'line 99')
+
+        stdout_lines = [line for stream_name, line in lines if stream_name == 'stdout']
+        self.assertEqual(stdout_lines[:100], [f"line {i}" for i in range(100)])
+        self.assertEqual(''.join(stdout_lines[100:]), 'x' * 200)
+        self.assertTrue(all(len(line) <= 2 * 64 for line in stdout_lines[100:]))
+
+    def test_run_streamed_timeout(self):
+        """시간 초과 시 프로세스 종료 테스트"""
+        result = asyncio.run(run_streamed(
+            [sys.executable, '-c', 'import time; time.sleep(5)'],
+            timeout=0.3
+        ))
+        self.assertTrue(result['timed_out'])
+        self.assertIsNone(result['returncode'])
+        self.assertLess(result['duration'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+'''
+결정 경계 탐색 테스트
+'''
+
+import unittest
+import copy
+import numpy as np
+from src.filters.boundary_search import DecisionBoundaryExtractor, DEFAULT_MAX_DEPTH
+from src.filters.scenario_filter import ScenarioFilter
+from src.generators.scenario_generator import ScenarioGenerator, PARAMETER_KEYS
+from src.utils.config_loader import ConfigLoader
+
+class TestDecisionBoundaryExtractor(unittest.TestCase):
+    """결정 경계 탐색 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 설정 (고정 축 범위를 줄인 설정)"""
+        self.config = ConfigLoader.load_config('config/scenario_config.yaml')
+        vehicles = self.config['vehicles']
+        vehicles['lead_vehicle_1']['longitudinal_velocity'].update({'min': 60.0, 'max': 70.0})
+        vehicles['lead_vehicle_1']['lateral_velocity'].update({'min': 1.0, 'max': 1.5})
+        vehicles['lead_vehicle_1']['initial_thw'].update({'min': 1.5, 'max': 2.0})
+        vehicles['lead_vehicle_2']['longitudinal_deceleration'].update({'min': 2.0, 'max': 3.0})
+        
+    def test_default_max_depth(self):
+        """설정 파일이 없을 때의 기본 분할 깊이가 설정 파일 값과 같은지 테스트"""
+        self.assertEqual(DecisionBoundaryExtractor(self.config).max_depth, DEFAULT_MAX_DEPTH)
+        del self.config['filtering']['boundary_search']['max_depth']
+        self.assertEqual(DecisionBoundaryExtractor(self.config).max_depth, DEFAULT_MAX_DEPTH)
+        
+    def test_extract_matches_fine_grid(self):
+        """경계 꼭짓점 판정이 같은 해상도의 전체 격자 필터링 결과와 일치하는지 테스트"""
+        depth = 2
+        coarse = ScenarioFilter(self.config).filter_columns(ScenarioGenerator(self.config).generate_scenario_columns())
+        extractor = DecisionBoundaryExtractor(self.config)
+        result = extractor.extract(coarse, max_depth=depth)
+        points = result['points']
+        statistics = result['statistics']
+        
+        self.assertGreater(statistics['boundary_cells'], 0)
+        self.assertLess(statistics['coarse_points'] + statistics['evaluations'], statistics['equivalent_grid_points'])
+        
+        # 세분화 축의 간격을 1/2^depth로 줄인 전체 격자 필터링
+        fine_config = copy.deepcopy(self.config)
+        vehicles = fine_config['vehicles']
+        for range_config in (vehicles['ego_vehicle']['longitudinal_velocity'],
+                             vehicles['lead_vehicle_2']['longitudinal_velocity'],
+                             vehicles['lead_vehicle_2']['reveal_thw']):
+            range_config['step'] /= 2 ** depth
+        fine = ScenarioFilter(fine_config).filter_columns(ScenarioGenerator(fine_config).generate_scenario_columns())
+        
+        fine_test_cases = set(zip(*(np.round(fine[key], 6).tolist() for key in PARAMETER_KEYS)))
+        point_keys = zip(*(np.round(points[key], 6).tolist() for key in PARAMETER_KEYS))
+        expected = np.array([key in fine_test_cases for key in point_keys])
+        
+        np.testing.assert_array_equal(points['is_test_case'], expected)
+        self.assertTrue(points['is_test_case'].any() and not points['is_test_case'].all())
+        
+    def test_invalid_axes(self):
+        """잘못된 세분화 축 설정 시 오류 테스트"""
+        self.config['filtering']['boundary_search'] = {'axes': ['v_ego', 'unknown']}
+        with self.assertRaises(ValueError):
+            DecisionBoundaryExtractor(self.config)
+
+if __name__ == '__main__':
+    unittest.main()
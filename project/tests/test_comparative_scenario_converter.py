@@ -5,8 +5,15 @@ scenariogeneration을 활용한 시나리오 변환기 테스트
 import unittest
 import os
 import tempfile
-from src.converters.comparative_scenario_converter import ComparativeScenarioConverter
+import copy
+import xml.etree.ElementTree as ET
+import scenariogeneration as sg
+from scenariogeneration import xosc
+from src.converters.comparative_scenario_converter import (
+    ComparativeScenarioConverter, XoscTemplate, TEMPLATE_FIELDS, PARAMETER_NAMES, XOSC_FILE_DATE,
+    scenario_xosc_values, _generate_xosc, _DECELERATION_FIELDS)
 from src.utils.config_loader import ConfigLoader
+from src.utils.run_manifest import RunManifest
 
 class TestComparativeScenarioConverter(unittest.TestCase):
     """시나리오 변환기 테스트 클래스"""
@@ -49,11 +56,171 @@ class TestComparativeScenarioConverter(unittest.TestCase):
                 content = f.read()
                 self.assertIn('<?xml', content, "XML 선언이 없습니다.")
                 self.assertIn('<OpenSCENARIO', content, "OpenSCENARIO 태그가 없습니다.")
+            
+            # 재실행해도 같은 내용이 되도록 FileHeader 날짜 고정, 감속 기동 포함
+            root = ET.parse(result_file).getroot()
+            self.assertEqual(root.find('FileHeader').get('date'), XOSC_FILE_DATE)
+            self.assertEqual(len(root.findall('.//ManeuverGroup')), 2)
+            self.assertEqual(root.find('.//RelativeTargetLane').get('value'), '-1')
                 
         finally:
             # 임시 파일 삭제
             if os.path.exists(output_file):
                 os.unlink(output_file)
 
+    def test_generate_xosc_output_file(self):
+        """생성 폴더 대신 지정한 파일 경로에 XOSC가 저장되는지 테스트"""
+        class _MinimalGenerator(sg.ScenarioGenerator):
+            def scenario(self, **kwargs):
+                return xosc.Scenario('Minimal', 'cutout_scenario', xosc.ParameterDeclarations(), xosc.Entities(),
+                                     xosc.StoryBoard(), xosc.RoadNetwork(), xosc.Catalog())
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_file = os.path.join(output_dir, 'scenarios', 'scenario_001.xosc')
+            self.assertEqual(_generate_xosc(_MinimalGenerator(), output_file), output_file)
+            self.assertEqual(os.listdir(os.path.dirname(output_file)), ['scenario_001.xosc'])
+            self.assertEqual(ET.parse(output_file).getroot().find('FileHeader').get('description'), 'Minimal')
+
+    def test_template_matches_generator(self):
+        """구조별 템플릿 렌더링 결과가 객체 생성 경로 결과와 바이트 단위로 같은지 테스트"""
+        cruising_scenario = dict(self.test_scenario, dec_lv2=0.0)
+        right_scenario = dict(self.test_scenario, lane_change_direction=1, v_lv1=65.0)
+        test_cases = [self.test_scenario, dict(self.test_scenario, v_ego=100.0, dec_lv2=3.5), cruising_scenario, right_scenario]
+        
+        template_config = copy.deepcopy(self.config)
+        template_config['simulation'].setdefault('conversion', {})['render_mode'] = 'template'
+        template_converter = ComparativeScenarioConverter(template_config)
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            for index, test_case in enumerate(test_cases):
+                reference_file = os.path.join(output_dir, f"reference_{index}.xosc")
+                template_file = os.path.join(output_dir, f"template_{index}.xosc")
+                self.converter.convert_to_openscenario(test_case, reference_file)
+                template_converter.convert(test_case, template_file)
+                with open(reference_file, 'rb') as reference, open(template_file, 'rb') as rendered:
+                    self.assertEqual(rendered.read(), reference.read(), f"Test Case {index} 렌더링 결과가 다릅니다.")
+        
+        # 검증에 실패해 객체 생성 경로로 대체된 구조가 없어야 함
+        self.assertEqual(len(template_converter._templates), 3)
+        self.assertNotIn(None, template_converter._templates.values())
+
+    def test_template_render(self):
+        """표식 값 XOSC로부터 컴파일한 템플릿의 값 치환 테스트"""
+        sentinel_values = {
+            field: (f"Sentinel_{field}" if field == 'scenario_name' else 9000101.5 + index - 1)
+            for index, field in enumerate(TEMPLATE_FIELDS)
+        }
+        sentinel_values['scenario_name'] = 'CutOutTemplateScenarioName'
+        
+        # 표식 값이 기록된 최소 XOSC 구조
+        content = (
+            '<?xml version="1.0" encoding="utf-8"?>\n<OpenSCENARIO>\n'
+            + ''.join(f'  <Value field="{field}" value="{XoscTemplate.format_value(value)}"/>\n'
+                      for field, value in sentinel_values.items())
+            + '</OpenSCENARIO>\n'
+        ).encode('utf-8')
+        template = XoscTemplate.compile(content)
+        self.assertEqual(sorted(template.fields), sorted(TEMPLATE_FIELDS))
+        
+        values = scenario_xosc_values(self.test_scenario, self.config)
+        rendered = template.render(values).decode('utf-8')
+        expected = (
+            '<?xml version="1.0" encoding="utf-8"?>\n<OpenSCENARIO>\n'
+            + ''.join(f'  <Value field="{field}" value="{XoscTemplate.format_value(values[field])}"/>\n'
+                      for field in sentinel_values)
+            + '</OpenSCENARIO>\n'
+        )
+        self.assertEqual(rendered, expected)
+        self.assertIn(f'value="{80.0 / 3.6}"', rendered)
+        
+        # 필수 필드가 없으면 오류
+        with self.assertRaises(ValueError):
+            XoscTemplate.compile(b'<OpenSCENARIO/>')
+
+    def test_convert_batch_records_failures(self):
+        """일괄 변환 시 파일별 실패가 배치를 중단하지 않고 순서대로 기록되는지 테스트"""
+        broken_scenario = dict(self.test_scenario)
+        del broken_scenario['v_lv1_lat']
+        test_cases = [broken_scenario, dict(self.test_scenario), broken_scenario]
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = self.converter.convert_batch(test_cases, output_dir, workers=2, chunk_size=1)
+        
+        self.assertEqual([result['index'] for result in results], [0, 1, 2])
+        self.assertEqual([result['scenario_id'] for result in results], ['scenario_001', 'scenario_002', 'scenario_003'])
+        self.assertEqual(results[2]['output_file'], os.path.join(output_dir, 'scenario_003.xosc'))
+        for result in (results[0], results[2]):
+            self.assertFalse(result['success'])
+            self.assertIn('KeyError', result['error'])
+
+    def test_convert_parameterized(self):
+        """구조별 파라미터화 XOSC와 분포 파일 생성 및 대기 중인 Test Case의 구조만 재변환 테스트"""
+        test_cases = [
+            self.test_scenario,
+            dict(self.test_scenario, dec_lv2=0.0),
+            dict(self.test_scenario, v_ego=100.0, dec_lv2=3.0),
+            dict(self.test_scenario, v_lv1=60.0, dec_lv2=0.0)
+        ]
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = self.converter.convert_parameterized(test_cases, output_dir)
+            self.assertEqual([result['index'] for result in results], [0, 1, 2, 3])
+            self.assertTrue(all(result['success'] for result in results), [result['error'] for result in results])
+            self.assertEqual([result['permutation'] for result in results], [0, 0, 1, 1])
+            
+            # 감속 구조: 파라미터 선언과 $참조가 있는 시나리오, Test Case별 ParameterValueSet
+            scenario_root = ET.parse(results[2]['output_file']).getroot()
+            declared = {element.get('name') for element in scenario_root.findall('ParameterDeclarations/ParameterDeclaration')}
+            self.assertTrue(set(PARAMETER_NAMES.values()) <= declared)
+            self.assertEqual(scenario_root.find('.//AbsoluteTargetSpeed').get('value'), f"${PARAMETER_NAMES['ego_speed']}")
+            
+            distribution_root = ET.parse(results[2]['distribution_file']).getroot()
+            self.assertEqual(distribution_root.find('.//ScenarioFile').get('filepath'), os.path.basename(results[2]['output_file']))
+            value_sets = distribution_root.findall('.//ParameterValueSet')
+            self.assertEqual(len(value_sets), 2)
+            for result in (results[0], results[2]):
+                row = {element.get('parameterRef'): element.get('value') for element in value_sets[result['permutation']]}
+                self.assertEqual(row, result['parameter_values'])
+            
+            # 등속 구조에는 감속 파라미터 없음
+            cruise_root = ET.parse(results[1]['output_file']).getroot()
+            cruise_declared = {element.get('name') for element in cruise_root.findall('ParameterDeclarations/ParameterDeclaration')}
+            self.assertNotIn(PARAMETER_NAMES['dec_lv2'], cruise_declared)
+            self.assertEqual(len(cruise_root.findall('.//ManeuverGroup')), 1)
+            
+            # 대기 중인 Test Case(3번, 등속 구조)가 속한 구조만 다시 변환
+            os.unlink(results[0]['distribution_file'])
+            pending_results = self.converter.convert_parameterized(test_cases, output_dir, indices=[3])
+            self.assertEqual([result['index'] for result in pending_results], [1, 3])
+            self.assertEqual([result['parameter_values'] for result in pending_results], [results[1]['parameter_values'], results[3]['parameter_values']])
+            self.assertFalse(os.path.exists(results[0]['distribution_file']))
+
+    def test_write_parameter_distribution(self):
+        """Test Case별 값이 ParameterValueSet으로 기록되는지 테스트"""
+        cruising_scenario = dict(self.test_scenario, v_ego=100.0, dec_lv2=0.0)
+        parameter_sets = [scenario_xosc_values(test_case, self.config) for test_case in (self.test_scenario, cruising_scenario)]
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            distribution_file = os.path.join(output_dir, 'cut_out_distribution.xosc')
+            ComparativeScenarioConverter.write_parameter_distribution(
+                'cut_out.xosc', parameter_sets, distribution_file, include_deceleration=False)
+            root = ET.parse(distribution_file).getroot()
+            
+            # 재실행해도 같은 내용 (재개 시 내용 해시 비교)
+            rewritten_file = os.path.join(output_dir, 'rewritten_distribution.xosc')
+            ComparativeScenarioConverter.write_parameter_distribution(
+                'cut_out.xosc', parameter_sets, rewritten_file, include_deceleration=False)
+            self.assertEqual(RunManifest.file_hash(rewritten_file), RunManifest.file_hash(distribution_file))
+        
+        distribution = root.find('ParameterValueDistribution')
+        self.assertEqual(distribution.find('ScenarioFile').get('filepath'), 'cut_out.xosc')
+        value_sets = distribution.findall('Deterministic/DeterministicMultiParameterDistribution/ValueSetDistribution/ParameterValueSet')
+        self.assertEqual(len(value_sets), 2)
+        
+        assignments = {element.get('parameterRef'): element.get('value') for element in value_sets[1]}
+        self.assertNotIn(PARAMETER_NAMES['dec_lv2'], assignments)
+        self.assertEqual(len(assignments), len(PARAMETER_NAMES) - len(_DECELERATION_FIELDS))
+        self.assertEqual(float(assignments[PARAMETER_NAMES['ego_speed']]), 100.0 / 3.6)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,77 @@
+'''
+논리 조건 컴파일러 테스트
+'''
+
+import unittest
+import itertools
+import copy
+import numpy as np
+from src.utils.condition_compiler import ConditionCompiler
+from src.generators.scenario_generator import ScenarioGenerator
+from src.utils.config_loader import ConfigLoader
+
+class TestConditionCompiler(unittest.TestCase):
+    """논리 조건 컴파일러 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 설정"""
+        self.config = ConfigLoader.load_config('config/scenario_config.yaml')
+        self.columns = {
+            'v_ego': np.array([60.0, 80.0, 100.0]),
+            'v_lv2': np.array([70.0, 90.0, 50.0]),
+            'dec_lv2': np.array([0.0, 1.0, 0.0])
+        }
+    
+    def test_vectorized_conditions(self):
+        """설정 파일 형식 조건의 벡터 평가 테스트"""
+        condition = ConditionCompiler.compile("v_lv2_long > v_ego and dec_lv2_long == 0")
+        self.assertEqual(condition.variables, {'v_lv2', 'v_ego', 'dec_lv2'})
+        np.testing.assert_array_equal(condition(self.columns), [True, False, False])
+        
+        # 연쇄 비교, 산술, not, or
+        condition = ConditionCompiler.compile("not (50 < v_ego <= 80) or v_ego - v_lv2 / 2 > 60")
+        np.testing.assert_array_equal(condition(self.columns), [False, False, True])
+    
+    def test_scalar_conditions(self):
+        """스칼라 조건자가 행별로 벡터 평가와 같은 bool을 반환하는지 테스트"""
+        expressions = [
+            "v_lv2_long > v_ego and dec_lv2_long == 0",
+            "not (50 < v_ego <= 80) or v_ego - v_lv2 / 2 > 60",
+            "-v_ego + 10 >= -90 and not dec_lv2 != 0"
+        ]
+        for condition in ConditionCompiler.compile_all(expressions):
+            vectorized = condition(self.columns)
+            for index in range(3):
+                row = {key: values[index].item() for key, values in self.columns.items()}
+                result = condition.evaluate_row(row)
+                self.assertIs(type(result), bool)
+                self.assertEqual(result, bool(vectorized[index]), condition.expression)
+    
+    def test_rejects_unsafe_expressions(self):
+        """함수 호출, 속성 접근 등 허용되지 않은 표현식 거부 테스트"""
+        for expression in ("__import__('os').system('true')", "v_ego.__class__", "[v_ego]", "v_ego ** 2"):
+            with self.assertRaises(ValueError):
+                ConditionCompiler.compile(expression)
+        
+        with self.assertRaises(ValueError):
+            ConditionCompiler.compile("v_unknown > 0", allowed_variables=['v_ego'])
+    
+    def test_user_defined_generator_rule(self):
+        """설정 파일에 추가한 조건이 생성기에 마스크로 적용되는지 테스트"""
+        config = copy.deepcopy(self.config)
+        config['filtering']['logical_conditions']['physical_validity_conditions'] += [
+            "v_lv1 > v_ego",
+            "d_lv1_lv2 > 40"
+        ]
+        generator = ScenarioGenerator(config)
+        columns = generator.generate_scenario_columns()
+        
+        ranges = generator._build_parameter_ranges()
+        expected = [combo for combo in itertools.product(*ranges.values()) if generator._is_valid_combination(*combo)]
+        
+        self.assertEqual(len(columns['v_ego']), len(expected), "시나리오 수가 다릅니다.")
+        self.assertFalse((columns['v_lv1'] > columns['v_ego']).any(), "v_lv1 > v_ego 조합이 남아 있습니다.")
+        self.assertFalse((columns['d_lv1_lv2'] > 40).any(), "d_lv1_lv2 > 40 조합이 남아 있습니다.")
+
+if __name__ == '__main__':
+    unittest.main()
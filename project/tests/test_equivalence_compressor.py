@@ -0,0 +1,46 @@
+'''
+동치 시나리오 압축 테스트
+'''
+
+import unittest
+import numpy as np
+from src.filters.equivalence_compressor import OutcomeEquivalenceCompressor, OUTCOME_KEYS
+from src.filters.scenario_filter import ScenarioFilter
+from src.generators.scenario_generator import ScenarioGenerator
+from src.utils.config_loader import ConfigLoader
+
+class TestOutcomeEquivalenceCompressor(unittest.TestCase):
+    """동치 시나리오 압축 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 설정"""
+        self.config = ConfigLoader.load_config('config/scenario_config.yaml')
+        self.filtered = ScenarioFilter(self.config).filter_columns(
+            ScenarioGenerator(self.config).generate_scenario_columns())
+        
+    def test_compress(self):
+        """대표 시나리오별 multiplicity 합계와 동치 키 고유성 테스트"""
+        self.config['filtering']['equivalence_compression'] = {'keys': None}
+        compressor = OutcomeEquivalenceCompressor(self.config)
+        compressed = compressor.compress(self.filtered)
+        
+        total = len(self.filtered['v_ego'])
+        self.assertLess(len(compressed['v_ego']), total)
+        self.assertEqual(int(compressed['multiplicity'].sum()), total)
+        
+        # 대표 시나리오는 원래 순서를 유지하고 동치 키가 서로 다름
+        self.assertTrue(np.all(np.diff(compressed['grid_index']) > 0))
+        keys = set(zip(*(compressed[key].tolist() for key in OUTCOME_KEYS['human_ads_decision'])))
+        self.assertEqual(len(keys), len(compressed['v_ego']))
+        
+        # 행별 동치류 번호가 가리키는 대표 시나리오의 판정 결과가 같음
+        class_index = compressor.last_class_index
+        for key in ('ttc_reveal', 'human_fails', 'ads_fails'):
+            np.testing.assert_array_equal(compressed[key][class_index], self.filtered[key])
+        
+        # 재압축 시 multiplicity 합산
+        recompressed = compressor.compress(compressed)
+        np.testing.assert_array_equal(recompressed['multiplicity'], compressed['multiplicity'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+'''
+배치 운동학 사전 시뮬레이터 테스트
+'''
+
+import unittest
+import numpy as np
+from src.runners.kinematic_simulator import KinematicSimulator
+from src.utils.config_loader import ConfigLoader
+from src.utils.scenario_columns import ScenarioColumns
+
+class TestKinematicSimulator(unittest.TestCase):
+    """배치 운동학 사전 시뮬레이터 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 설정"""
+        self.config = ConfigLoader.load_config('config/scenario_config.yaml')
+        self.simulator = KinematicSimulator(self.config)
+        
+        # 테스트 시나리오 목록 (충돌 케이스, 비충돌 케이스)
+        scenarios = [
+            {
+                'v_ego': 100.0, 'v_lv1': 90.0, 'v_lv1_lat': 1.0, 'thw_ego_lv1': 1.5,
+                'v_lv2': 50.0, 'dec_lv2': 0.0, 'thw_ego_lv2_reveal': 2.5
+            },
+            {
+                'v_ego': 60.0, 'v_lv1': 100.0, 'v_lv1_lat': 1.5, 'thw_ego_lv1': 2.0,
+                'v_lv2': 90.0, 'dec_lv2': 0.0, 'thw_ego_lv2_reveal': 3.0
+            }
+        ]
+        for scenario in scenarios:
+            scenario['d_ego_lv1'] = (scenario['v_ego']/3.6) * scenario['thw_ego_lv1']
+            scenario['d_lv1_lv2'] = (scenario['v_lv1']/3.6) * (scenario['thw_ego_lv2_reveal'] - scenario['thw_ego_lv1'])
+            scenario['lane_change_direction'] = -1
+            scenario['lv2_deceleration_trigger_delay'] = 0.1
+        self.scenarios = scenarios
+        self.columns = ScenarioColumns.from_scenarios(scenarios)
+    
+    def test_simulate(self):
+        """충돌 여부, 충돌 시각, 최소 간격 테스트"""
+        results = self.simulator.simulate(self.columns)
+        np.testing.assert_array_equal(results['sim_collision'], [True, False])
+        
+        # 등속 접근 시 충돌 시각 = 초기 LV2 간격 / 상대 속도 (시간 단계 오차 이내)
+        collision_case = self.scenarios[0]
+        gap_lv2 = collision_case['d_ego_lv1'] + collision_case['d_lv1_lv2'] - (5.0 + 4.8) / 2
+        expected_time = gap_lv2 / ((collision_case['v_ego'] - collision_case['v_lv2']) / 3.6)
+        self.assertAlmostEqual(results['sim_collision_time'][0], expected_time, delta=self.config['simulation']['time_step'])
+        
+        # 선행 차량이 모두 더 빠르면 최소 간격은 초기 LV1 간격, TTC는 무한대
+        safe_case = self.scenarios[1]
+        self.assertAlmostEqual(results['sim_min_gap'][1], safe_case['d_ego_lv1'] - (5.0 + 4.8) / 2)
+        self.assertEqual(results['sim_min_ttc'][1], float('inf'))
+        
+        # 청크 크기와 무관한 결과
+        chunked = self.simulator.simulate(self.columns, chunk_size=1)
+        for key in results:
+            np.testing.assert_array_equal(chunked[key], results[key])
+
+    def test_simulate_with_ego_braking(self):
+        """Ego 제동 모델 적용 시 충돌이 늦어지는지 테스트 (ADS가 Human보다 빠르게 반응)"""
+        collision_times = [
+            self.simulator.simulate(self.columns, ego_model=ego_model)['sim_collision_time'][0]
+            for ego_model in (None, 'human_model', 'ads_model')
+        ]
+        self.assertLess(collision_times[0], collision_times[1])
+        self.assertLess(collision_times[1], collision_times[2])
+
+if __name__ == '__main__':
+    unittest.main()
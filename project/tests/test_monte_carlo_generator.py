@@ -0,0 +1,62 @@
+'''
+몬테카를로 시나리오 생성기 테스트
+'''
+
+import unittest
+import numpy as np
+from src.generators.monte_carlo_generator import MonteCarloScenarioGenerator
+from src.generators.scenario_generator import PARAMETER_KEYS
+from src.utils.config_loader import ConfigLoader
+
+class TestMonteCarloScenarioGenerator(unittest.TestCase):
+    """몬테카를로 시나리오 생성기 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 설정"""
+        self.config = ConfigLoader.load_config('config/scenario_config.yaml')
+        self.config['simulation']['monte_carlo'] = {
+            'distributions': {'v_ego': {'type': 'normal', 'mean': 90.0, 'std': 15.0}},
+            'importance_sampling': {'pilot_count': 5000}
+        }
+        
+    def test_seeded_generation(self):
+        """같은 시드로 같은 표본이 생성되고 파라미터 범위를 벗어나지 않는지 테스트"""
+        first = MonteCarloScenarioGenerator(self.config).generate_scenario_columns(2000)
+        second = MonteCarloScenarioGenerator(self.config).generate_scenario_columns(2000)
+        
+        for key in PARAMETER_KEYS:
+            np.testing.assert_array_equal(first[key], second[key])
+        np.testing.assert_array_equal(first['weight'], np.ones(2000))
+        
+        self.assertGreaterEqual(first['v_ego'].min(), 60.0)
+        self.assertLessEqual(first['v_ego'].max(), 120.0)
+        self.assertAlmostEqual(first['v_ego'].mean(), 90.0, delta=1.5)
+        np.testing.assert_allclose(first['d_ego_lv1'], first['v_ego'] / 3.6 * first['thw_ego_lv1'])
+        
+        self.config['simulation']['random_seed'] = 7
+        other = MonteCarloScenarioGenerator(self.config).generate_scenario_columns(2000)
+        self.assertFalse(np.array_equal(first['v_ego'], other['v_ego']))
+        
+    def test_importance_sampling_estimate(self):
+        """중요도 샘플링 가중 추정치가 공칭 몬테카를로 추정치와 일치하는지 테스트"""
+        generator = MonteCarloScenarioGenerator(self.config)
+        nominal = generator.estimate_failure_rates(generator.generate_scenario_columns(100000))
+        
+        generator = MonteCarloScenarioGenerator(self.config)
+        columns = generator.generate_importance_columns(30000)
+        weighted = generator.estimate_failure_rates(columns)
+        
+        # 제안 분포 가중치의 기대값은 1
+        self.assertAlmostEqual(columns['weight'].mean(), 1.0, delta=0.05)
+        self.assertLessEqual(columns['weight'].max(), 1 / 0.3 + 1e-9)
+        
+        for outcome in ('human_fails', 'test_case'):
+            expected = nominal['estimates'][outcome]
+            actual = weighted['estimates'][outcome]
+            tolerance = 4 * np.hypot(expected['standard_error'], actual['standard_error'])
+            self.assertAlmostEqual(actual['rate'], expected['rate'], delta=tolerance)
+            
+        self.assertLess(weighted['effective_sample_size'], weighted['sample_count'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+'''
+시뮬레이션 -> 비디오 인코딩 파이프라인 테스트
+'''
+
+import unittest
+import time
+import asyncio
+from src.runners.pipeline_executor import SimulationVideoPipeline
+from src.utils.config_loader import ConfigLoader
+
+# 단계별 처리 시간 (s)
+STAGE_DURATION = 0.2
+
+class _FakeRunner:
+    """일정 시간 대기 후 결과를 기록하는 시뮬레이션 실행기 (이름에 fail이 있으면 실패)"""
+
+    async def run_job_async(self, xosc_file, output_dir, extra_args=None, timeout=None, retries=0):
+        await asyncio.sleep(STAGE_DURATION)
+        success = 'fail' not in xosc_file
+        return {'xosc_file': xosc_file, 'output_dir': output_dir, 'success': success, 'error': None if success else '반환 코드 1'}
+
+class _FakeVideoProcessor:
+    """일정 시간 대기 후 성공하는 비디오 생성기 (이름에 broken이 있으면 예외)"""
+
+    def __init__(self):
+        self.encoded = []
+
+    async def create_video_async(self, image_folder, output_file, timeout=None):
+        await asyncio.sleep(STAGE_DURATION)
+        if 'broken' in output_file:
+            raise RuntimeError('인코더 오류')
+        self.encoded.append(output_file)
+        return True
+
+class TestSimulationVideoPipeline(unittest.TestCase):
+    """시뮬레이션 -> 비디오 인코딩 파이프라인 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정 (단계별 워커 1개)"""
+        self.config = ConfigLoader.load_config('config/scenario_config.yaml')
+        self.config['simulation']['pipeline'] = {'simulation_workers': 1, 'encode_workers': 1, 'queue_size': 1}
+
+    def test_stages_overlap(self):
+        """인코딩과 다음 시나리오 시뮬레이션이 겹쳐 실행되는지 테스트"""
+        video_processor = _FakeVideoProcessor()
+        pipeline = SimulationVideoPipeline(self.config, _FakeRunner(), video_processor)
+        names = ['a', 'b', 'fail', 'c', 'd']
+        jobs = [(f"{name}.xosc", f"sim_{name}", [], f"{name}.mp4") for name in names]
+
+        start_time = time.monotonic()
+        results = pipeline.run(jobs)
+        elapsed = time.monotonic() - start_time
+
+        # 순차 실행이면 (5 + 4) x STAGE_DURATION, 파이프라인이면 약 (5 + 1) x STAGE_DURATION
+        self.assertLess(elapsed, 7.5 * STAGE_DURATION)
+        self.assertEqual([result['video_success'] for result in results], [True, True, False, True, True])
+        self.assertEqual([result['simulation']['xosc_file'] for result in results], [f"{name}.xosc" for name in names])
+        self.assertEqual(video_processor.encoded, ['a.mp4', 'b.mp4', 'c.mp4', 'd.mp4'])
+
+    def test_encoder_errors_do_not_block(self):
+        """인코딩 또는 결과 기록 중 예외가 나도 실패로 기록하고 나머지를 처리하는지 테스트"""
+        video_processor = _FakeVideoProcessor()
+        pipeline = SimulationVideoPipeline(self.config, _FakeRunner(), video_processor)
+        names = ['broken_a', 'b', 'broken_c', 'd', 'e']
+        jobs = [(f"{name}.xosc", f"sim_{name}", [], f"{name}.mp4") for name in names]
+        reported = []
+
+        def on_result(position, result):
+            reported.append(position)
+            if position == 3:
+                raise RuntimeError('기록 오류')
+
+        results = asyncio.run(asyncio.wait_for(pipeline.run_async(jobs, on_result), timeout=20 * STAGE_DURATION))
+
+        self.assertEqual([result['video_success'] for result in results], [False, True, False, True, True])
+        self.assertEqual(sorted(reported), [0, 1, 2, 3, 4])
+        self.assertEqual(video_processor.encoded, ['b.mp4', 'd.mp4', 'e.mp4'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+'''
+실행 매니페스트 테스트
+'''
+
+import unittest
+import os
+import copy
+import tempfile
+import numpy as np
+from src.utils.run_manifest import RunManifest, MANIFEST_FILE, JOURNAL_FILE
+from src.utils.config_loader import ConfigLoader
+
+class TestRunManifest(unittest.TestCase):
+    """실행 매니페스트 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.config = ConfigLoader.load_config('config/scenario_config.yaml')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = self.temp_dir.name
+
+    def tearDown(self):
+        """임시 디렉토리 삭제"""
+        self.temp_dir.cleanup()
+
+    def test_analysis_round_trip(self):
+        """분석 단계 결과 저장/재사용 및 설정 변경 시 무효화 테스트"""
+        key = RunManifest.analysis_key(self.config)
+        sampled = [{'v_ego': np.float64(80.0), 'lane_change_direction': np.int64(-1), 'is_valid': np.bool_(True)}]
+        RunManifest(self.output_dir).reset().save_analysis(key, sampled * 3, sampled, 10)
+
+        filtered_scenarios, sampled_scenarios, filtered_count = RunManifest(self.output_dir).load().load_analysis(key)
+        self.assertEqual(len(filtered_scenarios), 3)
+        self.assertEqual(filtered_count, 10)
+        self.assertEqual(sampled_scenarios, [{'v_ego': 80.0, 'lane_change_direction': -1, 'is_valid': True}])
+        self.assertEqual(RunManifest.content_hash(sampled[0]), RunManifest.content_hash(sampled_scenarios[0]))
+
+        # 실행 관련 설정은 분석 단계 키에 영향 없음
+        execution_config = copy.deepcopy(self.config)
+        execution_config['simulation']['esmini']['batch'] = {'timeout': 1}
+        self.assertEqual(RunManifest.analysis_key(execution_config), key)
+
+        changed_config = copy.deepcopy(self.config)
+        changed_config['simulation']['sampling']['target_sample_count'] += 1
+        changed_key = RunManifest.analysis_key(changed_config)
+        self.assertNotEqual(changed_key, key)
+        self.assertIsNone(RunManifest(self.output_dir).load().load_analysis(changed_key))
+
+    def test_scenario_freshness(self):
+        """완료 기록, 입력 해시, 생성 파일 내용 기준 최신 여부 테스트"""
+        video_file = os.path.join(self.output_dir, 'scenario_001.mp4')
+        with open(video_file, 'wb') as f:
+            f.write(b'video')
+
+        manifest = RunManifest(self.output_dir).reset()
+        manifest.record('scenario_001', 'video', completed=True, xosc_hash='a',
+                        file=video_file, file_hash=RunManifest.file_hash(video_file))
+        manifest.record('scenario_002', 'simulation', completed=False, xosc_hash='a')
+
+        # 중단 후 재개 시 디스크의 기록 사용
+        manifest = RunManifest(self.output_dir).load()
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, MANIFEST_FILE)))
+        self.assertTrue(manifest.is_fresh('scenario_001', 'video', xosc_hash='a'))
+        self.assertFalse(manifest.is_fresh('scenario_001', 'video', xosc_hash='b'))
+        self.assertFalse(manifest.is_fresh('scenario_002', 'simulation', xosc_hash='a'))
+        self.assertFalse(manifest.is_fresh('scenario_003', 'xosc'))
+
+        # 생성 파일이 바뀌거나 없어지면 다시 실행
+        with open(video_file, 'wb') as f:
+            f.write(b'truncated')
+        self.assertFalse(manifest.is_fresh('scenario_001', 'video', xosc_hash='a'))
+        os.unlink(video_file)
+        self.assertFalse(manifest.is_fresh('scenario_001', 'video', xosc_hash='a'))
+
+    def test_journal_replay(self):
+        """저장 전 기록이 기록 로그로 복원되고 저장 시 매니페스트에 합쳐지는지 테스트"""
+        manifest = RunManifest(self.output_dir).reset()
+        manifest.record('scenario_001', 'xosc', completed=True, input_hash=np.str_('a'), simulation_args=['--x'])
+        manifest.record('scenario_001', 'xosc', completed=True, input_hash='b', simulation_args=[])
+        manifest.record('scenario_002', 'xosc', completed=False, input_hash='c')
+        
+        # 기록 중 중단되어 잘린 마지막 줄은 무시
+        journal_file = os.path.join(self.output_dir, JOURNAL_FILE)
+        with open(journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"scenario_id": "scenario_003", "sta')
+        
+        restored = RunManifest(self.output_dir).load()
+        self.assertTrue(restored.is_fresh('scenario_001', 'xosc', input_hash='b'))
+        self.assertEqual(restored.entry('scenario_002', 'xosc'), manifest.entry('scenario_002', 'xosc'))
+        self.assertIsNone(restored.entry('scenario_003', 'xosc'))
+        
+        restored.save()
+        self.assertFalse(os.path.exists(journal_file))
+        compacted = RunManifest(self.output_dir).load()
+        self.assertEqual(compacted.data, restored.data)
+
+if __name__ == '__main__':
+    unittest.main()
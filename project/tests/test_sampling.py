@@ -0,0 +1,163 @@
+'''
+비례 층화 샘플링 테스트
+'''
+
+import unittest
+import numpy as np
+from src.utils.sampling import StratifiedSampler, StreamingStratifiedSampler, CoverageSampler
+from src.utils.scenario_columns import ScenarioColumns
+from src.filters.equivalence_compressor import OutcomeEquivalenceCompressor
+
+class TestStratifiedSampler(unittest.TestCase):
+    """비례 층화 샘플링 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 설정 (우선순위 값이 겹치는 무작위 컬럼)"""
+        rng = np.random.default_rng(0)
+        count = 5000
+        self.columns = {
+            'v_ego': rng.choice([60.0, 70.0, 80.0, 90.0, 100.0], count, p=[0.5, 0.2, 0.15, 0.1, 0.05]),
+            'ttc_reveal': np.round(rng.uniform(0.0, 5.0, count), 1),
+            'row': np.arange(count)
+        }
+        
+    def test_allocate_proportional(self):
+        """최대 잉여 비례 할당 테스트"""
+        allocations = StratifiedSampler.allocate_proportional([50, 30, 15, 5], 7)
+        self.assertEqual(allocations.tolist(), [4, 2, 1, 0])
+        self.assertEqual(StratifiedSampler.allocate_proportional([3, 2], 10).tolist(), [3, 2])
+        
+        sizes = np.array([101, 7, 999, 13, 1])
+        allocations = StratifiedSampler.allocate_proportional(sizes, 30)
+        self.assertEqual(allocations.sum(), 30)
+        self.assertTrue(np.all(np.abs(allocations - sizes * 30 / sizes.sum()) < 1))
+        
+    def test_sample_columns(self):
+        """그룹별 우선순위 최소 행 선택 결과를 정렬 기반 기준 구현과 비교"""
+        target_count = 30
+        sampled = StratifiedSampler.sample_columns(self.columns, target_count, 'v_ego', 'ttc_reveal')
+        self.assertEqual(len(sampled['row']), target_count)
+        
+        groups, sizes = np.unique(self.columns['v_ego'], return_counts=True)
+        allocations = StratifiedSampler.allocate_proportional(sizes, target_count)
+        
+        expected = []
+        first_rows = [np.flatnonzero(self.columns['v_ego'] == group)[0] for group in groups]
+        for index in np.argsort(first_rows):
+            rows = np.flatnonzero(self.columns['v_ego'] == groups[index])
+            rows = sorted(rows, key=lambda row: (self.columns['ttc_reveal'][row], row))
+            expected.extend(rows[:allocations[index]])
+        
+        self.assertEqual(sampled['row'].tolist(), expected)
+        
+    def test_sample_columns_without_priority(self):
+        """우선순위 컬럼이 없으면 그룹 내 행 순서대로 선택"""
+        sampled = StratifiedSampler.sample_columns(self.columns, 10, 'v_ego', 'TTC_reveal')
+        for group in np.unique(sampled['v_ego']):
+            rows = sampled['row'][sampled['v_ego'] == group]
+            group_rows = np.flatnonzero(self.columns['v_ego'] == group)
+            np.testing.assert_array_equal(rows, group_rows[:len(rows)])
+    def test_sample_columns_joint_groups(self):
+        """여러 키의 결합 층 할당 테스트"""
+        self.columns['dec_lv2'] = self.columns['row'] % 3 * 1.0
+        sampled = StratifiedSampler.sample_columns(self.columns, 60, ['v_ego', 'dec_lv2'], 'ttc_reveal')
+        self.assertEqual(len(sampled['row']), 60)
+        
+        # 결합 층 15개 중 표본이 있는 층 수
+        strata = set(zip(sampled['v_ego'].tolist(), sampled['dec_lv2'].tolist()))
+        self.assertGreaterEqual(len(strata), 12)
+
+    def test_sample_compressed_columns(self):
+        """동치 압축 전후 그룹별 할당량이 같은지 테스트 (multiplicity 합 기준)"""
+        config = {'filtering': {'equivalence_compression': {'keys': ['v_ego', 'ttc_reveal']}}}
+        compressed = OutcomeEquivalenceCompressor(config).compress(self.columns)
+        self.assertLess(len(compressed['row']), len(self.columns['row']))
+        
+        groups = np.unique(self.columns['v_ego'])
+        sampled = StratifiedSampler.sample_columns(self.columns, 30, 'v_ego', 'ttc_reveal')
+        compressed_sampled = StratifiedSampler.sample_columns(compressed, 30, 'v_ego', 'ttc_reveal')
+        counts = [int(np.sum(sampled['v_ego'] == group)) for group in groups]
+        compressed_counts = [int(np.sum(compressed_sampled['v_ego'] == group)) for group in groups]
+        self.assertEqual(compressed_counts, counts)
+        
+        # 대표 시나리오 수 기준으로 할당하면 결과가 달라지는 데이터인지 확인
+        _, representative_sizes = np.unique(compressed['v_ego'], return_counts=True)
+        self.assertNotEqual(StratifiedSampler.allocate_proportional(representative_sizes, 30).tolist(), counts)
+
+    def test_sample_binned_continuous_groups(self):
+        """연속 v_ego를 구간으로 묶어 층화하면 표본이 전체 범위에 분포하는지 테스트"""
+        rng = np.random.default_rng(1)
+        columns = {'v_ego': rng.uniform(60.0, 120.0, 5000), 'ttc_reveal': rng.uniform(0.0, 5.0, 5000)}
+        edges = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 110]
+        
+        binned = StratifiedSampler.bin_column(np.array([5.0, 60.0, 69.9, 115.0]), edges)
+        self.assertEqual(binned.tolist(), [10.0, 60.0, 60.0, 110.0])
+        
+        columns['v_ego_group'] = StratifiedSampler.bin_column(columns['v_ego'], edges)
+        sampled = StratifiedSampler.sample_columns(columns, 30, 'v_ego_group', 'ttc_reveal')
+        self.assertEqual(len(sampled['v_ego']), 30)
+        self.assertEqual(sorted(set(sampled['v_ego_group'].tolist())), [60.0, 70.0, 80.0, 90.0, 100.0, 110.0])
+        self.assertGreater(sampled['v_ego'].max() - sampled['v_ego'].min(), 50.0)
+
+    def test_streaming_sampler(self):
+        """블록 단위 스트리밍 샘플링 결과가 전체 컬럼 샘플링 결과와 같은지 테스트"""
+        for groupby_key in ('v_ego', ['v_ego', 'parity']):
+            self.columns['parity'] = self.columns['row'] % 2
+            expected = StratifiedSampler.sample_columns(self.columns, 30, groupby_key, 'ttc_reveal')
+            
+            sampler = StreamingStratifiedSampler(30, groupby_key, 'ttc_reveal')
+            for start in range(0, 5000, 700):
+                sampler.update(ScenarioColumns.take(self.columns, slice(start, start + 700)))
+            
+            np.testing.assert_array_equal(sampler.finalize()['row'], expected['row'])
+            self.assertEqual(sampler.total, 5000)
+            self.assertLessEqual(len(sampler.candidates()['row']), 30 * 10)
+
+class TestCoverageSampler(unittest.TestCase):
+    """커버리지 샘플링 테스트 클래스"""
+    
+    def test_sample_columns(self):
+        """최원점 선택 결과가 기준 구현과 같고 층화 샘플링보다 커버리지가 넓은지 테스트"""
+        rng = np.random.default_rng(1)
+        count = 2000
+        columns = {
+            'v_ego': rng.choice([60.0, 80.0, 100.0, 120.0], count),
+            'v_lv2': rng.uniform(30.0, 90.0, count),
+            'dec_lv2': rng.uniform(0.0, 4.0, count),
+            'ttc_reveal': rng.uniform(0.0, 5.0, count),
+            'row': np.arange(count)
+        }
+        keys = ['v_ego', 'v_lv2', 'dec_lv2']
+        sampled = CoverageSampler.sample_columns(columns, 20, keys, 'ttc_reveal')
+        
+        # 기준 구현: 매 단계 선택 집합까지의 최소 거리가 가장 큰 행
+        points = np.column_stack([columns[key] for key in keys])
+        points = (points - points.min(axis=0)) / (points.max(axis=0) - points.min(axis=0))
+        expected = [int(np.argmin(columns['ttc_reveal']))]
+        while len(expected) < 20:
+            distances = np.linalg.norm(points[:, None, :] - points[expected][None], axis=2).min(axis=1)
+            expected.append(int(np.argmax(distances)))
+        self.assertEqual(sampled['row'].tolist(), expected)
+        
+        def coverage_radius(rows):
+            return np.linalg.norm(points[:, None, :] - points[rows][None], axis=2).min(axis=1).max()
+        
+        stratified = StratifiedSampler.sample_columns(columns, 20, 'v_ego', 'ttc_reveal')
+        self.assertLess(coverage_radius(sampled['row']), coverage_radius(stratified['row']))
+
+    def test_sample_columns_without_duplicates(self):
+        """목표 개수가 서로 다른 좌표 수보다 많아도 같은 행을 다시 선택하지 않는지 테스트"""
+        columns = {
+            'v_ego': np.array([60.0, 60.0, 120.0, 60.0, 120.0]),
+            'ttc_reveal': np.array([1.0, 2.0, 3.0, 4.0, 5.0]),
+            'row': np.arange(5)
+        }
+        sampled = CoverageSampler.sample_columns(columns, 5, ['v_ego'], 'ttc_reveal')
+        self.assertEqual(sorted(sampled['row'].tolist()), [0, 1, 2, 3, 4])
+        self.assertEqual(sampled['row'].tolist()[:2], [0, 2])
+        
+        sampled = CoverageSampler.sample_columns(columns, 10, ['v_ego'])
+        self.assertEqual(len(set(sampled['row'].tolist())), 5)
+
+if __name__ == '__main__':
+    unittest.main()
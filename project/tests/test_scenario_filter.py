@@ -3,7 +3,14 @@
 '''
 
 import unittest
+import copy
+import tempfile
+from unittest import mock
+import numpy as np
 from src.filters.scenario_filter import ScenarioFilter
+from src.calculators.ttc_calculator import TTCCalculator
+from src.generators.scenario_generator import ScenarioGenerator
+from src.utils.filter_cache import FilterCache
 from src.utils.config_loader import ConfigLoader
 
 class TestScenarioFilter(unittest.TestCase):
@@ -72,5 +79,133 @@ class TestScenarioFilter(unittest.TestCase):
             self.assertIn('human_fails', scenario, "human_fails 필드가 없습니다.")
             self.assertIn('ads_fails', scenario, "ads_fails 필드가 없습니다.")
 
+    def test_filter_columns(self):
+        """컬럼 필터링 결과가 시나리오 목록 필터링 결과와 같은지 테스트"""
+        generator = ScenarioGenerator(self.config)
+        filtered_scenarios = self.filter.filter_scenarios(generator.generate_scenarios())
+        filtered_columns = self.filter.filter_columns(generator.generate_scenario_columns())
+        
+        self.assertEqual(len(filtered_columns['v_ego']), len(filtered_scenarios), "필터링 결과 수가 다릅니다.")
+        for key in ('v_ego', 'v_lv1', 'v_lv2', 'thw_ego_lv2_reveal', 'ttc_reveal', 'human_fails', 'ads_fails'):
+            expected = np.array([scenario[key] for scenario in filtered_scenarios])
+            np.testing.assert_array_equal(filtered_columns[key], expected, err_msg=f"{key} 컬럼이 다릅니다.")
+
+    def test_filter_parallel(self):
+        """병렬 필터링 결과가 단일 프로세스 결과와 같은 순서로 병합되는지 테스트"""
+        columns = ScenarioGenerator(self.config).generate_scenario_columns()
+        expected = self.filter.filter_columns(columns)
+        
+        for filtered in (self.filter.filter_columns_parallel(columns, workers=2, chunk_size=30000),
+                         self.filter.filter_grid_parallel(workers=2, chunk_size=30000)):
+            for key in expected:
+                np.testing.assert_array_equal(filtered[key], expected[key], err_msg=f"{key} 컬럼이 다릅니다.")
+        
+        # 워커 1개 또는 샤드 1개면 프로세스 풀 없이 현재 프로세스에서 실행
+        with mock.patch('src.filters.scenario_filter.ProcessPoolExecutor', side_effect=AssertionError) as executor:
+            for filtered in (self.filter.filter_columns_parallel(columns, workers=1, chunk_size=30000),
+                             self.filter.filter_columns_parallel(columns, workers=4, chunk_size=len(columns['v_ego']))):
+                for key in expected:
+                    np.testing.assert_array_equal(filtered[key], expected[key], err_msg=f"{key} 컬럼이 다릅니다.")
+            executor.assert_not_called()
+
+    def test_filter_statistics_and_auto_order(self):
+        """단계별 통계 및 자동 단계 정렬 결과 일치 테스트"""
+        columns = ScenarioGenerator(self.config).generate_scenario_columns()
+        expected = self.filter.filter_columns(columns)
+        statistics = self.filter.last_statistics
+        
+        # 단계별 제외 수의 합 + 선택 수 = 전체 시나리오 수
+        rows = statistics.to_rows()
+        self.assertEqual([row['stage'] for row in rows], list(statistics.stage_order))
+        self.assertEqual(sum(row['rejected'] for row in rows) + statistics.selected_scenarios, len(columns['v_ego']))
+        self.assertEqual(statistics.selected_scenarios, len(expected['v_ego']))
+        
+        # 자동 정렬 시에도 결과는 동일
+        config = copy.deepcopy(self.config)
+        config['filtering']['stage_order'] = 'auto'
+        auto_filter = ScenarioFilter(config)
+        filtered = auto_filter.filter_columns(columns)
+        self.assertEqual(sorted(auto_filter.last_statistics.stage_order), sorted(statistics.stage_order))
+        for key in expected:
+            np.testing.assert_array_equal(filtered[key], expected[key], err_msg=f"{key} 컬럼이 다릅니다.")
+
+    def test_filter_with_cache(self):
+        """중간 결과 캐시 재사용 및 제어 모델 변경 시 판단만 재계산 테스트"""
+        generator = ScenarioGenerator(self.config)
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache = FilterCache(cache_dir.name)
+        calls = []
+        
+        def generate_columns():
+            calls.append(1)
+            return generator.generate_scenario_columns()
+        
+        # 첫 실행은 생성 후 캐시 저장, 결과는 filter_columns와 동일
+        expected = self.filter.filter_columns(generator.generate_scenario_columns())
+        filtered = self.filter.filter_with_cache(cache, generate_columns)
+        for key in expected:
+            np.testing.assert_array_equal(filtered[key], expected[key], err_msg=f"{key} 컬럼이 다릅니다.")
+        self.assertEqual(self.filter.last_statistics.total_scenarios, len(generator.generate_scenario_columns()['v_ego']))
+        
+        # 제어 모델만 바뀐 경우 캐시 재사용 (생성 함수 재호출 없음)
+        config = copy.deepcopy(self.config)
+        config['control_models']['ads_model']['reaction_time'] = 0.3
+        self.assertEqual(FilterCache.cache_key(config), FilterCache.cache_key(self.config))
+        
+        changed_filter = ScenarioFilter(config)
+        filtered = changed_filter.filter_with_cache(cache, generate_columns)
+        expected = changed_filter.filter_columns(generator.generate_scenario_columns())
+        self.assertEqual(len(calls), 1, "캐시가 재사용되지 않았습니다.")
+        for key in expected:
+            np.testing.assert_array_equal(filtered[key], expected[key], err_msg=f"{key} 컬럼이 다릅니다.")
+        
+        # 차량 설정이 바뀌면 캐시 키 변경
+        config['vehicles']['ego_vehicle']['longitudinal_velocity']['step'] = 5.0
+        self.assertNotEqual(FilterCache.cache_key(config), FilterCache.cache_key(self.config))
+
+    def test_iter_filtered_blocks(self):
+        """블록 단위 필터링 결과 및 합산 통계가 전체 필터링과 같은지 테스트"""
+        generator = ScenarioGenerator(self.config)
+        expected = self.filter.filter_columns(generator.generate_scenario_columns())
+        expected_statistics = self.filter.last_statistics
+        
+        blocks = list(self.filter.iter_filtered_blocks(generator.iter_scenario_blocks(30000)))
+        self.assertEqual(len(blocks), 4)
+        np.testing.assert_array_equal(np.concatenate([block['grid_index'] for block in blocks]), expected['grid_index'])
+        
+        statistics = self.filter.last_statistics
+        self.assertEqual(statistics.total_scenarios, expected_statistics.total_scenarios)
+        self.assertEqual(statistics.selected_scenarios, expected_statistics.selected_scenarios)
+
+    def test_evaluate_variants(self):
+        """제어 모델 변형 동시 평가 결과가 변형별 개별 실행 결과와 같은지 테스트"""
+        columns = ScenarioGenerator(self.config).generate_scenario_columns()
+        prefiltered = self.filter.prefilter_columns(columns)
+        variants = TTCCalculator.expand_variant_grid({
+            'human_model.reaction_time': [0.5, 1.0],
+            'ads_model.max_deceleration': [5.0, 7.0],
+            'evaluation_criteria.ads_failure_offset': [0.0]
+        })
+        self.assertEqual(len(variants), 4)
+        
+        results = self.filter.evaluate_variants(prefiltered, variants)
+        self.assertEqual(results['test_case_matrix'].shape, (len(prefiltered['v_ego']), 4))
+        
+        for index, variant in enumerate(variants):
+            config = copy.deepcopy(self.config)
+            for key, value in variant.items():
+                section, name = key.split('.')
+                parent = config['filtering'] if section == 'evaluation_criteria' else config['control_models']
+                parent[section][name] = value
+            expected = ScenarioFilter(config).filter_columns(columns)
+            self.assertEqual(results['counts'][index], len(expected['v_ego']), f"변형 {variant} 결과 수가 다릅니다.")
+            np.testing.assert_array_equal(prefiltered['grid_index'][results['test_case_matrix'][:, index]], expected['grid_index'])
+        
+        # 오타 등 지원하지 않는 파라미터는 기본값으로 조용히 대체하지 않고 오류
+        for key in ('human_model.reaction_tme', 'ads_model.failure_offset'):
+            with self.assertRaises(ValueError):
+                self.filter.evaluate_variants(prefiltered, [{key: 1.0}])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -3,7 +3,9 @@
 '''
 
 import unittest
-from src.generators.scenario_generator import ScenarioGenerator
+import itertools
+import numpy as np
+from src.generators.scenario_generator import ScenarioGenerator, PARAMETER_KEYS
 from src.utils.config_loader import ConfigLoader
 
 class TestScenarioGenerator(unittest.TestCase):
@@ -31,5 +33,40 @@ class TestScenarioGenerator(unittest.TestCase):
         self.assertIn('dec_lv2', scenario, "dec_lv2 필드가 없습니다.")
         self.assertIn('thw_ego_lv2_reveal', scenario, "thw_ego_lv2_reveal 필드가 없습니다.")
 
+    def test_generate_scenario_columns(self):
+        """컬럼 기반 시나리오 생성 테스트 (전체 곱집합 필터링 결과와 동일)"""
+        columns = self.generator.generate_scenario_columns()
+        
+        # 전체 곱집합에서 유효한 조합만 남긴 기준 결과
+        ranges = self.generator._build_parameter_ranges()
+        expected = [
+            combo for combo in itertools.product(*ranges.values())
+            if self.generator._is_valid_combination(*combo)
+        ]
+        
+        # 시나리오 수 및 순서 확인
+        self.assertEqual(len(columns['v_ego']), len(expected), "시나리오 수가 다릅니다.")
+        for axis, key in enumerate(PARAMETER_KEYS):
+            np.testing.assert_array_equal(
+                columns[key], np.array([combo[axis] for combo in expected]),
+                err_msg=f"{key} 컬럼이 다릅니다.")
+        
+        # 열거 절감량 확인
+        stats = self.generator.get_enumeration_stats()
+        self.assertEqual(stats['enumerated_combinations'], len(expected))
+        self.assertEqual(stats['pruned_combinations'], stats['total_combinations'] - len(expected))
+
+    def test_iter_scenario_blocks(self):
+        """블록 단위 시나리오 생성 테스트 (전체 생성과 동일한 결과)"""
+        columns = self.generator.generate_scenario_columns()
+        blocks = list(self.generator.iter_scenario_blocks(block_size=10000))
+        
+        # 마지막 블록을 제외한 모든 블록은 고정 크기
+        self.assertTrue(all(len(block['v_ego']) == 10000 for block in blocks[:-1]), "블록 크기가 다릅니다.")
+        
+        for key in columns:
+            merged = np.concatenate([block[key] for block in blocks])
+            np.testing.assert_array_equal(merged, columns[key], err_msg=f"{key} 컬럼이 다릅니다.")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,112 @@
+'''
+ESmini 시뮬레이션 실행기 테스트
+'''
+
+import unittest
+import os
+import stat
+import time
+import tempfile
+from src.runners.simulation_runner import SimulationRunner
+from src.utils.config_loader import ConfigLoader
+
+# ESmini 대신 실행하는 스크립트 (시나리오 파일 이름에 따라 대기, 실패, 첫 시도만 실패)
+FAKE_ESMINI = '''#!/bin/sh
+for arg in "$@"; do
+  case "$arg" in
+    --osc=*) osc="${arg#--osc=}" ;;
+    --path=*) out="${arg#--path=}" ;;
+  esac
+done
+case "$osc" in
+  *sleep*) sleep 0.5 ;;
+  *hang*) sleep 5 ;;
+  *fail*) echo "scenario error" >&2; exit 3 ;;
+  *flaky*) if [ ! -f "$out/attempted" ]; then touch "$out/attempted"; exit 1; fi ;;
+esac
+exit 0
+'''
+
+class TestSimulationRunner(unittest.TestCase):
+    """ESmini 시뮬레이션 실행기 테스트 클래스"""
+
+    def setUp(self):
+        """가짜 ESmini 실행 파일 설정"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        executable = os.path.join(self.temp_dir.name, 'esmini')
+        with open(executable, 'w') as f:
+            f.write(FAKE_ESMINI)
+        os.chmod(executable, os.stat(executable).st_mode | stat.S_IXUSR)
+
+        self.config = ConfigLoader.load_config('config/scenario_config.yaml')
+        self.config['simulation']['esmini']['executable_path'] = executable
+        self.config['simulation']['esmini']['options'] = []
+        self.runner = SimulationRunner(self.config)
+
+    def tearDown(self):
+        """임시 디렉토리 삭제"""
+        self.temp_dir.cleanup()
+
+    def _jobs(self, names):
+        """시나리오 이름별 (xosc_file, output_dir, extra_args) 목록"""
+        return [(f"{name}.xosc", os.path.join(self.temp_dir.name, f"sim_{i}"), []) for i, name in enumerate(names)]
+
+    def test_run_batch_concurrency(self):
+        """동시 실행 수만큼 ESmini 프로세스가 겹쳐 실행되는지 테스트"""
+        start_time = time.monotonic()
+        results = self.runner.run_batch(self._jobs(['sleep'] * 4), concurrency=4, timeout=10, retries=0)
+        elapsed = time.monotonic() - start_time
+
+        self.assertTrue(all(result['success'] for result in results))
+        self.assertLess(elapsed, 1.5)
+        self.assertTrue(all(result['duration'] >= 0.5 for result in results))
+
+    def test_default_concurrency(self):
+        """설정하지 않으면 ESmini를 순차 실행하는지 테스트"""
+        self.config['simulation']['esmini']['batch'] = {'concurrency': None}
+        self.assertEqual(self.runner._batch_settings(None, None, None)[0], 1)
+        self.config['simulation']['esmini']['batch'] = {'concurrency': 3}
+        self.assertEqual(self.runner._batch_settings(None, None, None)[0], 3)
+
+    def test_run_batch_records_failures(self):
+        """반환 코드, 시간 초과, 재시도 결과가 시나리오 순서대로 기록되는지 테스트"""
+        results = self.runner.run_batch(self._jobs(['ok', 'fail', 'hang', 'flaky']), concurrency=2, timeout=0.3, retries=1)
+
+        self.assertEqual([result['xosc_file'] for result in results], ['ok.xosc', 'fail.xosc', 'hang.xosc', 'flaky.xosc'])
+        self.assertEqual([result['success'] for result in results], [True, False, False, True])
+        self.assertEqual(results[1]['returncode'], 3)
+        self.assertIn('scenario error', results[1]['stderr_tail'])
+        self.assertEqual(results[1]['attempts'], 2)
+        self.assertIsNone(results[2]['returncode'])
+        self.assertIn('시간 초과', results[2]['error'])
+        self.assertEqual(results[3]['attempts'], 2)
+
+    def test_run_batch_asyncio_backend(self):
+        """asyncio 실행 방식이 스레드 방식과 같은 결과를 기록하는지 테스트"""
+        self.config['simulation']['esmini']['batch'] = {'backend': 'asyncio'}
+        start_time = time.monotonic()
+        results = self.runner.run_batch(self._jobs(['sleep', 'sleep', 'fail', 'flaky']), concurrency=4, timeout=10, retries=1)
+        elapsed = time.monotonic() - start_time
+
+        self.assertEqual([result['success'] for result in results], [True, True, False, True])
+        self.assertEqual(results[2]['returncode'], 3)
+        self.assertIn('scenario error', results[2]['stderr_tail'])
+        self.assertEqual([result['attempts'] for result in results], [1, 1, 2, 2])
+        self.assertLess(elapsed, 1.5)
+
+    def test_run_batch_callback_error(self):
+        """on_result 콜백 오류가 일괄 실행을 중단하지 않는지 테스트 (두 실행 방식 모두)"""
+        def on_result(position, result):
+            recorded.append(position)
+            raise OSError("disk full")
+
+        for backend in ('thread', 'asyncio'):
+            self.config['simulation']['esmini']['batch'] = {'backend': backend}
+            recorded = []
+            with self.assertLogs('cutout_scenario.runner', level='ERROR'):
+                results = self.runner.run_batch(self._jobs(['ok', 'ok', 'ok']), concurrency=2, timeout=10, retries=0, on_result=on_result)
+            self.assertEqual([result['success'] for result in results], [True, True, True])
+            self.assertEqual(sorted(recorded), [0, 1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
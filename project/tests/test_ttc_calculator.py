@@ -3,7 +3,9 @@ TTC 계산기 테스트
 '''
 
 import unittest
+import numpy as np
 from src.calculators.ttc_calculator import TTCCalculator
+from src.generators.scenario_generator import ScenarioGenerator
 from src.utils.config_loader import ConfigLoader
 
 class TestTTCCalculator(unittest.TestCase):
@@ -71,5 +73,52 @@ class TestTTCCalculator(unittest.TestCase):
         ads_fails = self.calculator.evaluate_ads_model(self.test_scenario, ttc_reveal)
         self.assertIsInstance(ads_fails, bool, "ADS 모델 평가 결과가 bool 타입이 아님")
 
+    def test_batch_matches_scalar(self):
+        """배열 API와 스칼라 API 결과 일치 테스트"""
+        scenarios = ScenarioGenerator(self.config).generate_scenarios()[::50]
+        columns = {key: np.array([scenario[key] for scenario in scenarios]) for key in scenarios[0]}
+        
+        early_collision = self.calculator.calculate_early_collision_batch(columns)
+        ttc_reveal = self.calculator.calculate_ttc_reveal_batch(columns)
+        human_fails = self.calculator.evaluate_human_model_batch(columns, ttc_reveal)
+        ads_fails = self.calculator.evaluate_ads_model_batch(columns, ttc_reveal)
+        
+        for i, scenario in enumerate(scenarios):
+            ttc = self.calculator.calculate_ttc_reveal(scenario)
+            self.assertEqual(early_collision[i], self.calculator.calculate_early_collision(scenario))
+            self.assertEqual(ttc_reveal[i], ttc)
+            self.assertEqual(human_fails[i], self.calculator.evaluate_human_model(scenario, ttc))
+            self.assertEqual(ads_fails[i], self.calculator.evaluate_ads_model(scenario, ttc))
+        
+        # 상대 속도가 0 이하인 경우 무한대 TTC 포함 확인
+        self.assertTrue(np.isinf(ttc_reveal).any(), "무한대 TTC 케이스가 없습니다.")
+
+    def test_threshold_table_invalidation(self):
+        """v_ego별 임계값 테이블 캐시 및 control_models 변경 시 무효화 테스트"""
+        ttc_reveal = 2.5
+        self.calculator.evaluate_human_model(self.test_scenario, ttc_reveal)
+        table = self.calculator.get_threshold_table('human_model')
+        self.assertIn(80.0, table, "v_ego 임계값이 캐시되지 않았습니다.")
+        
+        # 반응 시간 변경 후 임계값 재계산 확인
+        control_models = {model: dict(params) for model, params in self.config['control_models'].items()}
+        control_models['human_model']['reaction_time'] += 1.0
+        self.calculator.set_control_models(control_models)
+        self.assertEqual(self.calculator.get_threshold_table('human_model'), {}, "테이블이 무효화되지 않았습니다.")
+        
+        self.calculator.evaluate_human_model(self.test_scenario, ttc_reveal)
+        self.assertAlmostEqual(self.calculator.get_threshold_table('human_model')[80.0], table[80.0] + 1.0)
+
+    def test_batch_threshold_bypasses_table(self):
+        """연속 v_ego 배열 평가 시 임계값 테이블이 커지지 않는지 테스트"""
+        columns = {'v_ego': np.random.default_rng(0).uniform(60.0, 130.0, 1000)}
+        ttc_reveal = np.full(1000, 2.5)
+        human_fails = self.calculator.evaluate_human_model_batch(columns, ttc_reveal)
+        self.assertEqual(self.calculator.get_threshold_table('human_model'), {}, "배열 평가가 테이블을 채웠습니다.")
+        
+        for i in range(0, 1000, 100):
+            scenario = {'v_ego': float(columns['v_ego'][i])}
+            self.assertEqual(human_fails[i], self.calculator.evaluate_human_model(scenario, ttc_reveal[i]))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
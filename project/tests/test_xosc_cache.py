@@ -0,0 +1,87 @@
+'''
+XOSC 파일 캐시 테스트
+'''
+
+import unittest
+import os
+import json
+import copy
+import tempfile
+from unittest import mock
+from src.converters.comparative_scenario_converter import ComparativeScenarioConverter, scenario_xosc_values
+from src.utils.xosc_cache import XoscCache, MANIFEST_FILE
+from src.utils.config_loader import ConfigLoader
+
+class TestXoscCache(unittest.TestCase):
+    """XOSC 파일 캐시 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.config = ConfigLoader.load_config('config/scenario_config.yaml')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config['simulation']['output']['output_directory'] = self.temp_dir.name
+        self.config['simulation']['conversion']['cache'] = {'enabled': True, 'directory': 'xosc_cache'}
+
+        self.test_scenario = {
+            'v_ego': 80.0,
+            'v_lv1': 70.0,
+            'v_lv1_lat': 1.5,
+            'v_lv2': 60.0,
+            'dec_lv2': 2.0,
+            'd_ego_lv1': (80.0/3.6) * 2.0,
+            'd_lv1_lv2': (70.0/3.6) * (3.0 - 2.0),
+            'lane_change_direction': -1,
+            'lv2_deceleration_trigger_delay': 0.1
+        }
+
+    def tearDown(self):
+        """임시 디렉토리 삭제"""
+        self.temp_dir.cleanup()
+
+    def _fake_convert(self, test_case, output_file):
+        """XOSC 값을 기록하는 변환 대체 함수"""
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(scenario_xosc_values(test_case, self.config)['scenario_name'])
+        return output_file
+
+    def test_batch_reuses_cached_files(self):
+        """재실행 시 변경되지 않은 시나리오는 변환 없이 캐시 파일을 재사용하는지 테스트"""
+        test_cases = [self.test_scenario, dict(self.test_scenario, v_ego=100.0)]
+        scenarios_dir = os.path.join(self.temp_dir.name, 'scenarios')
+
+        converter = ComparativeScenarioConverter(self.config)
+        with mock.patch.object(converter, 'convert', side_effect=self._fake_convert) as convert:
+            first = converter.convert_batch(test_cases, scenarios_dir)
+            self.assertEqual(convert.call_count, 2)
+            self.assertFalse(any(result['cached'] for result in first))
+
+            # 변경된 시나리오만 다시 변환
+            test_cases[1] = dict(self.test_scenario, v_ego=90.0)
+            second = converter.convert_batch(test_cases, scenarios_dir)
+            self.assertEqual(convert.call_count, 3)
+            self.assertEqual([result['cached'] for result in second], [True, False])
+
+        with open(os.path.join(scenarios_dir, 'scenario_002.xosc'), encoding='utf-8') as f:
+            self.assertIn('Ego_90.0', f.read())
+        with open(os.path.join(scenarios_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest, {result['scenario_id']: result['hash'] for result in second})
+        self.assertEqual(first[0]['hash'], second[0]['hash'])
+
+        # 재변환이 하드 링크된 이전 캐시 파일을 덮어쓰지 않음
+        cache_dir = os.path.join(self.temp_dir.name, 'xosc_cache')
+        with open(os.path.join(cache_dir, f"{first[1]['hash']}.xosc"), encoding='utf-8') as f:
+            self.assertIn('Ego_100.0', f.read())
+
+    def test_cache_key_depends_on_config(self):
+        """차량 설정이 바뀌면 캐시 키가 달라지는지 테스트"""
+        values = scenario_xosc_values(self.test_scenario, self.config)
+        changed_config = copy.deepcopy(self.config)
+        changed_config['vehicles']['ego_vehicle']['dimensions']['length'] += 0.1
+
+        self.assertEqual(XoscCache.cache_key(values, self.config), XoscCache.cache_key(dict(values), self.config))
+        self.assertNotEqual(XoscCache.cache_key(values, self.config), XoscCache.cache_key(values, changed_config))
+
+if __name__ == '__main__':
+    unittest.main()